@@ -2,45 +2,585 @@
 Flask API for Disc Golf Putting League
 Connects to Azure SQL Server backend
 """
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from db import execute_query, execute_proc, execute_insert
+from db import (
+    execute_query, execute_query_columnar, execute_batch, execute_proc, execute_insert, execute_many,
+    stream_query, pool,
+    STREAM_BATCH_SIZE,
+    begin_unit_of_work, end_unit_of_work, after_commit, route_reads, routed_read_pool,
+    observe_queries, query_observer,
+)
+from cache import stats_cache, data_versions
+from leaderboard import leaderboard_engine
+from stats import stats_engine, head_to_head, STATS_ENGINE_CONFIG
+from replica import read_replica
+from live import live_hub, LiveStream, STANDINGS_SQL, ENVIRON_KEY as LIVE_STREAM_KEY
+import metrics
+import profiling
+from pagination import Keyset, InvalidPageRequest, parse_page_args
+from rows import Rows, Record, encode_rows, encode_record
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from json.encoder import encode_basestring_ascii
+import os
+import time
+
+class RowsJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, serializing query Rows straight from their tuples
+
+    Bodies that are (or contain, through dicts) Rows or Records are written
+    by rows.encode_rows with the same value conversions as Flask's default
+    (dates as HTTP dates, Decimals as strings). They are always compact,
+    even where debug mode would pretty-print.
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Rows):
+            return o.to_dicts()
+        if isinstance(o, Record):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if isinstance(obj, (Rows, Record, dict)) and self._has_rows(obj):
+            return self._encode(obj)
+        return super().dumps(obj, **kwargs)
+
+    def _has_rows(self, obj):
+        if isinstance(obj, (Rows, Record)):
+            return True
+        if isinstance(obj, dict):
+            return any(self._has_rows(value) for value in obj.values())
+        return False
+
+    def _encode(self, obj):
+        if isinstance(obj, Rows):
+            return encode_rows(obj, self.default, self.sort_keys)
+        if isinstance(obj, Record):
+            return encode_record(obj, self.default, self.sort_keys)
+        if isinstance(obj, dict) and obj:
+            items = sorted(obj.items(), key=lambda item: str(item[0])) if self.sort_keys else obj.items()
+            return '{' + ', '.join(
+                encode_basestring_ascii(str(key)) + ': ' + self._encode(value) for key, value in items
+            ) + '}'
+        return super().dumps(obj)
 
 app = Flask(__name__)
+app.json = RowsJSONProvider(app)
 
 # Explicit CORS configuration for Chrome compatibility
 CORS(app, resources={
     r"/api/*": {
         "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
-        "expose_headers": ["Content-Type"],
+        "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", "If-None-Match", "X-Profile"],
+        "expose_headers": ["Content-Type", "ETag", "X-Profile-Report"],
         "supports_credentials": True,
         "max_age": 600  # Cache preflight requests for 10 minutes
     }
 })
 
+# ============================================
+# REQUEST PROFILING
+# ============================================
+# With REQUEST_PROFILING=1, ?profile=1 (or X-Profile: 1) runs any request
+# under cProfile and tracemalloc and answers with the report instead of the
+# body; ?profile=save keeps the body and writes the report to PROFILE_DIR.
+# See profiling.py. Registered first, so the profile covers every other
+# hook, the unit of work's commit and (for streamed responses) the body.
+
+@app.before_request
+def start_profiling():
+    if not profiling.PROFILE_CONFIG['enabled']:
+        return None
+    mode = profiling.requested_mode(request.args, request.headers)
+    if mode is None:
+        return None
+    profile = profiling.RequestProfile(mode)
+    if not profile.start():
+        return jsonify({"error": "Another request is being profiled; try again shortly"}), 409
+    g.profile = profile
+    observe_queries(profile.query_finished)
+    return None
+
+@app.after_request
+def finish_profiling(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    try:
+        if response.mimetype == 'text/event-stream':
+            # A live stream never ends; profile only the setup
+            body_size = None
+        else:
+            # Build a streamed body here so its queries and encoding are profiled
+            body_size = len(response.get_data())
+        profile.sample_memory()
+    finally:
+        profile.stop()
+        observe_queries(None)
+    report = profile.report(
+        {
+            "method": request.method,
+            "path": request.path,
+            "route": request.url_rule.rule if request.url_rule is not None else 'unmatched',
+            "query": request.query_string.decode(errors='replace'),
+        },
+        {"status": response.status_code, "bytes": body_size, "contentType": response.content_type},
+    )
+    if profile.mode == 'save':
+        path = profile.save(report)
+        print(f"[PROFILE] {request.method} {request.path}: {report['totalMs']}ms, saved to {path}")
+        response.headers['X-Profile-Report'] = path
+        return response
+    # The route's response is replaced; close it so its on-close hooks run
+    response.close()
+    return jsonify(report)
+
+@app.teardown_request
+def stop_profiling(error=None):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop()
+    if query_observer() is not None:
+        observe_queries(None)
+
+# ============================================
+# REQUEST METRICS
+# ============================================
+# Latency, status and response size of every request, by route pattern
+# (e.g. /api/players/<int:player_id>). Recorded when the response is closed,
+# so a streamed body counts until its last byte. See /api/metrics.
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+def _counted(body, size):
+    """Pass a streamed body through, adding each chunk's length to size[0]"""
+    try:
+        for chunk in body:
+            size[0] += len(chunk.encode() if isinstance(chunk, str) else chunk)
+            yield chunk
+    finally:
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+    method = request.method
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    status = str(response.status_code)
+    if response.is_streamed:
+        size = [0]
+        response.response = _counted(response.response, size)
+    else:
+        size = [response.calculate_content_length() or 0]
+
+    def record():
+        metrics.http_request_seconds.observe(time.perf_counter() - started, method=method, route=route)
+        metrics.http_requests.inc(method=method, route=route, status=status)
+        metrics.http_response_bytes.observe(size[0], method=method, route=route)
+    response.call_on_close(record)
+    return response
+
+# ============================================
+# REQUEST-SCOPED DATABASE UNIT OF WORK
+# ============================================
+# Every db helper called while handling a request runs on one lazily
+# borrowed connection inside one transaction. Successful responses commit
+# once at the end; error responses and unhandled exceptions roll back, so a
+# route that fails halfway never leaves partial writes behind.
+
+@app.before_request
+def open_unit_of_work():
+    g.db = begin_unit_of_work(read_only=request.method in ('GET', 'HEAD'))
+
+@app.after_request
+def finish_unit_of_work(response):
+    unit = g.get('db')
+    if unit is None:
+        return response
+    try:
+        if response.status_code < 400:
+            unit.commit()
+        else:
+            unit.rollback()
+    except Exception as e:
+        unit.rollback()
+        response = jsonify({"error": f"Transaction failed: {e}"})
+        response.status_code = 500
+    return response
+
+@app.teardown_request
+def close_unit_of_work(error=None):
+    g.pop('db', None)
+    end_unit_of_work()
+    route_reads(None)
+
+def tables_changed(*tables, events=None):
+    """Record that this request wrote to the given tables
+
+    Cached results that read from them are invalidated once the request's
+    transaction commits (and not at all if it rolls back), and reads go to
+    the primary until the read replica has synced. events: the EventIDs
+    whose scores changed, when known, so the stats engine reloads just those.
+    """
+    def invalidate():
+        stats_engine.tables_changed(tables, events)
+        data_versions.bump(*tables)
+        stats_cache.invalidate(*tables)
+        if read_replica is not None:
+            read_replica.mark_changed()
+    after_commit(invalidate)
+
+def leaderboard_delta(apply):
+    """Apply a score delta to the in-memory leaderboard once this request commits
+
+    The write counts as in flight until then (or until it rolls back), so
+    a leaderboard load that may already contain it is not installed.
+    """
+    leaderboard_engine.write_started()
+    def run():
+        try:
+            apply()
+        finally:
+            leaderboard_engine.write_finished()
+    after_commit(run, rolled_back=leaderboard_engine.write_finished)
+
+# ============================================
+# ROUND TOTALS
+# ============================================
+
+# Recomputes RoundTotals rows from Score for the given scope. Rows whose
+# scores are gone (deleted scorecard, removed member) are deleted. The
+# MERGE targets only the scope's rows, so it reads and range-locks just
+# those instead of the whole table.
+REFRESH_ROUND_TOTALS_SQL = """
+    WITH ScopeTotals AS (
+        SELECT ScorecardID, PlayerID, EventID, RoundTotal, HolesPlayed, UpdatedAt
+        FROM RoundTotals WITH (HOLDLOCK)
+        WHERE {target_filter}
+    )
+    MERGE ScopeTotals AS t
+    USING (
+        SELECT s.ScorecardID, s.PlayerID, sc.EventID,
+               SUM(s.Strokes) AS RoundTotal, COUNT(s.HoleNumber) AS HolesPlayed
+        FROM Score s
+        JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+        WHERE {source_filter}
+        GROUP BY s.ScorecardID, s.PlayerID, sc.EventID
+    ) AS src
+    ON t.ScorecardID = src.ScorecardID AND t.PlayerID = src.PlayerID
+    WHEN MATCHED AND (t.RoundTotal <> src.RoundTotal
+                      OR t.HolesPlayed <> src.HolesPlayed
+                      OR t.EventID <> src.EventID) THEN
+        UPDATE SET RoundTotal = src.RoundTotal, HolesPlayed = src.HolesPlayed,
+                   EventID = src.EventID, UpdatedAt = SYSUTCDATETIME()
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT (ScorecardID, PlayerID, EventID, RoundTotal, HolesPlayed)
+        VALUES (src.ScorecardID, src.PlayerID, src.EventID, src.RoundTotal, src.HolesPlayed)
+    WHEN NOT MATCHED BY SOURCE THEN
+        DELETE;
+"""
+
+def refresh_round_totals(event_id=None, scorecard_id=None, player_ids=None):
+    """Bring the RoundTotals rows for one event, scorecard or scorecard's players up to date
+
+    Runs inside the request's transaction, so the summary commits (or rolls
+    back) together with the score write that made it stale.
+    """
+    source, target, params = [], [], []
+    if event_id is not None:
+        source.append("sc.EventID = ?")
+        target.append("EventID = ?")
+        params.append(event_id)
+    if scorecard_id is not None:
+        source.append("s.ScorecardID = ?")
+        target.append("ScorecardID = ?")
+        params.append(scorecard_id)
+    if player_ids:
+        marks = ", ".join("?" * len(player_ids))
+        source.append(f"s.PlayerID IN ({marks})")
+        target.append(f"PlayerID IN ({marks})")
+        params.extend(player_ids)
+    if not source:
+        raise ValueError("refresh_round_totals needs an event or scorecard")
+
+    sql = REFRESH_ROUND_TOTALS_SQL.format(
+        source_filter=" AND ".join(source),
+        target_filter=" AND ".join(target),
+    )
+    try:
+        execute_insert(sql, params + params)
+    except Exception as e:
+        if not is_missing_view_error(e):
+            raise
+        print("[DEV] Table 'RoundTotals' not found in database.")
+        print("[DEV] To create it, run migrations/create_round_totals.sql")
+
+# ============================================
+# LIVE SCOREBOARD
+# ============================================
+# Score writes publish a delta to the event's /api/events/<id>/live
+# subscribers once their transaction commits (see live.py). The round
+# totals in it are read inside the write's transaction.
+
+LIVE_TOTALS_SQL = """
+    SELECT sc.EventID, s.ScorecardID, s.PlayerID, p.SkillDivision,
+           SUM(s.Strokes) AS RoundTotal, COUNT(s.HoleNumber) AS HolesPlayed
+    FROM Score s
+    JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+    JOIN Player p ON s.PlayerID = p.PlayerID
+    WHERE s.ScorecardID = ? AND s.PlayerID IN ({marks})
+    GROUP BY sc.EventID, s.ScorecardID, s.PlayerID, p.SkillDivision
+"""
+
+def publish_live_scores(scores):
+    """Publish written scores, with their players' new round totals, after commit
+
+    scores: dicts with scorecardId, holeNumber, playerId and strokes (edits
+    also carry scoreId and previousStrokes). Returns the EventIDs the scores
+    belong to, or None if some could not be found.
+    """
+    players_by_card = {}
+    for score in scores:
+        players_by_card.setdefault(score['scorecardId'], set()).add(score['playerId'])
+    totals = []
+    for scorecard_id, player_ids in players_by_card.items():
+        player_ids = sorted(player_ids)
+        totals.extend(execute_query(
+            LIVE_TOTALS_SQL.format(marks=", ".join("?" * len(player_ids))),
+            [scorecard_id] + player_ids,
+        ))
+    event_of_card = {row['ScorecardID']: row['EventID'] for row in totals}
+    by_event = {}
+    for score in scores:
+        by_event.setdefault(event_of_card.get(score['scorecardId']), ([], []))[0].append(score)
+    for row in totals:
+        by_event[row['EventID']][1].append(row)
+
+    def publish():
+        for event_id, (event_scores, event_totals) in by_event.items():
+            if event_id is not None:
+                live_hub.publish(event_id, scores=event_scores, totals=event_totals)
+    after_commit(publish)
+    return None if None in by_event else sorted(by_event)
+
+def publish_live_removal(event_id, scorecard_id, player_id=None):
+    """Publish, after commit, that a scorecard (or one player on it) lost its scores"""
+    after_commit(lambda: live_hub.publish(event_id, removed=[(scorecard_id, player_id)]))
+
+# ============================================
+# ETAGS
+# ============================================
+# GET routes declare the tables they read with @reads. Their ETag is derived
+# from those tables' data versions plus the path and query string, so a
+# client revalidating unchanged data gets a 304 before any query runs.
+
+ALL_TABLES = ('Player', 'Event', 'Scorecard', 'ScorecardMember', 'Score')
+
+def reads(*tables):
+    """Declare the tables a GET route reads (enables ETag / 304 handling)"""
+    def decorator(view):
+        view.etag_tables = tables
+        return view
+    return decorator
+
+@app.before_request
+def check_etag():
+    if request.method != 'GET':
+        return None
+    view = app.view_functions.get(request.endpoint)
+    tables = getattr(view, 'etag_tables', None)
+    if tables is None:
+        return None
+    # Versions are read before the query runs: if a write lands mid-request
+    # the response carries the older ETag and is simply refetched next time
+    g.etag = data_versions.etag(
+        tables, request.path, sorted(request.args.items(multi=True)), wants_columnar()
+    )
+    if request.if_none_match.contains(g.etag):
+        response = Response(status=304)
+        response.set_etag(g.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+@app.after_request
+def add_etag(response):
+    etag = g.get('etag')
+    if etag and response.status_code == 200:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# ============================================
+# READ REPLICA
+# ============================================
+# With READ_REPLICA_PATH set, GET routes that declare the tables they read
+# (@reads) run their queries against a local SQLite mirror of the database
+# (see replica.py) whenever it is within its freshness bound; otherwise they
+# read the primary. Health, metrics, consistency checks and the live stream
+# never touch the replica. Registered after check_etag so a 304 skips it.
+
+@app.before_request
+def choose_read_source():
+    view = app.view_functions.get(request.endpoint)
+    if (read_replica is not None and request.method == 'GET'
+            and getattr(view, 'etag_tables', None) is not None):
+        route_reads(read_replica.pool_for_read())
+    else:
+        route_reads(None)
+
+# ============================================
+# STREAMING RESPONSES
+# ============================================
+# Large list endpoints write their JSON array a batch of rows at a time
+# instead of building the whole body in memory. Pass ?buffered=1 to get the
+# old single jsonify() body (e.g. for clients that need Content-Length).
+#
+# List and stats endpoints can also answer in a columnar format,
+# {columns: [...], rows: [[...], ...]}, which names each column once instead
+# of once per row. Ask for it with ?format=columnar or by sending
+# Accept: application/vnd.discgolf.columnar+json.
+
+COLUMNAR_MIMETYPE = 'application/vnd.discgolf.columnar+json'
+
+def wants_buffered():
+    return request.args.get('buffered', '').lower() in ('1', 'true', 'yes')
+
+def wants_columnar():
+    if request.args.get('format') == 'columnar':
+        return True
+    # Exact match only: */* must keep getting the default row objects
+    return any(mimetype == COLUMNAR_MIMETYPE and quality > 0
+               for mimetype, quality in request.accept_mimetypes)
+
+def to_columnar(rows):
+    """{columns, rows} from a Rows or a list of row dicts"""
+    if isinstance(rows, Rows):
+        return rows.columnar()
+    columns = list(rows[0]) if rows else []
+    return {"columns": columns, "rows": [list(row.values()) for row in rows]}
+
+def json_response(body):
+    """jsonify() that labels columnar bodies with their media type"""
+    response = jsonify(body)
+    if wants_columnar():
+        response.mimetype = COLUMNAR_MIMETYPE
+    response.vary.add('Accept')
+    return response
+
+def stream_json_array(batches, on_close=None, head='[', tail=']'):
+    """Streaming Response writing each batch (a list of rows) into one JSON array
+
+    head/tail wrap the array, e.g. to emit it as the rows of a columnar body.
+    """
+    def generate():
+        yield head
+        first = True
+        for batch in batches:
+            if not batch:
+                continue
+            if isinstance(batch, Rows):
+                chunk = app.json.dumps(batch)[1:-1]
+            else:
+                chunk = ', '.join(app.json.dumps(row) for row in batch)
+            yield chunk if first else ', ' + chunk
+            first = False
+        yield tail
+    columnar = wants_columnar()
+    response = Response(generate(), mimetype=COLUMNAR_MIMETYPE if columnar else 'application/json')
+    response.vary.add('Accept')
+    if on_close is not None:
+        # Runs even if the client disconnects before the body is sent
+        response.call_on_close(on_close)
+    return response
+
+def columnar_head(columns):
+    return '{"columns":' + app.json.dumps(columns) + ',"rows":['
+
+def query_response(query, params=None):
+    """Respond with a SELECT's rows, fetched and sent in batches"""
+    columnar = wants_columnar()
+    if wants_buffered():
+        if columnar:
+            return json_response(execute_query_columnar(query, params))
+        return json_response(execute_query(query, params))
+    stream = stream_query(query, params, raw=columnar)
+    if columnar:
+        return stream_json_array(stream, on_close=stream.close,
+                                 head=columnar_head(stream.columns), tail=']}')
+    return stream_json_array(stream, on_close=stream.close)
+
+def rows_response(rows):
+    """Respond with already-fetched rows (e.g. from the stats cache), sent in batches"""
+    columnar = wants_columnar()
+    if wants_buffered():
+        return json_response(to_columnar(rows) if columnar else rows)
+    size = STREAM_BATCH_SIZE
+    if columnar:
+        body = to_columnar(rows)
+        batches = (body["rows"][i:i + size] for i in range(0, len(rows), size))
+        return stream_json_array(batches, head=columnar_head(body["columns"]), tail=']}')
+    return stream_json_array(rows[i:i + size] for i in range(0, len(rows), size))
+
+def list_response(keyset, params=None):
+    """Respond with a list endpoint's rows: all of them (streamed), or one page
+
+    With ?limit=N and/or ?after=<cursor> the response is {items, next}, where
+    next is the cursor for the following page (null on the last page); in
+    columnar format it is {columns, rows, next}.
+    Raises InvalidPageRequest for a bad limit or cursor.
+    """
+    page = parse_page_args(request.args)
+    if page is None:
+        return query_response(keyset.all_sql(), params)
+    limit, after = page
+    return json_response(keyset.page(params, limit, after, columnar=wants_columnar()))
+
 # ============================================
 # PLAYERS
 # ============================================
 
+PLAYERS = Keyset("SELECT * FROM Player", ('LastName', 'FirstName', 'PlayerID'))
+
+def fetch_players():
+    """Rows for /api/players"""
+    return execute_query(PLAYERS.all_sql())
+
+def fetch_player(player_id):
+    """A single player row, or None if the player does not exist"""
+    results = execute_query("SELECT * FROM Player WHERE PlayerID = ?", [player_id])
+    return results[0] if results else None
+
 @app.route('/api/players', methods=['GET'])
+@reads('Player')
 def get_players():
-    """Get all players"""
+    """Get all players (paged with ?limit=&after=)"""
     try:
-        results = execute_query("SELECT * FROM Player ORDER BY LastName, FirstName")
-        return jsonify(results)
+        return list_response(PLAYERS)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/players/<int:player_id>', methods=['GET'])
+@reads('Player')
 def get_player(player_id):
     """Get a single player by ID"""
     try:
-        results = execute_query("SELECT * FROM Player WHERE PlayerID = ?", [player_id])
-        if results:
-            return jsonify(results[0])
+        player = fetch_player(player_id)
+        if player:
+            return jsonify(player)
         return jsonify({"error": "Player not found"}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -56,8 +596,14 @@ def create_player():
             data['email'],
             data['skillDivision']
         ])
+        tables_changed('Player')
+        if isinstance(result, Rows) and len(result) > 0:
+            created = result[0]
+            after_commit(lambda: leaderboard_engine.add_player(
+                created['NewPlayerID'], created['FirstName'], created['LastName'], created['SkillDivision']
+            ))
         # execute_proc returns an array, but we need the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 201
         return jsonify(result), 201
     except Exception as e:
@@ -67,7 +613,170 @@ def create_player():
 # LEADERBOARD / STATS
 # ============================================
 
+# Tables read by the cached stats queries; a write to any of them evicts
+# the cached result (see tables_changed)
+PLAYER_STATS_TABLES = ('Score', 'Scorecard', 'Event', 'Player')
+COURSE_STATS_TABLES = ('Score', 'Scorecard', 'Event')
+
+def fetch_leaderboard(division, event_limit):
+    """Rows for /api/leaderboard (see get_leaderboard)"""
+    if event_limit != 'latest' and not event_limit.isdigit():
+        # All-time leaderboard ('all', or an unparseable limit as before) is
+        # maintained incrementally in memory instead of scanning the view
+        rows = leaderboard_engine.rows(division)
+        if rows is not None:
+            return rows
+        # Writes kept the engine from loading; read the view this time
+        if division:
+            return execute_query(
+                "SELECT * FROM vw_PlayerLeaderboard WHERE SkillDivision = ? ORDER BY HighTotal DESC",
+                [division]
+            )
+        return execute_query("SELECT * FROM vw_PlayerLeaderboard ORDER BY SkillDivision, HighTotal DESC")
+    return fetch_windowed_leaderboard(division, event_limit)
+
+@stats_cache.cached('leaderboard', PLAYER_STATS_TABLES)
+def fetch_windowed_leaderboard(division, event_limit):
+    """Leaderboard over the latest event or the last N events"""
+    if STATS_ENGINE_CONFIG['enabled']:
+        # Merged from per-event partials (see stats.py)
+        return stats_engine.leaderboard(division, event_limit)
+    if event_limit == 'latest':
+        # Get leaderboard based on most recent event only
+        if division:
+            results = execute_query("""
+                WITH LatestEvent AS (
+                    SELECT TOP 1 EventID, EventDate FROM Event ORDER BY EventDate DESC, EventID DESC
+                ),
+                LatestScores AS (
+                    SELECT 
+                        p.PlayerID,
+                        p.FirstName,
+                        p.LastName,
+                        p.SkillDivision,
+                        rt.RoundTotal AS ScorecardTotal,
+                        ROW_NUMBER() OVER (PARTITION BY p.SkillDivision ORDER BY rt.RoundTotal DESC) as DivisionRank
+                    FROM RoundTotals rt
+                    JOIN Player p ON rt.PlayerID = p.PlayerID
+                    WHERE rt.EventID = (SELECT EventID FROM LatestEvent)
+                    AND p.SkillDivision = ?
+                )
+                SELECT 
+                    SkillDivision,
+                    FirstName,
+                    LastName,
+                    1 as RoundsPlayed,
+                    ScorecardTotal as HighTotal,
+                    ScorecardTotal as BestScorecardTotal,
+                    DivisionRank
+                FROM LatestScores
+                ORDER BY HighTotal DESC
+            """, [division])
+        else:
+            results = execute_query("""
+                WITH LatestEvent AS (
+                    SELECT TOP 1 EventID, EventDate FROM Event ORDER BY EventDate DESC, EventID DESC
+                ),
+                LatestScores AS (
+                    SELECT 
+                        p.PlayerID,
+                        p.FirstName,
+                        p.LastName,
+                        p.SkillDivision,
+                        rt.RoundTotal AS ScorecardTotal,
+                        ROW_NUMBER() OVER (PARTITION BY p.SkillDivision ORDER BY rt.RoundTotal DESC) as DivisionRank
+                    FROM RoundTotals rt
+                    JOIN Player p ON rt.PlayerID = p.PlayerID
+                    WHERE rt.EventID = (SELECT EventID FROM LatestEvent)
+                )
+                SELECT 
+                    SkillDivision,
+                    FirstName,
+                    LastName,
+                    1 as RoundsPlayed,
+                    ScorecardTotal as HighTotal,
+                    ScorecardTotal as BestScorecardTotal,
+                    DivisionRank
+                FROM LatestScores
+                ORDER BY SkillDivision, HighTotal DESC
+            """)
+    else:
+        # Get leaderboard from the last N events
+        limit = int(event_limit)
+        if division:
+            results = execute_query("""
+                WITH RecentEvents AS (
+                    SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC
+                ),
+                FilteredScores AS (
+                    SELECT 
+                        p.PlayerID,
+                        p.FirstName,
+                        p.LastName,
+                        p.SkillDivision,
+                        rt.RoundTotal AS ScorecardTotal
+                    FROM RoundTotals rt
+                    JOIN Player p ON rt.PlayerID = p.PlayerID
+                    JOIN Event e ON rt.EventID = e.EventID
+                    WHERE e.EventDate IN (SELECT EventDate FROM RecentEvents)
+                    AND p.SkillDivision = ?
+                ),
+                Aggregated AS (
+                    SELECT 
+                        FirstName,
+                        LastName,
+                        SkillDivision,
+                        COUNT(*) as RoundsPlayed,
+                        SUM(ScorecardTotal) as HighTotal,
+                        MAX(ScorecardTotal) as BestScorecardTotal
+                    FROM FilteredScores
+                    GROUP BY PlayerID, FirstName, LastName, SkillDivision
+                )
+                SELECT 
+                    *,
+                    ROW_NUMBER() OVER (PARTITION BY SkillDivision ORDER BY HighTotal DESC) as DivisionRank
+                FROM Aggregated
+                ORDER BY HighTotal DESC
+            """, [limit, division])
+        else:
+            results = execute_query("""
+                WITH RecentEvents AS (
+                    SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC
+                ),
+                FilteredScores AS (
+                    SELECT 
+                        p.PlayerID,
+                        p.FirstName,
+                        p.LastName,
+                        p.SkillDivision,
+                        rt.RoundTotal AS ScorecardTotal
+                    FROM RoundTotals rt
+                    JOIN Player p ON rt.PlayerID = p.PlayerID
+                    JOIN Event e ON rt.EventID = e.EventID
+                    WHERE e.EventDate IN (SELECT EventDate FROM RecentEvents)
+                ),
+                Aggregated AS (
+                    SELECT 
+                        FirstName,
+                        LastName,
+                        SkillDivision,
+                        COUNT(*) as RoundsPlayed,
+                        SUM(ScorecardTotal) as HighTotal,
+                        MAX(ScorecardTotal) as BestScorecardTotal
+                    FROM FilteredScores
+                    GROUP BY PlayerID, FirstName, LastName, SkillDivision
+                )
+                SELECT 
+                    *,
+                    ROW_NUMBER() OVER (PARTITION BY SkillDivision ORDER BY HighTotal DESC) as DivisionRank
+                FROM Aggregated
+                ORDER BY SkillDivision, HighTotal DESC
+            """, [limit])
+    
+    return results
+
 @app.route('/api/leaderboard', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
 def get_leaderboard():
     """Get player leaderboard from vw_PlayerLeaderboard view
     
@@ -78,181 +787,54 @@ def get_leaderboard():
     try:
         division = request.args.get('division')
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        # The leaderboard view aggregates across all events
-        # For event-specific filtering, we need a different approach
-        if event_limit == 'all':
-            if division:
-                results = execute_query(
-                    "SELECT * FROM vw_PlayerLeaderboard WHERE SkillDivision = ? ORDER BY HighTotal DESC",
-                    [division]
-                )
-            else:
-                results = execute_query(
-                    "SELECT * FROM vw_PlayerLeaderboard ORDER BY SkillDivision, HighTotal DESC"
-                )
-        elif event_limit == 'latest':
-            # Get leaderboard based on most recent event only
-            if division:
-                results = execute_query("""
-                    WITH LatestEvent AS (
-                        SELECT TOP 1 EventID, EventDate FROM Event ORDER BY EventDate DESC, EventID DESC
-                    ),
-                    LatestScores AS (
-                        SELECT 
-                            p.PlayerID,
-                            p.FirstName,
-                            p.LastName,
-                            p.SkillDivision,
-                            psh.ScorecardTotal,
-                            ROW_NUMBER() OVER (PARTITION BY p.SkillDivision ORDER BY psh.ScorecardTotal DESC) as DivisionRank
-                        FROM vw_PlayerScoreHistory psh
-                        JOIN Player p ON psh.PlayerID = p.PlayerID
-                        WHERE psh.EventID = (SELECT EventID FROM LatestEvent)
-                        AND p.SkillDivision = ?
-                    )
-                    SELECT 
-                        SkillDivision,
-                        FirstName,
-                        LastName,
-                        1 as RoundsPlayed,
-                        ScorecardTotal as HighTotal,
-                        ScorecardTotal as BestScorecardTotal,
-                        DivisionRank
-                    FROM LatestScores
-                    ORDER BY HighTotal DESC
-                """, [division])
-            else:
-                results = execute_query("""
-                    WITH LatestEvent AS (
-                        SELECT TOP 1 EventID, EventDate FROM Event ORDER BY EventDate DESC, EventID DESC
-                    ),
-                    LatestScores AS (
-                        SELECT 
-                            p.PlayerID,
-                            p.FirstName,
-                            p.LastName,
-                            p.SkillDivision,
-                            psh.ScorecardTotal,
-                            ROW_NUMBER() OVER (PARTITION BY p.SkillDivision ORDER BY psh.ScorecardTotal DESC) as DivisionRank
-                        FROM vw_PlayerScoreHistory psh
-                        JOIN Player p ON psh.PlayerID = p.PlayerID
-                        WHERE psh.EventID = (SELECT EventID FROM LatestEvent)
-                    )
-                    SELECT 
-                        SkillDivision,
-                        FirstName,
-                        LastName,
-                        1 as RoundsPlayed,
-                        ScorecardTotal as HighTotal,
-                        ScorecardTotal as BestScorecardTotal,
-                        DivisionRank
-                    FROM LatestScores
-                    ORDER BY SkillDivision, HighTotal DESC
-                """)
-        else:
-            # Get leaderboard from the last N events
-            try:
-                limit = int(event_limit)
-                if division:
-                    results = execute_query("""
-                        WITH RecentEvents AS (
-                            SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC
-                        ),
-                        FilteredScores AS (
-                            SELECT 
-                                p.PlayerID,
-                                p.FirstName,
-                                p.LastName,
-                                p.SkillDivision,
-                                psh.ScorecardTotal
-                            FROM vw_PlayerScoreHistory psh
-                            JOIN Player p ON psh.PlayerID = p.PlayerID
-                            WHERE psh.EventDate IN (SELECT EventDate FROM RecentEvents)
-                            AND p.SkillDivision = ?
-                        ),
-                        Aggregated AS (
-                            SELECT 
-                                FirstName,
-                                LastName,
-                                SkillDivision,
-                                COUNT(*) as RoundsPlayed,
-                                SUM(ScorecardTotal) as HighTotal,
-                                MAX(ScorecardTotal) as BestScorecardTotal
-                            FROM FilteredScores
-                            GROUP BY PlayerID, FirstName, LastName, SkillDivision
-                        )
-                        SELECT 
-                            *,
-                            ROW_NUMBER() OVER (PARTITION BY SkillDivision ORDER BY HighTotal DESC) as DivisionRank
-                        FROM Aggregated
-                        ORDER BY HighTotal DESC
-                    """, [limit, division])
-                else:
-                    results = execute_query("""
-                        WITH RecentEvents AS (
-                            SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC
-                        ),
-                        FilteredScores AS (
-                            SELECT 
-                                p.PlayerID,
-                                p.FirstName,
-                                p.LastName,
-                                p.SkillDivision,
-                                psh.ScorecardTotal
-                            FROM vw_PlayerScoreHistory psh
-                            JOIN Player p ON psh.PlayerID = p.PlayerID
-                            WHERE psh.EventDate IN (SELECT EventDate FROM RecentEvents)
-                        ),
-                        Aggregated AS (
-                            SELECT 
-                                FirstName,
-                                LastName,
-                                SkillDivision,
-                                COUNT(*) as RoundsPlayed,
-                                SUM(ScorecardTotal) as HighTotal,
-                                MAX(ScorecardTotal) as BestScorecardTotal
-                            FROM FilteredScores
-                            GROUP BY PlayerID, FirstName, LastName, SkillDivision
-                        )
-                        SELECT 
-                            *,
-                            ROW_NUMBER() OVER (PARTITION BY SkillDivision ORDER BY HighTotal DESC) as DivisionRank
-                        FROM Aggregated
-                        ORDER BY SkillDivision, HighTotal DESC
-                    """, [limit])
-            except ValueError:
-                if division:
-                    results = execute_query(
-                        "SELECT * FROM vw_PlayerLeaderboard WHERE SkillDivision = ? ORDER BY HighTotal DESC",
-                        [division]
-                    )
-                else:
-                    results = execute_query(
-                        "SELECT * FROM vw_PlayerLeaderboard ORDER BY SkillDivision, HighTotal DESC"
-                    )
-        
-        return jsonify(results)
+        return rows_response(fetch_leaderboard(division, event_limit))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# vw_PlayerScoreHistory's rows, paged on RoundTotals' (PlayerID, RoundTotal
+# DESC, ScorecardID DESC) index. ScoreRank is the row's position in the
+# player's history, as the view's ROW_NUMBER() gives it.
+PLAYER_HISTORY = Keyset("""
+    SELECT p.PlayerID, p.FirstName, p.LastName, p.SkillDivision,
+           rt.ScorecardID, rt.EventID, e.EventDate, e.Name AS EventName, rt.ScorecardTotal
+    FROM {source} AS rt
+    INNER JOIN Player p ON rt.PlayerID = p.PlayerID
+    INNER JOIN Event e ON rt.EventID = e.EventID
+""", ('ScorecardTotal', 'ScorecardID'), descending=True,
+    source="SELECT ScorecardID, PlayerID, EventID, RoundTotal AS ScorecardTotal FROM RoundTotals WHERE PlayerID = ?",
+    numbered="{n} AS ScoreRank, CASE WHEN {n} <= 3 THEN 'Yes' ELSE 'No' END AS CountsTowardTotal")
+
+def fetch_player_history(player_id):
+    """Rows for /api/players/<id>/history"""
+    return execute_query(PLAYER_HISTORY.all_sql(), [player_id])
+
+@app.route('/api/leaderboard/consistency', methods=['GET'])
+def check_leaderboard_consistency():
+    """Compare the in-memory all-time leaderboard with vw_PlayerLeaderboard"""
+    try:
+        return jsonify(leaderboard_engine.verify())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/players/<int:player_id>/history', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
 def get_player_history(player_id):
-    """Get player's score history from vw_PlayerScoreHistory view"""
+    """Get player's score history from vw_PlayerScoreHistory view (paged with ?limit=&after=)"""
     try:
-        results = execute_query(
-            "SELECT * FROM vw_PlayerScoreHistory WHERE PlayerID = ? ORDER BY ScorecardTotal DESC",
-            [player_id]
-        )
-        return jsonify(results)
+        return list_response(PLAYER_HISTORY, [player_id])
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def is_missing_view_error(error):
+    """True if the error is SQL Server's "object not found" (42S02)"""
+    error_str = str(error)
+    return '42S02' in error_str or 'Invalid object name' in error_str
+
 def handle_missing_view(view_name, error):
     """Helper to gracefully handle missing database views in development"""
-    error_str = str(error)
-    # Check if it's a "object not found" error (42S02)
-    if '42S02' in error_str or 'Invalid object name' in error_str:
+    if is_missing_view_error(error):
         print(f"[DEV] View '{view_name}' not found in database.")
         print(f"[DEV] To create this view, run the SQL from 'Scoreboard Views.md'")
         print(f"[DEV] Returning empty array for now...")
@@ -262,7 +844,43 @@ def handle_missing_view(view_name, error):
         })
     return None
 
+@stats_cache.cached('hot-rounds', PLAYER_STATS_TABLES)
+def fetch_hot_rounds(event_limit):
+    """Rows for /api/stats/hot-rounds (see get_hot_rounds)"""
+    if event_limit == 'all':
+        results = execute_query(
+            "SELECT * FROM vw_HotRoundPerEvent ORDER BY EventDate DESC, SkillDivision, OverallRank"
+        )
+    elif event_limit == 'latest':
+        # Get only the most recent event's hot rounds
+        results = execute_query("""
+            SELECT * FROM vw_HotRoundPerEvent 
+            WHERE EventDate = (SELECT MAX(EventDate) FROM vw_HotRoundPerEvent)
+            ORDER BY SkillDivision, OverallRank
+        """)
+    else:
+        # Get hot rounds from the last N events
+        try:
+            limit = int(event_limit)
+            results = execute_query("""
+                WITH RecentEvents AS (
+                    SELECT DISTINCT TOP (?) EventDate 
+                    FROM vw_HotRoundPerEvent 
+                    ORDER BY EventDate DESC
+                )
+                SELECT h.* FROM vw_HotRoundPerEvent h
+                INNER JOIN RecentEvents r ON h.EventDate = r.EventDate
+                ORDER BY h.EventDate DESC, h.SkillDivision, h.OverallRank
+            """, [limit])
+        except ValueError:
+            results = execute_query(
+                "SELECT * FROM vw_HotRoundPerEvent ORDER BY EventDate DESC, SkillDivision, OverallRank"
+            )
+    
+    return results
+
 @app.route('/api/stats/hot-rounds', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
 def get_hot_rounds():
     """Get hot rounds (best player rounds per event) from vw_HotRoundPerEvent view
     
@@ -271,45 +889,66 @@ def get_hot_rounds():
     """
     try:
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        if event_limit == 'all':
-            results = execute_query(
-                "SELECT * FROM vw_HotRoundPerEvent ORDER BY EventDate DESC, SkillDivision, OverallRank"
-            )
-        elif event_limit == 'latest':
-            # Get only the most recent event's hot rounds
-            results = execute_query("""
-                SELECT * FROM vw_HotRoundPerEvent 
-                WHERE EventDate = (SELECT MAX(EventDate) FROM vw_HotRoundPerEvent)
-                ORDER BY SkillDivision, OverallRank
-            """)
-        else:
-            # Get hot rounds from the last N events
-            try:
-                limit = int(event_limit)
-                results = execute_query("""
-                    WITH RecentEvents AS (
-                        SELECT DISTINCT TOP (?) EventDate 
-                        FROM vw_HotRoundPerEvent 
-                        ORDER BY EventDate DESC
-                    )
-                    SELECT h.* FROM vw_HotRoundPerEvent h
-                    INNER JOIN RecentEvents r ON h.EventDate = r.EventDate
-                    ORDER BY h.EventDate DESC, h.SkillDivision, h.OverallRank
-                """, [limit])
-            except ValueError:
-                results = execute_query(
-                    "SELECT * FROM vw_HotRoundPerEvent ORDER BY EventDate DESC, SkillDivision, OverallRank"
-                )
-        
-        return jsonify(results)
+        return rows_response(fetch_hot_rounds(event_limit))
     except Exception as e:
         fallback = handle_missing_view('vw_HotRoundPerEvent', e)
         if fallback:
             return fallback
         return jsonify({"error": str(e)}), 500
 
+# Event dates of the 'latest' and last-N stats windows, for {window_cte}
+LATEST_DATE_CTE = "WindowDates AS (SELECT MAX(EventDate) AS EventDate FROM Event)"
+RECENT_DATES_CTE = "WindowDates AS (SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC)"
+
+# vw_PodiumPercentage restricted to the rounds of some events: a podium
+# finish is a round in the top 3 of its skill division at its event
+PODIUM_WINDOW_SQL = """
+    WITH {window_cte},
+    RankedByEvent AS (
+        SELECT
+            rt.PlayerID,
+            p.FirstName,
+            p.LastName,
+            p.SkillDivision,
+            e.EventDate,
+            RANK() OVER (PARTITION BY rt.EventID, p.SkillDivision ORDER BY rt.RoundTotal DESC) AS DivisionRank
+        FROM RoundTotals rt
+        INNER JOIN Player p ON rt.PlayerID = p.PlayerID
+        INNER JOIN Event e ON rt.EventID = e.EventID
+    )
+    SELECT
+        CONCAT(FirstName, ' ', LastName) AS PlayerName,
+        SkillDivision,
+        COUNT(CASE WHEN DivisionRank <= 3 THEN 1 END) AS PodiumFinishes,
+        COUNT(*) AS TotalRounds,
+        CAST(COUNT(CASE WHEN DivisionRank <= 3 THEN 1 END) * 100.0 / COUNT(*) AS DECIMAL(5,1)) AS PodiumPercentage
+    FROM RankedByEvent
+    WHERE EventDate IN (SELECT EventDate FROM WindowDates)
+    GROUP BY PlayerID, FirstName, LastName, SkillDivision
+    ORDER BY PodiumPercentage DESC
+"""
+
+@stats_cache.cached('podium', PLAYER_STATS_TABLES)
+def fetch_podium_stats(event_limit):
+    """Rows for /api/stats/podium (see get_podium_stats)"""
+    if STATS_ENGINE_CONFIG['enabled']:
+        # Merged from per-event partials (see stats.py)
+        results = stats_engine.podium(event_limit)
+    elif event_limit == 'latest':
+        # Get podium stats only from the most recent event
+        results = execute_query(PODIUM_WINDOW_SQL.format(window_cte=LATEST_DATE_CTE))
+    elif event_limit.isdigit():
+        # Get podium stats from the last N events
+        results = execute_query(PODIUM_WINDOW_SQL.format(window_cte=RECENT_DATES_CTE), [int(event_limit)])
+    else:
+        results = execute_query(
+            "SELECT * FROM vw_PodiumPercentage ORDER BY PodiumPercentage DESC"
+        )
+    
+    return results
+
 @app.route('/api/stats/podium', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
 def get_podium_stats():
     """Get podium percentage stats from vw_PodiumPercentage view
     
@@ -318,78 +957,50 @@ def get_podium_stats():
     """
     try:
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        if event_limit == 'all':
-            results = execute_query(
-                "SELECT * FROM vw_PodiumPercentage ORDER BY PodiumPercentage DESC"
-            )
-        elif event_limit == 'latest':
-            # Get podium stats only from the most recent event
-            results = execute_query("""
-                WITH LatestEvent AS (
-                    SELECT MAX(EventDate) as MaxDate FROM Event
-                ),
-                LatestPodium AS (
-                    SELECT 
-                        CONCAT(p.FirstName, ' ', p.LastName) AS PlayerName,
-                        p.SkillDivision,
-                        CASE WHEN psh.ScoreRank <= 3 THEN 1 ELSE 0 END AS IsPodium,
-                        1 AS RoundCount
-                    FROM vw_PlayerScoreHistory psh
-                    JOIN Player p ON psh.PlayerID = p.PlayerID
-                    WHERE psh.EventDate = (SELECT MaxDate FROM LatestEvent)
-                )
-                SELECT 
-                    PlayerName,
-                    SkillDivision,
-                    SUM(IsPodium) AS PodiumFinishes,
-                    COUNT(*) AS TotalRounds,
-                    CAST(SUM(IsPodium) * 100.0 / COUNT(*) AS DECIMAL(5,2)) AS PodiumPercentage
-                FROM LatestPodium
-                GROUP BY PlayerName, SkillDivision
-                ORDER BY PodiumPercentage DESC
-            """)
-        else:
-            # Get podium stats from the last N events
-            try:
-                limit = int(event_limit)
-                results = execute_query("""
-                    WITH RecentEvents AS (
-                        SELECT DISTINCT TOP (?) EventDate FROM Event ORDER BY EventDate DESC
-                    ),
-                    FilteredPodium AS (
-                        SELECT 
-                            CONCAT(p.FirstName, ' ', p.LastName) AS PlayerName,
-                            p.SkillDivision,
-                            CASE WHEN psh.ScoreRank <= 3 THEN 1 ELSE 0 END AS IsPodium,
-                            1 AS RoundCount
-                        FROM vw_PlayerScoreHistory psh
-                        JOIN Player p ON psh.PlayerID = p.PlayerID
-                        WHERE psh.EventDate IN (SELECT EventDate FROM RecentEvents)
-                    )
-                    SELECT 
-                        PlayerName,
-                        SkillDivision,
-                        SUM(IsPodium) AS PodiumFinishes,
-                        COUNT(*) AS TotalRounds,
-                        CAST(SUM(IsPodium) * 100.0 / COUNT(*) AS DECIMAL(5,2)) AS PodiumPercentage
-                    FROM FilteredPodium
-                    GROUP BY PlayerName, SkillDivision
-                    ORDER BY PodiumPercentage DESC
-                """, [limit])
-            except ValueError:
-                results = execute_query(
-                    "SELECT * FROM vw_PodiumPercentage ORDER BY PodiumPercentage DESC"
-                )
-        
-        return jsonify(results)
+        return rows_response(fetch_podium_stats(event_limit))
     except Exception as e:
         fallback = handle_missing_view('vw_PodiumPercentage', e)
         if fallback:
             return fallback
         return jsonify({"error": str(e)}), 500
 
+@stats_cache.cached('top-cards', PLAYER_STATS_TABLES)
+def fetch_top_cards(event_limit):
+    """Rows for /api/stats/top-cards (see get_top_cards)"""
+    if event_limit == 'all':
+        results = execute_query(
+            "SELECT * FROM vw_TopCardPerEvent ORDER BY EventDate DESC, CardRank"
+        )
+    elif event_limit == 'latest':
+        # Get only the most recent event's top cards
+        results = execute_query("""
+            SELECT * FROM vw_TopCardPerEvent 
+            WHERE EventDate = (SELECT MAX(EventDate) FROM vw_TopCardPerEvent)
+            ORDER BY CardRank
+        """)
+    else:
+        # Get top cards from the last N events
+        try:
+            limit = int(event_limit)
+            results = execute_query("""
+                WITH RecentEvents AS (
+                    SELECT DISTINCT TOP (?) EventDate 
+                    FROM vw_TopCardPerEvent 
+                    ORDER BY EventDate DESC
+                )
+                SELECT t.* FROM vw_TopCardPerEvent t
+                INNER JOIN RecentEvents r ON t.EventDate = r.EventDate
+                ORDER BY t.EventDate DESC, t.CardRank
+            """, [limit])
+        except ValueError:
+            results = execute_query(
+                "SELECT * FROM vw_TopCardPerEvent ORDER BY EventDate DESC, CardRank"
+            )
+    
+    return results
+
 @app.route('/api/stats/top-cards', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
 def get_top_cards():
     """Get top cards (best group scores per event) from vw_TopCardPerEvent view
     
@@ -398,45 +1009,59 @@ def get_top_cards():
     """
     try:
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        if event_limit == 'all':
-            results = execute_query(
-                "SELECT * FROM vw_TopCardPerEvent ORDER BY EventDate DESC, CardRank"
-            )
-        elif event_limit == 'latest':
-            # Get only the most recent event's top cards
-            results = execute_query("""
-                SELECT * FROM vw_TopCardPerEvent 
-                WHERE EventDate = (SELECT MAX(EventDate) FROM vw_TopCardPerEvent)
-                ORDER BY CardRank
-            """)
-        else:
-            # Get top cards from the last N events
-            try:
-                limit = int(event_limit)
-                results = execute_query("""
-                    WITH RecentEvents AS (
-                        SELECT DISTINCT TOP (?) EventDate 
-                        FROM vw_TopCardPerEvent 
-                        ORDER BY EventDate DESC
-                    )
-                    SELECT t.* FROM vw_TopCardPerEvent t
-                    INNER JOIN RecentEvents r ON t.EventDate = r.EventDate
-                    ORDER BY t.EventDate DESC, t.CardRank
-                """, [limit])
-            except ValueError:
-                results = execute_query(
-                    "SELECT * FROM vw_TopCardPerEvent ORDER BY EventDate DESC, CardRank"
-                )
-        
-        return jsonify(results)
+        return rows_response(fetch_top_cards(event_limit))
     except Exception as e:
         fallback = handle_missing_view('vw_TopCardPerEvent', e)
         if fallback:
             return fallback
         return jsonify({"error": str(e)}), 500
 
+@stats_cache.cached('hole-difficulty', COURSE_STATS_TABLES)
+def fetch_hole_difficulty(event_limit):
+    """Rows for /api/stats/hole-difficulty (see get_hole_difficulty)"""
+    if STATS_ENGINE_CONFIG['enabled']:
+        # Merged from per-event partials (see stats.py)
+        results = stats_engine.hole_difficulty(event_limit)
+    elif event_limit == 'all':
+        results = execute_query(
+            "SELECT * FROM vw_HoleDifficultyRanking ORDER BY AvgScore ASC"
+        )
+    elif event_limit == 'latest':
+        # Get only the most recent event's hole difficulty
+        results = execute_query("""
+            WITH LatestEvent AS (
+                SELECT MAX(e.EventDate) as MaxDate FROM Event e
+                WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
+            )
+            SELECT h.* FROM vw_HoleDifficultyRanking h
+            JOIN Event e ON h.EventID = e.EventID
+            WHERE e.EventDate = (SELECT MaxDate FROM LatestEvent)
+            ORDER BY h.AvgScore ASC
+        """)
+    else:
+        # Get hole difficulty from the last N events
+        try:
+            limit = int(event_limit)
+            results = execute_query("""
+                WITH RecentEvents AS (
+                    SELECT DISTINCT TOP (?) e.EventID, e.EventDate 
+                    FROM Event e
+                    WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
+                    ORDER BY e.EventDate DESC, e.EventID DESC
+                )
+                SELECT h.* FROM vw_HoleDifficultyRanking h
+                INNER JOIN RecentEvents r ON h.EventID = r.EventID
+                ORDER BY r.EventDate DESC, h.AvgScore ASC
+            """, [limit])
+        except ValueError:
+            results = execute_query(
+                "SELECT * FROM vw_HoleDifficultyRanking ORDER BY AvgScore ASC"
+            )
+    
+    return results
+
 @app.route('/api/stats/hole-difficulty', methods=['GET'])
+@reads(*COURSE_STATS_TABLES)
 def get_hole_difficulty():
     """Get hole difficulty rankings from vw_HoleDifficultyRanking view
     
@@ -445,51 +1070,88 @@ def get_hole_difficulty():
     """
     try:
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        if event_limit == 'all':
-            results = execute_query(
-                "SELECT * FROM vw_HoleDifficultyRanking ORDER BY AvgScore ASC"
-            )
-        elif event_limit == 'latest':
-            # Get only the most recent event's hole difficulty
-            results = execute_query("""
-                WITH LatestEvent AS (
-                    SELECT MAX(e.EventDate) as MaxDate FROM Event e
-                    WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
-                )
-                SELECT h.* FROM vw_HoleDifficultyRanking h
-                JOIN Event e ON h.EventID = e.EventID
-                WHERE e.EventDate = (SELECT MaxDate FROM LatestEvent)
-                ORDER BY h.AvgScore ASC
-            """)
-        else:
-            # Get hole difficulty from the last N events
-            try:
-                limit = int(event_limit)
-                results = execute_query("""
-                    WITH RecentEvents AS (
-                        SELECT DISTINCT TOP (?) e.EventID, e.EventDate 
-                        FROM Event e
-                        WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
-                        ORDER BY e.EventDate DESC
-                    )
-                    SELECT h.* FROM vw_HoleDifficultyRanking h
-                    INNER JOIN RecentEvents r ON h.EventID = r.EventID
-                    ORDER BY r.EventDate DESC, h.AvgScore ASC
-                """, [limit])
-            except ValueError:
-                results = execute_query(
-                    "SELECT * FROM vw_HoleDifficultyRanking ORDER BY AvgScore ASC"
-                )
-        
-        return jsonify(results)
+        return rows_response(fetch_hole_difficulty(event_limit))
     except Exception as e:
         fallback = handle_missing_view('vw_HoleDifficultyRanking', e)
         if fallback:
             return fallback
         return jsonify({"error": str(e)}), 500
 
+# vw_HardestBaskets restricted to the events in WindowEvents, which are
+# picked from the events in vw_HoleDifficultyRanking as in
+# fetch_hole_difficulty
+BASKET_WINDOW_SQL = """
+    WITH {window_cte}
+    SELECT 
+        b.Brand,
+        b.Model,
+        b.ChainCount,
+        CASE WHEN b.HasUpperBand = 1 THEN 'Yes' ELSE 'No' END AS HasUpperBand,
+        COUNT(DISTINCT el.LayoutID) AS TimesUsed,
+        COUNT(DISTINCT s.ScoreID) AS TotalAttempts,
+        ROUND(AVG(CAST(s.Strokes AS FLOAT)), 2) AS AvgScore,
+        SUM(CASE WHEN s.Strokes = 0 THEN 1 ELSE 0 END) AS ZeroScores,
+        SUM(CASE WHEN s.Strokes = 1 THEN 1 ELSE 0 END) AS OneScores,
+        SUM(CASE WHEN s.Strokes = 2 THEN 1 ELSE 0 END) AS TwoScores,
+        SUM(CASE WHEN s.Strokes = 3 THEN 1 ELSE 0 END) AS PerfectScores,
+        CASE 
+            WHEN AVG(CAST(s.Strokes AS FLOAT)) < 1.0 THEN 'Extremely Difficult'
+            WHEN AVG(CAST(s.Strokes AS FLOAT)) < 1.5 THEN 'Very Difficult'
+            WHEN AVG(CAST(s.Strokes AS FLOAT)) < 2.0 THEN 'Difficult'
+            WHEN AVG(CAST(s.Strokes AS FLOAT)) < 2.5 THEN 'Moderate'
+            ELSE 'Easy'
+        END AS DifficultyRating,
+        RANK() OVER (ORDER BY AVG(CAST(s.Strokes AS FLOAT)) ASC) AS DifficultyRank
+    FROM Basket b
+    INNER JOIN LayoutBasket lb ON b.BasketID = lb.BasketID
+    INNER JOIN EventLayout el ON lb.LayoutID = el.LayoutID AND lb.HoleNumber = el.HoleNumber
+    INNER JOIN Event e ON el.LayoutID = e.EventID
+    INNER JOIN Scorecard sc ON e.EventID = sc.EventID
+    INNER JOIN Score s ON sc.ScorecardID = s.ScorecardID AND el.HoleNumber = s.HoleNumber
+    WHERE e.EventID IN (SELECT EventID FROM WindowEvents)
+    GROUP BY b.BasketID, b.Brand, b.Model, b.ChainCount, b.HasUpperBand
+    ORDER BY DifficultyRank
+"""
+
+@stats_cache.cached('basket-stats', COURSE_STATS_TABLES)
+def fetch_basket_stats(event_limit):
+    """Rows for /api/stats/basket-stats (see get_basket_stats)"""
+    if STATS_ENGINE_CONFIG['enabled']:
+        # vw_HardestBaskets over the window's events, merged from per-event
+        # partials (see stats.py)
+        results = stats_engine.basket_stats(event_limit)
+    elif event_limit == 'latest':
+        # Only the most recent event(s) with a layout
+        results = execute_query(BASKET_WINDOW_SQL.format(window_cte="""
+            LatestEvent AS (
+                SELECT MAX(e.EventDate) as MaxDate FROM Event e
+                WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
+            ),
+            WindowEvents AS (
+                SELECT e.EventID FROM Event e
+                WHERE e.EventDate = (SELECT MaxDate FROM LatestEvent)
+                AND e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
+            )
+        """))
+    elif event_limit.isdigit():
+        # The last N events with a layout
+        results = execute_query(BASKET_WINDOW_SQL.format(window_cte="""
+            WindowEvents AS (
+                SELECT DISTINCT TOP (?) e.EventID, e.EventDate 
+                FROM Event e
+                WHERE e.EventID IN (SELECT DISTINCT EventID FROM vw_HoleDifficultyRanking)
+                ORDER BY e.EventDate DESC, e.EventID DESC
+            )
+        """), [int(event_limit)])
+    else:
+        results = execute_query(
+            "SELECT * FROM vw_HardestBaskets ORDER BY DifficultyRank"
+        )
+    
+    return results
+
 @app.route('/api/stats/basket-stats', methods=['GET'])
+@reads(*COURSE_STATS_TABLES)
 def get_basket_stats():
     """Get basket difficulty stats from vw_HardestBaskets view
     
@@ -501,29 +1163,72 @@ def get_basket_stats():
     """
     try:
         event_limit = request.args.get('eventLimit', 'latest')
-        
-        # For basket stats, we use the full view but note in the response
-        # that we're showing overall stats. Event-specific filtering would
-        # require a different query structure since baskets span multiple events.
-        if event_limit == 'all':
-            results = execute_query(
-                "SELECT * FROM vw_HardestBaskets ORDER BY DifficultyRank"
-            )
-        else:
-            # For 'latest' or N events, still return all basket stats
-            # since basket difficulty is best understood across all uses
-            results = execute_query(
-                "SELECT * FROM vw_HardestBaskets ORDER BY DifficultyRank"
-            )
-        
-        return jsonify(results)
+        return rows_response(fetch_basket_stats(event_limit))
     except Exception as e:
         fallback = handle_missing_view('vw_HardestBaskets', e)
         if fallback:
             return fallback
         return jsonify({"error": str(e)}), 500
 
+# Every round in the window's events, for head_to_head()
+HEAD_TO_HEAD_ROUNDS_SQL = """
+    WITH {window_cte}
+    SELECT rt.EventID, rt.PlayerID, rt.RoundTotal
+    FROM RoundTotals rt
+    INNER JOIN Event e ON rt.EventID = e.EventID
+    WHERE e.EventDate IN (SELECT EventDate FROM WindowDates)
+"""
+
+@stats_cache.cached('head-to-head', PLAYER_STATS_TABLES)
+def fetch_head_to_head(player_ids, event_limit):
+    """Rows for /api/stats/head-to-head (see get_head_to_head)"""
+    if STATS_ENGINE_CONFIG['enabled']:
+        # From the round totals in the per-event partials (see stats.py)
+        return stats_engine.head_to_head(player_ids, event_limit)
+    if event_limit == 'latest':
+        rounds = execute_query(HEAD_TO_HEAD_ROUNDS_SQL.format(window_cte=LATEST_DATE_CTE))
+    elif event_limit.isdigit():
+        rounds = execute_query(HEAD_TO_HEAD_ROUNDS_SQL.format(window_cte=RECENT_DATES_CTE), [int(event_limit)])
+    else:
+        rounds = execute_query("SELECT EventID, PlayerID, RoundTotal FROM RoundTotals")
+    columns = list(zip(*rounds.raw)) if rounds.raw else [(), (), ()]
+    return head_to_head(*columns, selected=player_ids)
+
+@app.route('/api/stats/head-to-head', methods=['GET'])
+@reads(*PLAYER_STATS_TABLES)
+def get_head_to_head():
+    """Get pairwise win/loss/tie records between players over shared events
+    
+    Query params:
+        players: comma-separated PlayerIDs to compare (default: every player)
+        eventLimit: 'all' (default), 'latest', or number (e.g. '5' for last 5 events)
+    
+    One row per pair of players who played a common event (PlayerID <
+    OpponentID), from PlayerID's side: at each event their best rounds are
+    compared, the higher RoundTotal winning, and AvgMargin is the average
+    difference.
+    """
+    try:
+        players = request.args.get('players')
+        try:
+            player_ids = None if players is None else tuple(sorted({int(p) for p in players.split(',') if p.strip()}))
+        except ValueError:
+            return jsonify({"error": "players must be a comma-separated list of PlayerIDs"}), 400
+        event_limit = request.args.get('eventLimit', 'all')
+        return rows_response(fetch_head_to_head(player_ids, event_limit))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/stats/consistency', methods=['GET'])
+def check_stats_consistency():
+    """Compare the in-memory course and podium stats with their views"""
+    try:
+        return jsonify(stats_engine.verify())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/stats/card-details/<int:scorecard_id>', methods=['GET'])
+@reads('Score', 'Scorecard', 'ScorecardMember', 'Event', 'Player')
 def get_card_details(scorecard_id):
     """Get detailed card information including per-hole scores for all players
     
@@ -537,52 +1242,73 @@ def get_card_details(scorecard_id):
     try:
         compare_player_id = request.args.get('playerId', type=int)
         
-        # Get card info with event details
-        card_info = execute_query("""
-            SELECT 
-                s.ScorecardID,
-                s.EventID,
-                e.Name as EventName,
-                e.EventDate,
-                e.HoleCount,
-                (SELECT SUM(sc.Strokes) FROM Score sc WHERE sc.ScorecardID = s.ScorecardID) as CardTotal
-            FROM Scorecard s
-            JOIN Event e ON s.EventID = e.EventID
-            WHERE s.ScorecardID = ?
-        """, [scorecard_id])
+        queries = [
+            # Card info with event details
+            ('card', """
+                SELECT 
+                    s.ScorecardID,
+                    s.EventID,
+                    e.Name as EventName,
+                    e.EventDate,
+                    e.HoleCount,
+                    (SELECT SUM(sc.Strokes) FROM Score sc WHERE sc.ScorecardID = s.ScorecardID) as CardTotal
+                FROM Scorecard s
+                JOIN Event e ON s.EventID = e.EventID
+                WHERE s.ScorecardID = ?
+            """, [scorecard_id]),
+            # All members and their totals
+            ('members', """
+                SELECT 
+                    sm.PlayerID,
+                    p.FirstName,
+                    p.LastName,
+                    p.SkillDivision,
+                    sm.MemberPosition,
+                    (SELECT SUM(sc.Strokes) FROM Score sc 
+                     WHERE sc.ScorecardID = sm.ScorecardID AND sc.PlayerID = sm.PlayerID) as PlayerTotal
+                FROM ScorecardMember sm
+                JOIN Player p ON sm.PlayerID = p.PlayerID
+                WHERE sm.ScorecardID = ?
+                ORDER BY PlayerTotal DESC
+            """, [scorecard_id]),
+            # Per-hole scores
+            ('scores', """
+                SELECT 
+                    sc.HoleNumber,
+                    sc.PlayerID,
+                    sc.Strokes,
+                    p.FirstName,
+                    p.LastName
+                FROM Score sc
+                JOIN Player p ON sc.PlayerID = p.PlayerID
+                WHERE sc.ScorecardID = ?
+                ORDER BY sc.HoleNumber, sc.PlayerID
+            """, [scorecard_id]),
+        ]
+        if compare_player_id:
+            # The compared player's scores for the same event as this card
+            queries.append(('compareScores', """
+                SELECT 
+                    sc.HoleNumber,
+                    sc.Strokes,
+                    s.ScorecardID
+                FROM Score sc
+                JOIN Scorecard s ON sc.ScorecardID = s.ScorecardID
+                JOIN ScorecardMember sm ON s.ScorecardID = sm.ScorecardID AND sm.PlayerID = sc.PlayerID
+                WHERE s.EventID = (SELECT EventID FROM Scorecard WHERE ScorecardID = ?)
+                AND sc.PlayerID = ?
+                ORDER BY sc.HoleNumber
+            """, [scorecard_id, compare_player_id]))
+        
+        # One round trip for all of the card's result sets
+        batch = execute_batch(queries)
+        card_info = batch['card']
         
         if not card_info:
             return jsonify({"error": "Card not found"}), 404
         
-        # Get all members and their scores
-        members = execute_query("""
-            SELECT 
-                sm.PlayerID,
-                p.FirstName,
-                p.LastName,
-                p.SkillDivision,
-                sm.MemberPosition,
-                (SELECT SUM(sc.Strokes) FROM Score sc 
-                 WHERE sc.ScorecardID = sm.ScorecardID AND sc.PlayerID = sm.PlayerID) as PlayerTotal
-            FROM ScorecardMember sm
-            JOIN Player p ON sm.PlayerID = p.PlayerID
-            WHERE sm.ScorecardID = ?
-            ORDER BY PlayerTotal DESC
-        """, [scorecard_id])
-        
-        # Get per-hole scores
-        scores = execute_query("""
-            SELECT 
-                sc.HoleNumber,
-                sc.PlayerID,
-                sc.Strokes,
-                p.FirstName,
-                p.LastName
-            FROM Score sc
-            JOIN Player p ON sc.PlayerID = p.PlayerID
-            WHERE sc.ScorecardID = ?
-            ORDER BY sc.HoleNumber, sc.PlayerID
-        """, [scorecard_id])
+        members = batch['members']
+        scores = batch['scores']
         
         # Calculate best/worst hole (by combined score)
         hole_totals = {}
@@ -605,19 +1331,7 @@ def get_card_details(scorecard_id):
         
         # If comparing to a specific player, get their scores for the same event
         if compare_player_id:
-            event_id = card_info[0]['EventID']
-            compare_scores = execute_query("""
-                SELECT 
-                    sc.HoleNumber,
-                    sc.Strokes,
-                    s.ScorecardID
-                FROM Score sc
-                JOIN Scorecard s ON sc.ScorecardID = s.ScorecardID
-                JOIN ScorecardMember sm ON s.ScorecardID = sm.ScorecardID AND sm.PlayerID = sc.PlayerID
-                WHERE s.EventID = ? AND sc.PlayerID = ?
-                ORDER BY sc.HoleNumber
-            """, [event_id, compare_player_id])
-            
+            compare_scores = batch['compareScores']
             compare_total = sum(s['Strokes'] for s in compare_scores) if compare_scores else 0
             result['compareScores'] = {
                 'playerId': compare_player_id,
@@ -634,6 +1348,7 @@ def get_card_details(scorecard_id):
 # ============================================
 
 @app.route('/api/layouts', methods=['GET'])
+@reads('EventLayout')
 def get_layouts():
     """Get all available layouts with hole count"""
     try:
@@ -650,12 +1365,20 @@ def get_layouts():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+EVENTS = Keyset("SELECT * FROM Event", ('EventDate', 'EventID'), descending=True)
+
+def fetch_events():
+    """Rows for /api/events"""
+    return execute_query(EVENTS.all_sql())
+
 @app.route('/api/events', methods=['GET'])
+@reads('Event')
 def get_events():
-    """Get all events"""
+    """Get all events, newest first (paged with ?limit=&after=)"""
     try:
-        results = execute_query("SELECT * FROM Event ORDER BY EventDate DESC")
-        return jsonify(results)
+        return list_response(EVENTS)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -668,14 +1391,17 @@ def create_event():
             data['name'],
             data.get('layoutId', 1)  # Default to layoutId 1
         ])
+        # A new event becomes the 'latest' event for the stats windows
+        tables_changed('Event')
         # execute_proc returns an array, but we need the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 201
         return jsonify(result), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/events/<int:event_id>', methods=['GET'])
+@reads('Event')
 def get_event(event_id):
     """Get a single event by ID"""
     try:
@@ -687,6 +1413,7 @@ def get_event(event_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/events/<int:event_id>/holes', methods=['GET'])
+@reads(*COURSE_STATS_TABLES)
 def get_event_holes(event_id):
     """Get hole stats for an event from vw_EventHoleStats view"""
     try:
@@ -699,6 +1426,7 @@ def get_event_holes(event_id):
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/events/<int:event_id>/layout', methods=['GET'])
+@reads('EventLayout')
 def get_event_layout(event_id):
     """Get event layout (holes with distances)"""
     try:
@@ -710,7 +1438,37 @@ def get_event_layout(event_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/events/<int:event_id>/live', methods=['GET'])
+def get_event_live(event_id):
+    """Server-Sent Events stream of the event's scoring (see live.py)
+
+    Events:
+        ready: {eventId, seq} on connect; load the scoreboard, then apply deltas
+        delta: {eventId, scores?, totals?, removed?, ranks?} for each committed write
+        reset: {eventId, seq} when a resume point is lost; reload, then continue
+        deleted: {eventId} when the event is deleted (the stream then ends)
+
+    Reconnects resume after Last-Event-ID (or ?lastEventId=). A comment is
+    sent every LIVE_HEARTBEAT_INTERVAL seconds while nothing happens.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    resumed = last_event_id is not None and last_event_id.isdigit()
+    try:
+        if not execute_query("SELECT EventID FROM Event WHERE EventID = ?", [event_id]):
+            return jsonify({"error": "Event not found"}), 404
+        current = live_hub.subscribe(event_id, lambda e: execute_query(STANDINGS_SQL, [e]))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    stream = LiveStream(live_hub, event_id, int(last_event_id) if resumed else current, resumed)
+    # Lets asgi.py serve the stream without holding a worker thread
+    request.environ[LIVE_STREAM_KEY] = stream
+    response = Response(stream, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/events/summary', methods=['GET'])
+@reads(*COURSE_STATS_TABLES)
 def get_events_summary():
     """Get event summaries from vw_EventSummary view"""
     try:
@@ -738,12 +1496,15 @@ def generate_mock_data(event_id):
         
         # Generate scores for the event
         scores_result = execute_proc("GenerateScoresForEvent", [event_id])
+        refresh_round_totals(event_id=event_id)
+        tables_changed('Scorecard', 'ScorecardMember', 'Score', events=[event_id])
+        after_commit(leaderboard_engine.reset)
         
         return jsonify({
             "success": True,
             "eventId": event_id,
-            "scorecardsResult": scorecards_result[0] if isinstance(scorecards_result, list) and len(scorecards_result) > 0 else scorecards_result,
-            "scoresResult": scores_result[0] if isinstance(scores_result, list) and len(scores_result) > 0 else scores_result
+            "scorecardsResult": scorecards_result[0] if isinstance(scorecards_result, Rows) and len(scorecards_result) > 0 else scorecards_result,
+            "scoresResult": scores_result[0] if isinstance(scores_result, Rows) and len(scores_result) > 0 else scores_result
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -763,9 +1524,14 @@ def delete_event(event_id):
             event_id,
             1 if confirm_delete else 0  # Convert boolean to bit
         ])
+        if confirm_delete:
+            refresh_round_totals(event_id=event_id)
+            tables_changed('Event', 'Scorecard', 'ScorecardMember', 'Score', events=[event_id])
+            after_commit(leaderboard_engine.reset)
+            after_commit(lambda: live_hub.publish_deleted(event_id))
         
         # execute_proc returns an array, get the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 200
         return jsonify({"success": True}), 200
     except Exception as e:
@@ -775,52 +1541,60 @@ def delete_event(event_id):
 # SCORECARDS
 # ============================================
 
+SCORECARDS = Keyset("""
+    SELECT s.*, e.Name as EventName, e.EventDate, e.HoleCount,
+           p.FirstName, p.LastName
+    FROM {source} AS s
+    JOIN Event e ON s.EventID = e.EventID
+    LEFT JOIN Player p ON s.CreatedByPlayerID = p.PlayerID
+""", (('CreatedAt', 'datetime'), 'ScorecardID'), descending=True, source="SELECT * FROM Scorecard")
+
 @app.route('/api/scorecards', methods=['GET'])
+@reads('Scorecard', 'Event', 'Player')
 def get_scorecards():
-    """Get all scorecards with event info"""
+    """Get all scorecards with event info, newest first (paged with ?limit=&after=)"""
     try:
-        results = execute_query("""
-            SELECT s.*, e.Name as EventName, e.EventDate, e.HoleCount,
-                   p.FirstName, p.LastName
-            FROM Scorecard s
-            JOIN Event e ON s.EventID = e.EventID
-            LEFT JOIN Player p ON s.CreatedByPlayerID = p.PlayerID
-            ORDER BY s.CreatedAt DESC
-        """)
-        return jsonify(results)
+        return list_response(SCORECARDS)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/scorecards/<int:scorecard_id>', methods=['GET'])
+@reads('Scorecard', 'Event', 'ScorecardMember', 'Player', 'Score')
 def get_scorecard(scorecard_id):
     """Get a single scorecard with members and scores"""
     try:
-        # Get scorecard info
-        scorecard = execute_query("""
-            SELECT s.*, e.Name as EventName, e.EventDate, e.HoleCount
-            FROM Scorecard s
-            JOIN Event e ON s.EventID = e.EventID
-            WHERE s.ScorecardID = ?
-        """, [scorecard_id])
+        batch = execute_batch([
+            # Scorecard info
+            ('scorecard', """
+                SELECT s.*, e.Name as EventName, e.EventDate, e.HoleCount
+                FROM Scorecard s
+                JOIN Event e ON s.EventID = e.EventID
+                WHERE s.ScorecardID = ?
+            """, [scorecard_id]),
+            # Members
+            ('members', """
+                SELECT sm.*, p.FirstName, p.LastName, p.SkillDivision
+                FROM ScorecardMember sm
+                JOIN Player p ON sm.PlayerID = p.PlayerID
+                WHERE sm.ScorecardID = ?
+                ORDER BY sm.MemberPosition
+            """, [scorecard_id]),
+            # Scores
+            ('scores', """
+                SELECT * FROM Score
+                WHERE ScorecardID = ?
+                ORDER BY HoleNumber, PlayerID
+            """, [scorecard_id]),
+        ])
+        scorecard = batch['scorecard']
         
         if not scorecard:
             return jsonify({"error": "Scorecard not found"}), 404
         
-        # Get members
-        members = execute_query("""
-            SELECT sm.*, p.FirstName, p.LastName, p.SkillDivision
-            FROM ScorecardMember sm
-            JOIN Player p ON sm.PlayerID = p.PlayerID
-            WHERE sm.ScorecardID = ?
-            ORDER BY sm.MemberPosition
-        """, [scorecard_id])
-        
-        # Get scores
-        scores = execute_query("""
-            SELECT * FROM Score
-            WHERE ScorecardID = ?
-            ORDER BY HoleNumber, PlayerID
-        """, [scorecard_id])
+        members = batch['members']
+        scores = batch['scores']
         
         result = scorecard[0]
         result['members'] = members
@@ -839,8 +1613,9 @@ def create_scorecard():
             data['eventId'],
             data['createdByPlayerId']
         ])
+        tables_changed('Scorecard', events=[data['eventId']])
         # execute_proc returns an array, but we need the first (and only) result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 201
         return jsonify(result), 201
     except Exception as e:
@@ -869,8 +1644,9 @@ def add_scorecard_members(scorecard_id):
             data.get('player3Id'),
             data.get('player4Id')
         ])
+        tables_changed('ScorecardMember')
         # execute_proc returns an array, but we need the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 201
         return jsonify(result), 201
     except Exception as e:
@@ -888,7 +1664,7 @@ def remove_scorecard_member(scorecard_id, player_id):
         
         # Verify the scorecard exists and get creator info
         scorecard = execute_query(
-            "SELECT CreatedByPlayerID FROM Scorecard WHERE ScorecardID = ?",
+            "SELECT CreatedByPlayerID, EventID FROM Scorecard WHERE ScorecardID = ?",
             [scorecard_id]
         )
         
@@ -907,9 +1683,14 @@ def remove_scorecard_member(scorecard_id, player_id):
             player_id,
             scorecard_id
         ])
+        # The proc deletes the player's scores on the card as well
+        refresh_round_totals(scorecard_id=scorecard_id, player_ids=[player_id])
+        tables_changed('ScorecardMember', 'Score', events=[scorecard[0]['EventID']])
+        leaderboard_delta(lambda: leaderboard_engine.remove_round(player_id, scorecard_id))
+        publish_live_removal(scorecard[0]['EventID'], scorecard_id, player_id)
         
         # execute_proc returns an array, but we need the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 200
         return jsonify({"success": True}), 200
     except Exception as e:
@@ -928,14 +1709,148 @@ def insert_hole_scores(scorecard_id):
             data.get('player3Id'), data.get('player3Score'),  # Optional
             data.get('player4Id'), data.get('player4Score')   # Optional
         ])
+        inserted = [
+            (data[f'player{n}Id'], data[f'player{n}Score'])
+            for n in range(1, 5)
+            if data.get(f'player{n}Id') is not None
+        ]
+        refresh_round_totals(scorecard_id=scorecard_id, player_ids=[pid for pid, _ in inserted])
+        leaderboard_delta(lambda: leaderboard_engine.add_scores(scorecard_id, inserted))
+        events = publish_live_scores([
+            {'scorecardId': scorecard_id, 'holeNumber': data['holeNumber'], 'playerId': pid, 'strokes': strokes}
+            for pid, strokes in inserted
+        ])
+        tables_changed('Score', events=events)
         # execute_proc returns an array, but we need the first result object
-        if isinstance(result, list) and len(result) > 0:
+        if isinstance(result, Rows) and len(result) > 0:
             return jsonify(result[0]), 201
         return jsonify(result), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+BULK_INSERT_SCORE_SQL = """
+    INSERT INTO Score (ScoreID, ScorecardID, PlayerID, HoleNumber, Strokes, RecordedAt)
+    VALUES (NEXT VALUE FOR ScoreID_Seq, ?, ?, ?, ?, GETDATE())
+"""
+
+def validate_bulk_scores(scores, hole_count, existing_holes, known_players):
+    """Per-row errors for a bulk score payload, using InsertHoleScores' rules
+
+    Each hole needs 2-4 players with strokes between 0 and 3, the hole must
+    exist on the event and must not already have scores, and each player may
+    appear once per hole.
+    """
+    errors = []
+    seen = set()
+    players_per_hole = {}
+
+    def fail(index, row, message):
+        errors.append({
+            "index": index,
+            "holeNumber": row.get('holeNumber') if isinstance(row, dict) else None,
+            "playerId": row.get('playerId') if isinstance(row, dict) else None,
+            "error": message,
+        })
+
+    for index, row in enumerate(scores):
+        if not isinstance(row, dict):
+            fail(index, row, "Each score must be an object with holeNumber, playerId and strokes")
+            continue
+        hole, player, strokes = row.get('holeNumber'), row.get('playerId'), row.get('strokes')
+        if not all(isinstance(v, int) and not isinstance(v, bool) for v in (hole, player, strokes)):
+            fail(index, row, "holeNumber, playerId and strokes must be integers")
+            continue
+        if not 0 <= strokes <= 3:
+            fail(index, row, "Score must be between 0 and 3")
+        elif not 1 <= hole <= hole_count:
+            fail(index, row, "Invalid hole number for this event")
+        elif hole in existing_holes:
+            fail(index, row, "Scores already exist for this hole. Use UPDATE instead.")
+        elif player not in known_players:
+            fail(index, row, "Player ID is invalid")
+        elif (hole, player) in seen:
+            fail(index, row, "Duplicate score for this player on this hole")
+        else:
+            seen.add((hole, player))
+            players_per_hole.setdefault(hole, []).append(index)
+
+    for hole, indexes in sorted(players_per_hole.items()):
+        if not 2 <= len(indexes) <= 4:
+            for index in indexes:
+                fail(index, scores[index], f"Hole {hole} needs between 2 and 4 players (got {len(indexes)})")
+    return errors
+
+@app.route('/api/scorecards/<int:scorecard_id>/scores/bulk', methods=['POST'])
+def insert_scores_bulk(scorecard_id):
+    """Insert a whole card's scores (every hole and player) in one request
+
+    Body params:
+        scores: list of {holeNumber, playerId, strokes}
+
+    The card is validated once and every row is inserted in one transaction;
+    if any row is invalid nothing is inserted and every bad row is reported
+    in "errors" with its index.
+    """
+    try:
+        data = request.json or {}
+        scores = data.get('scores')
+        if not isinstance(scores, list) or not scores:
+            return jsonify({"error": "scores must be a non-empty list"}), 400
+
+        player_ids = sorted({
+            row['playerId'] for row in scores
+            if isinstance(row, dict) and isinstance(row.get('playerId'), int)
+        })
+        queries = [
+            # UPDLOCK serializes concurrent bulk submissions for the same card
+            ('card', """
+                SELECT sc.ScorecardID, e.HoleCount
+                FROM Scorecard sc WITH (UPDLOCK, HOLDLOCK)
+                JOIN Event e ON sc.EventID = e.EventID
+                WHERE sc.ScorecardID = ?
+            """, [scorecard_id]),
+            ('holes', "SELECT DISTINCT HoleNumber FROM Score WHERE ScorecardID = ?", [scorecard_id]),
+        ]
+        if player_ids:
+            marks = ", ".join("?" * len(player_ids))
+            queries.append(('players', f"SELECT PlayerID FROM Player WHERE PlayerID IN ({marks})", player_ids))
+        batch = execute_batch(queries)
+
+        if not batch['card']:
+            return jsonify({"error": "Invalid ScorecardID"}), 404
+        errors = validate_bulk_scores(
+            scores,
+            batch['card'][0]['HoleCount'],
+            {row['HoleNumber'] for row in batch['holes']},
+            {row['PlayerID'] for row in batch.get('players', [])},
+        )
+        if errors:
+            return jsonify({"error": f"{len(errors)} invalid score(s); nothing was inserted", "errors": errors}), 400
+
+        execute_many(BULK_INSERT_SCORE_SQL, [
+            (scorecard_id, row['playerId'], row['holeNumber'], row['strokes']) for row in scores
+        ])
+        refresh_round_totals(scorecard_id=scorecard_id, player_ids=player_ids)
+        inserted = [(row['playerId'], row['strokes']) for row in scores]
+        leaderboard_delta(lambda: leaderboard_engine.add_scores(scorecard_id, inserted))
+        events = publish_live_scores([
+            {'scorecardId': scorecard_id, 'holeNumber': row['holeNumber'],
+             'playerId': row['playerId'], 'strokes': row['strokes']}
+            for row in scores
+        ])
+        tables_changed('Score', events=events)
+
+        return jsonify({
+            "success": True,
+            "scorecardId": scorecard_id,
+            "inserted": len(scores),
+            "holes": sorted({row['holeNumber'] for row in scores}),
+        }), 201
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/scorecards/<int:scorecard_id>/scores/<int:hole_number>', methods=['GET'])
+@reads('Score', 'Player')
 def get_hole_scores(scorecard_id, hole_number):
     """Get scores for a specific hole"""
     try:
@@ -958,9 +1873,10 @@ def update_score(score_id):
         player_id = data.get('playerId')
         
         # Verify the requesting player is the scorecard creator
+        # (UPDLOCK holds the row until commit so the old value stays accurate)
         result = execute_query("""
-            SELECT sc.CreatedByPlayerID 
-            FROM Score s
+            SELECT sc.CreatedByPlayerID, s.PlayerID, s.ScorecardID, s.HoleNumber, s.Strokes
+            FROM Score s WITH (UPDLOCK, ROWLOCK)
             JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
             WHERE s.ScoreID = ?
         """, [score_id])
@@ -971,13 +1887,107 @@ def update_score(score_id):
             return jsonify({"error": "Only the scorecard creator can update scores"}), 403
         
         execute_insert(
-            "UPDATE Score SET Strokes = ? WHERE ScoreID = ?",
+            "UPDATE Score SET Strokes = ?, RecordedAt = GETDATE() WHERE ScoreID = ?",
             [data['strokes'], score_id]
         )
+        old = result[0]
+        refresh_round_totals(scorecard_id=old['ScorecardID'], player_ids=[old['PlayerID']])
+        leaderboard_delta(lambda: leaderboard_engine.update_score(
+            old['PlayerID'], old['ScorecardID'], old['Strokes'], data['strokes']
+        ))
+        events = publish_live_scores([{
+            'scorecardId': old['ScorecardID'], 'holeNumber': old['HoleNumber'], 'playerId': old['PlayerID'],
+            'scoreId': score_id, 'strokes': data['strokes'], 'previousStrokes': old['Strokes'],
+        }])
+        tables_changed('Score', events=events)
         return jsonify({"success": True})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# SQL Server accepts at most 2100 parameters per statement
+SCORE_BATCH_ROWS = 1000
+
+@app.route('/api/scores', methods=['PUT'])
+def update_scores():
+    """Update several scores at once (only the scorecard creator can update)
+
+    Body params:
+        playerId: the requesting player
+        scores: list of {scoreId, strokes}
+
+    Authorization is checked for every score with one query and all updates
+    are applied in one transaction; if any score is missing or not editable
+    by the requester, nothing is changed.
+    """
+    try:
+        data = request.json or {}
+        player_id = data.get('playerId')
+        updates = data.get('scores')
+        if not isinstance(updates, list) or not updates:
+            return jsonify({"error": "scores must be a non-empty list"}), 400
+        for row in updates:
+            if not (isinstance(row, dict)
+                    and isinstance(row.get('scoreId'), int)
+                    and isinstance(row.get('strokes'), int)):
+                return jsonify({"error": "Each score needs an integer scoreId and strokes"}), 400
+            if not 0 <= row['strokes'] <= 3:
+                return jsonify({"error": f"Score {row['scoreId']} must be between 0 and 3"}), 400
+        new_strokes = {row['scoreId']: row['strokes'] for row in updates}
+        if len(new_strokes) != len(updates):
+            return jsonify({"error": "Each scoreId may appear only once"}), 400
+        score_ids = list(new_strokes)
+
+        # Verify the requesting player created every affected scorecard
+        # (UPDLOCK holds the rows until commit so the old values stay accurate)
+        current = []
+        for start in range(0, len(score_ids), SCORE_BATCH_ROWS):
+            chunk = score_ids[start:start + SCORE_BATCH_ROWS]
+            current.extend(execute_query(f"""
+                SELECT s.ScoreID, s.PlayerID, s.ScorecardID, s.HoleNumber, s.Strokes, sc.CreatedByPlayerID
+                FROM Score s WITH (UPDLOCK, ROWLOCK)
+                JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+                WHERE s.ScoreID IN ({", ".join("?" * len(chunk))})
+            """, chunk))
+
+        found = {row['ScoreID'] for row in current}
+        missing = [score_id for score_id in score_ids if score_id not in found]
+        if missing:
+            return jsonify({"error": "Score not found", "scoreIds": missing}), 404
+        if any(row['CreatedByPlayerID'] != player_id for row in current):
+            return jsonify({"error": "Only the scorecard creator can update scores"}), 403
+
+        for start in range(0, len(score_ids), SCORE_BATCH_ROWS):
+            chunk = score_ids[start:start + SCORE_BATCH_ROWS]
+            values = ", ".join("(?, ?)" for _ in chunk)
+            execute_insert(f"""
+                UPDATE s SET Strokes = v.Strokes, RecordedAt = GETDATE()
+                FROM Score s
+                JOIN (VALUES {values}) AS v(ScoreID, Strokes) ON s.ScoreID = v.ScoreID
+            """, [p for score_id in chunk for p in (score_id, new_strokes[score_id])])
+
+        players_by_card = {}
+        for row in current:
+            players_by_card.setdefault(row['ScorecardID'], set()).add(row['PlayerID'])
+        for scorecard_id, players in players_by_card.items():
+            refresh_round_totals(scorecard_id=scorecard_id, player_ids=sorted(players))
+        changes = [
+            (row['PlayerID'], row['ScorecardID'], row['Strokes'], new_strokes[row['ScoreID']])
+            for row in current
+        ]
+        def apply_to_leaderboard():
+            for change in changes:
+                leaderboard_engine.update_score(*change)
+        leaderboard_delta(apply_to_leaderboard)
+        events = publish_live_scores([{
+            'scorecardId': row['ScorecardID'], 'holeNumber': row['HoleNumber'], 'playerId': row['PlayerID'],
+            'scoreId': row['ScoreID'], 'strokes': new_strokes[row['ScoreID']], 'previousStrokes': row['Strokes'],
+        } for row in current])
+        tables_changed('Score', events=events)
+
+        return jsonify({"success": True, "updated": len(score_ids)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/scorecards/<int:scorecard_id>', methods=['DELETE'])
 def delete_scorecard(scorecard_id):
     """Delete a scorecard (only scorecard creator can delete)"""
@@ -987,7 +1997,7 @@ def delete_scorecard(scorecard_id):
         
         # Verify the requesting player is the scorecard creator
         result = execute_query(
-            "SELECT CreatedByPlayerID FROM Scorecard WHERE ScorecardID = ?",
+            "SELECT CreatedByPlayerID, EventID FROM Scorecard WHERE ScorecardID = ?",
             [scorecard_id]
         )
         
@@ -1004,6 +2014,10 @@ def delete_scorecard(scorecard_id):
         
         # Delete the scorecard
         execute_insert("DELETE FROM Scorecard WHERE ScorecardID = ?", [scorecard_id])
+        refresh_round_totals(scorecard_id=scorecard_id)
+        tables_changed('Score', 'ScorecardMember', 'Scorecard', events=[result[0]['EventID']])
+        leaderboard_delta(lambda: leaderboard_engine.remove_scorecard(scorecard_id))
+        publish_live_removal(result[0]['EventID'], scorecard_id)
         
         return jsonify({"success": True})
     except Exception as e:
@@ -1013,37 +2027,174 @@ def delete_scorecard(scorecard_id):
 # PLAYER SCORECARDS
 # ============================================
 
+PLAYER_SCORECARDS = Keyset("""
+    SELECT DISTINCT s.*, e.Name as EventName, e.EventDate, e.HoleCount,
+           (SELECT SUM(sc.Strokes) FROM Score sc 
+            WHERE sc.ScorecardID = s.ScorecardID AND sc.PlayerID = ?) as TotalScore
+    FROM Scorecard s
+    JOIN Event e ON s.EventID = e.EventID
+    JOIN ScorecardMember sm ON s.ScorecardID = sm.ScorecardID
+    WHERE sm.PlayerID = ?
+""", (('CreatedAt', 'datetime'), 'ScorecardID'), descending=True)
+
+def fetch_player_scorecards(player_id):
+    """Rows for /api/players/<id>/scorecards"""
+    return execute_query(PLAYER_SCORECARDS.all_sql(), [player_id, player_id])
+
 @app.route('/api/players/<int:player_id>/scorecards', methods=['GET'])
+@reads('Scorecard', 'Event', 'ScorecardMember', 'Score')
 def get_player_scorecards(player_id):
-    """Get all scorecards for a player"""
+    """Get all scorecards for a player, newest first (paged with ?limit=&after=)"""
     try:
-        results = execute_query("""
-            SELECT DISTINCT s.*, e.Name as EventName, e.EventDate, e.HoleCount,
-                   (SELECT SUM(sc.Strokes) FROM Score sc 
-                    WHERE sc.ScorecardID = s.ScorecardID AND sc.PlayerID = ?) as TotalScore
-            FROM Scorecard s
-            JOIN Event e ON s.EventID = e.EventID
-            JOIN ScorecardMember sm ON s.ScorecardID = sm.ScorecardID
-            WHERE sm.PlayerID = ?
-            ORDER BY s.CreatedAt DESC
-        """, [player_id, player_id])
-        return jsonify(results)
+        return list_response(PLAYER_SCORECARDS, [player_id, player_id])
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# ============================================
+# BOOTSTRAP
+# ============================================
+
+# Bounded pool for fanning out the bootstrap sections. Each worker borrows
+# its own pooled connection, so keep this below DB_POOL_MAX_SIZE.
+BOOTSTRAP_WORKERS = int(os.environ.get('BOOTSTRAP_WORKERS', 6))
+bootstrap_executor = ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS, thread_name_prefix='bootstrap')
+
+# Section name -> (fetch function, view used for the missing-view warning)
+BOOTSTRAP_SECTIONS = {
+    'player': (lambda p: fetch_player(p['playerId']), None),
+    'events': (lambda p: fetch_events(), None),
+    'players': (lambda p: fetch_players(), None),
+    'leaderboard': (lambda p: fetch_leaderboard(None, p['eventLimit']), 'vw_PlayerLeaderboard'),
+    'history': (lambda p: fetch_player_history(p['playerId']), 'vw_PlayerScoreHistory'),
+    'scorecards': (lambda p: fetch_player_scorecards(p['playerId']), None),
+    'hotRounds': (lambda p: fetch_hot_rounds(p['eventLimit']), 'vw_HotRoundPerEvent'),
+    'podium': (lambda p: fetch_podium_stats(p['eventLimit']), 'vw_PodiumPercentage'),
+    'topCards': (lambda p: fetch_top_cards(p['eventLimit']), 'vw_TopCardPerEvent'),
+    'holeDifficulty': (lambda p: fetch_hole_difficulty(p['eventLimit']), 'vw_HoleDifficultyRanking'),
+    'basketStats': (lambda p: fetch_basket_stats(p['eventLimit']), 'vw_HardestBaskets'),
+}
+
+def _run_bootstrap_section(name, params, read_pool, observer):
+    fetch, view_name = BOOTSTRAP_SECTIONS[name]
+    # Worker threads do not inherit the request's context
+    route_reads(read_pool)
+    observe_queries(observer)
+    try:
+        data = fetch(params)
+        if data is None:
+            return {"data": None, "error": "Player not found"}
+        return {"data": data, "error": None}
+    except Exception as e:
+        if view_name and is_missing_view_error(e):
+            print(f"[DEV] View '{view_name}' not found in database.")
+            return {
+                "data": [],
+                "error": f"View '{view_name}' does not exist in the database. Create it from Scoreboard Views.md"
+            }
+        return {"data": None if name == 'player' else [], "error": str(e)}
+    finally:
+        route_reads(None)
+        observe_queries(None)
+
+@app.route('/api/bootstrap', methods=['GET'])
+@reads(*ALL_TABLES)
+def get_bootstrap():
+    """Everything the dashboard needs for first paint in one response
+
+    Runs the player, events, players, leaderboard, history, scorecards and
+    stats queries concurrently on a bounded thread pool. Each section is
+    returned as {data, error} so one failing query does not fail the rest.
+    
+    Query params:
+        playerId: Player whose profile, history and scorecards to include
+        eventLimit: 'latest' (default), 'all', or number (e.g. '5' for last 5 events)
+    """
+    player_id = request.args.get('playerId', type=int)
+    if player_id is None:
+        return jsonify({"error": "playerId is required"}), 400
+    params = {
+        'playerId': player_id,
+        'eventLimit': request.args.get('eventLimit', 'latest'),
+    }
+    futures = {
+        name: bootstrap_executor.submit(
+            _run_bootstrap_section, name, params, routed_read_pool(), query_observer()
+        )
+        for name in BOOTSTRAP_SECTIONS
+    }
+    return jsonify({name: future.result() for name, future in futures.items()})
+
 # ============================================
 # HEALTH CHECK
 # ============================================
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint
+
+    Borrows a pooled connection (pinged only if it has sat idle) rather than
+    opening a new one, and reports pool state.
+    """
     try:
-        execute_query("SELECT 1")
-        return jsonify({"status": "healthy", "database": "connected"})
+        with pool.connection():
+            pass
+        return jsonify({
+            "status": "healthy",
+            "database": "connected",
+            "pool": pool.stats(),
+            "cache": stats_cache.stats(),
+            "replica": read_replica.stats() if read_replica is not None else None,
+            "live": live_hub.stats(),
+        })
     except Exception as e:
-        return jsonify({"status": "unhealthy", "error": str(e)}), 500
+        return jsonify({"status": "unhealthy", "error": str(e), "pool": pool.stats()}), 500
+
+# ============================================
+# METRICS
+# ============================================
+
+metrics.registry.gauge(
+    'db_pool_connections', 'Open primary pool connections by state',
+    lambda: {('idle',): pool.stats()['idle'], ('in_use',): pool.stats()['inUse']}, ('state',),
+)
+metrics.registry.gauge(
+    'db_pool_waits_total', 'Borrows that had to wait for a free connection',
+    lambda: {(): pool.stats()['waits']}, type_name='counter',
+)
+metrics.registry.gauge(
+    'db_pool_exhausted_total', 'Borrows that gave up waiting for a connection',
+    lambda: {(): pool.stats()['exhausted']}, type_name='counter',
+)
+metrics.registry.gauge(
+    'stats_cache_lookups_total', 'Stats cache lookups by result',
+    lambda: {('hit',): stats_cache.stats()['hits'], ('miss',): stats_cache.stats()['misses']},
+    ('result',), type_name='counter',
+)
+metrics.registry.gauge(
+    'live_subscribers', 'Open /api/events/<id>/live streams',
+    lambda: {(): live_hub.stats()['subscribers']},
+)
+metrics.registry.gauge(
+    'read_replica_sync_age_seconds', 'Seconds since the read replica last synced',
+    lambda: {(): read_replica.stats()['lastSyncAgeSeconds'] if read_replica is not None else None},
+)
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Query, request, pool and cache metrics in the Prometheus text format
+
+    Per query (db_query_*, labelled with a stable name from
+    metrics.query_name): wall time, connection-acquire time, rows and
+    errors. Per route (http_*): latency, status codes and response sizes.
+    """
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
 
 if __name__ == '__main__':
+    try:
+        pool.warm()
+    except Exception as e:
+        print(f"[DEV] Could not pre-open database connections: {e}")
     app.run(debug=True, port=5000)
 
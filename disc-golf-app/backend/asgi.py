@@ -0,0 +1,244 @@
+"""
+ASGI entry point for the Flask app
+
+    uvicorn asgi:application --port 5000
+
+The event loop owns every client connection; requests run the same Flask
+routes on a fixed pool of ASGI_WORKERS threads (by default as many as the
+database pool has connections). Each worker runs a request to completion,
+so its blocking pyodbc calls never hold up the loop, and idle or queued
+clients cost no thread at all. Concurrency is bounded by database
+capacity instead of by how many OS threads the server can start.
+
+A request that cannot get a worker within ASGI_QUEUE_TIMEOUT seconds
+(e.g. while every worker waits on a slow Azure SQL connect) is answered
+with 503 and Retry-After instead of piling up behind the others. A
+streamed response keeps its worker until the last chunk is sent or the
+client disconnects, except /api/events/<id>/live: its route subscribes
+through Flask as usual and the stream is then served from the event loop
+(see live.py), so open scoreboards hold no worker.
+
+Independent queries inside one request are not spread over workers: the
+card details route sends its result sets as one execute_batch round trip
+on the request's connection, and /api/bootstrap fans its sections out on
+its own bounded executor.
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app
+from db import POOL_CONFIG, pool
+from live import ENVIRON_KEY as LIVE_STREAM_KEY
+
+# ASGI serving configuration (override with environment variables)
+ASGI_CONFIG = {
+    # Threads running requests; more than DB_POOL_MAX_SIZE only adds waiters
+    'workers': int(os.environ.get('ASGI_WORKERS', POOL_CONFIG['max_size'])),
+    # Seconds a request waits for a free worker before getting a 503
+    'queue_timeout': float(os.environ.get('ASGI_QUEUE_TIMEOUT', POOL_CONFIG['borrow_timeout'])),
+}
+
+class WsgiAdapter:
+    """ASGI 3 application running a WSGI app on a bounded thread pool"""
+
+    def __init__(self, wsgi_app, workers=8, queue_timeout=15):
+        self.wsgi_app = wsgi_app
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asgi')
+        # Created on first use, inside the server's event loop
+        self._slots = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await loop.run_in_executor(self.executor, pool.warm)
+                except Exception as e:
+                    print(f"[DEV] Could not pre-open database connections: {e}")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await loop.run_in_executor(None, self.executor.shutdown)
+                pool.close_all()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        body = await self._read_body(receive)
+        if body is None:
+            return  # client went away before sending its body
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            await self._send_busy(send)
+            return
+        try:
+            live_stream = await self._run(scope, body, receive, send)
+        finally:
+            self._slots.release()
+        if live_stream is not None:
+            await self._stream_live(live_stream, receive, send)
+
+    async def _read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    async def _run(self, scope, body, receive, send):
+        """Run the request on a worker and send its response
+
+        Returns the live stream to continue on the event loop, if the route
+        handed one over.
+        """
+        loop = asyncio.get_running_loop()
+        response = {}
+        env = environ(scope, body)
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info is not None and response.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+            ]
+
+        def begin():
+            chunks = self.wsgi_app(env, start_response)
+            iterator = iter(chunks)
+            return chunks, iterator, next_chunk(iterator)
+
+        chunks, iterator, chunk = await loop.run_in_executor(self.executor, begin)
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        try:
+            response['sent'] = True
+            await send({
+                'type': 'http.response.start',
+                'status': response['status'],
+                'headers': response['headers'],
+            })
+            live_stream = env.get(LIVE_STREAM_KEY)
+            if live_stream is not None and response['status'] == 200:
+                if chunk is not None:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                live_stream.detach()
+                return live_stream
+            while chunk is not None and not disconnected.done():
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await loop.run_in_executor(self.executor, next_chunk, iterator)
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            return None
+        finally:
+            disconnected.cancel()
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                # Runs the response's on-close hooks (metrics, stream cleanup)
+                await loop.run_in_executor(self.executor, close)
+
+    async def _stream_live(self, stream, receive, send):
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        chunks = stream.__aiter__()
+        try:
+            while True:
+                pending = asyncio.ensure_future(chunks.__anext__())
+                await asyncio.wait({pending, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not pending.done():
+                    pending.cancel()
+                    try:
+                        await pending
+                    except asyncio.CancelledError:
+                        pass
+                    return
+                try:
+                    chunk = pending.result()
+                except StopAsyncIteration:
+                    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                    return
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+        finally:
+            disconnected.cancel()
+            await chunks.aclose()
+
+    async def _wait_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    async def _send_busy(self, send):
+        body = b'{"error": "Server busy, try again shortly"}\n'
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', b'1'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+def next_chunk(iterator):
+    """The next non-empty body chunk, or None once the body is done"""
+    for chunk in iterator:
+        if chunk:
+            return chunk
+    return None
+
+def environ(scope, body):
+    """WSGI environ (PEP 3333) for an ASGI HTTP scope"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    env = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        # The whole body is buffered, so chunked uploads can be read to the end
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            key = name
+        else:
+            key = f"HTTP_{name}"
+        env[key] = f"{env[key]},{value}" if key in env else value
+    return env
+
+application = WsgiAdapter(app, **ASGI_CONFIG)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(application, port=5000)
@@ -0,0 +1 @@
+"""Endpoint benchmarks against a local SQLite stand-in (see benchmarks.run)"""
@@ -0,0 +1,425 @@
+"""
+Endpoint benchmarks for the Flask API
+
+Builds a SQLite stand-in of the PuttingLeague database (benchmarks.standin)
+at one or more data sizes, points the connection pool at it and times every
+GET and POST route through the Flask test client: latency percentiles,
+throughput, response bytes and status codes per route. Results are written
+as JSON and checked against thresholds (absolute p95, error rate, and
+regression against a baseline report).
+
+Run from backend/:
+    python -m benchmarks.run --sizes small,medium --output report.json
+    python -m benchmarks.run --baseline last-report.json --thresholds benchmarks/thresholds.json
+
+Exits with status 1 when a threshold is violated or a GET/POST route has
+no scenario.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks import standin
+
+DEFAULT_THRESHOLDS = Path(__file__).resolve().parent / 'thresholds.json'
+
+# Data sizes: season.generate_season arguments
+SIZES = {
+    'small': {'players': 200, 'events': 20, 'players_per_event': 40},
+    'medium': {'players': 2000, 'events': 100, 'players_per_event': 120},
+    'large': {'players': 10000, 'events': 500, 'players_per_event': 300},
+}
+
+# ============================================
+# SCENARIOS
+# ============================================
+# path and body are formatted with the fixture ids (see load_fixture), the
+# iteration number {i}, a per-run {token}, and whatever setup returned.
+# setup runs untimed before each iteration, for POSTs that need a fresh
+# scorecard or event to write to. Reads run before writes so every size's
+# GETs see the data as generated. stream=True times an endless response
+# (Server-Sent Events) up to its first chunk, then closes it.
+
+class Scenario:
+    def __init__(self, method, path, body=None, setup=None, status=200, iterations=None, name=None,
+                 stream=False):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.setup = setup
+        self.status = status
+        self.iterations = iterations
+        self.name = name or f"{method} {path}"
+        self.stream = stream
+
+def _new_scorecard(client, values):
+    response = client.post('/api/scorecards', json={
+        'eventId': values['eventId'], 'createdByPlayerId': values['playerId'],
+    })
+    return {'newScorecardId': response.get_json()['NewScorecardID']}
+
+def _new_card_with_members(client, values):
+    card = _new_scorecard(client, values)
+    client.post(f"/api/scorecards/{card['newScorecardId']}/members", json={
+        f'player{n}Id': player_id for n, player_id in enumerate(values['memberIds'], start=1)
+    })
+    return card
+
+def _new_event(client, values):
+    response = client.post('/api/events', json={
+        'name': f"Benchmark {values['token']} {values['i']}", 'layoutId': values['eventId'],
+    })
+    return {'newEventId': response.get_json()['NewEventID']}
+
+def _hole_scores_body(values):
+    body = {'holeNumber': 1}
+    for n, player_id in enumerate(values['memberIds'], start=1):
+        body[f'player{n}Id'] = player_id
+        body[f'player{n}Score'] = (n + values['i']) % 4
+    return body
+
+def _bulk_scores_body(values):
+    return {'scores': [
+        {'holeNumber': hole, 'playerId': player_id, 'strokes': (hole + n) % 4}
+        for hole in range(1, values['holeCount'] + 1)
+        for n, player_id in enumerate(values['memberIds'])
+    ]}
+
+SCENARIOS = [
+    Scenario('GET', '/api/health'),
+    Scenario('GET', '/api/metrics'),
+    Scenario('GET', '/api/bootstrap?playerId={playerId}'),
+    Scenario('GET', '/api/bootstrap?playerId={playerId}&eventLimit=all'),
+    Scenario('GET', '/api/players'),
+    Scenario('GET', '/api/players?limit=100'),
+    Scenario('GET', '/api/players?format=columnar'),
+    Scenario('GET', '/api/players/{playerId}'),
+    Scenario('GET', '/api/players/{playerId}/history'),
+    Scenario('GET', '/api/players/{playerId}/scorecards'),
+    Scenario('GET', '/api/leaderboard'),
+    Scenario('GET', '/api/leaderboard?eventLimit=all'),
+    Scenario('GET', '/api/leaderboard?eventLimit=all&division=Advanced'),
+    Scenario('GET', '/api/leaderboard/consistency'),
+    Scenario('GET', '/api/stats/hot-rounds'),
+    Scenario('GET', '/api/stats/hot-rounds?eventLimit=all'),
+    Scenario('GET', '/api/stats/podium?eventLimit=all'),
+    Scenario('GET', '/api/stats/top-cards?eventLimit=all'),
+    Scenario('GET', '/api/stats/hole-difficulty?eventLimit=all'),
+    Scenario('GET', '/api/stats/basket-stats?eventLimit=all'),
+    Scenario('GET', '/api/stats/head-to-head?players={playerId},{comparePlayerId}'),
+    Scenario('GET', '/api/stats/head-to-head?eventLimit=5'),
+    Scenario('GET', '/api/stats/consistency'),
+    Scenario('GET', '/api/stats/card-details/{scorecardId}?playerId={comparePlayerId}'),
+    Scenario('GET', '/api/layouts'),
+    Scenario('GET', '/api/events'),
+    Scenario('GET', '/api/events?limit=50'),
+    Scenario('GET', '/api/events/{eventId}'),
+    Scenario('GET', '/api/events/{eventId}/holes'),
+    Scenario('GET', '/api/events/{eventId}/layout'),
+    Scenario('GET', '/api/events/{eventId}/live', stream=True),
+    Scenario('GET', '/api/events/summary'),
+    Scenario('GET', '/api/scorecards'),
+    Scenario('GET', '/api/scorecards?limit=100'),
+    Scenario('GET', '/api/scorecards/{scorecardId}'),
+    Scenario('GET', '/api/scorecards/{scorecardId}/scores/1'),
+
+    Scenario('POST', '/api/players', status=201, body=lambda v: {
+        'firstName': 'Bench', 'lastName': f"Player{v['i']}",
+        'email': f"bench-{v['token']}-{v['i']}@benchmark.example", 'skillDivision': 'Intermediate',
+    }),
+    Scenario('POST', '/api/events', status=201, body=lambda v: {
+        'name': f"Benchmark {v['token']} {v['i']}", 'layoutId': v['eventId'],
+    }),
+    Scenario('POST', '/api/scorecards', status=201, body=lambda v: {
+        'eventId': v['eventId'], 'createdByPlayerId': v['playerId'],
+    }),
+    Scenario('POST', '/api/scorecards/{newScorecardId}/members', status=201, setup=_new_scorecard,
+             body=lambda v: {f'player{n}Id': p for n, p in enumerate(v['memberIds'], start=1)}),
+    Scenario('POST', '/api/scorecards/{newScorecardId}/scores', status=201, setup=_new_card_with_members,
+             body=_hole_scores_body),
+    Scenario('POST', '/api/scorecards/{newScorecardId}/scores/bulk', status=201, setup=_new_card_with_members,
+             body=_bulk_scores_body),
+    # Cards every unassigned player and scores the whole event: a handful of
+    # runs is plenty
+    Scenario('POST', '/api/events/{newEventId}/generate-mock-data', setup=_new_event, iterations=3),
+]
+
+# ============================================
+# RUNNING
+# ============================================
+
+def load_fixture(path):
+    """Ids the scenarios address: the latest event and one of its scorecards"""
+    conn = sqlite3.connect(path)
+    try:
+        event_id, hole_count = conn.execute("""
+            SELECT e.EventID, e.HoleCount FROM Event e
+            WHERE EXISTS (SELECT 1 FROM Scorecard sc WHERE sc.EventID = e.EventID)
+            ORDER BY e.EventDate DESC, e.EventID DESC LIMIT 1
+        """).fetchone()
+        scorecard_id, creator_id = conn.execute("""
+            SELECT sc.ScorecardID, sc.CreatedByPlayerID FROM Scorecard sc
+            WHERE sc.EventID = ? ORDER BY sc.ScorecardID LIMIT 1
+        """, (event_id,)).fetchone()
+        member_ids = [row[0] for row in conn.execute("""
+            SELECT PlayerID FROM ScorecardMember WHERE ScorecardID = ? ORDER BY MemberPosition
+        """, (scorecard_id,))]
+    finally:
+        conn.close()
+    return {
+        'eventId': event_id,
+        'holeCount': hole_count,
+        'scorecardId': scorecard_id,
+        'playerId': creator_id,
+        'comparePlayerId': member_ids[-1],
+        'memberIds': member_ids,
+    }
+
+def percentile(sorted_values, fraction):
+    """Linearly interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(scenario, endpoint, timings, sizes, statuses):
+    ordered = sorted(timings)
+    total = sum(ordered)
+    errors = sum(1 for status in statuses if status != scenario.status)
+    codes = {}
+    for status in statuses:
+        codes[str(status)] = codes.get(str(status), 0) + 1
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        'method': scenario.method,
+        'endpoint': endpoint,
+        'count': len(ordered),
+        'errors': errors,
+        'errorRate': round(errors / len(ordered), 4) if ordered else None,
+        'statusCodes': codes,
+        'p50Ms': ms(percentile(ordered, 0.50)),
+        'p90Ms': ms(percentile(ordered, 0.90)),
+        'p95Ms': ms(percentile(ordered, 0.95)),
+        'p99Ms': ms(percentile(ordered, 0.99)),
+        'meanMs': ms(total / len(ordered)) if ordered else None,
+        'minMs': ms(ordered[0]) if ordered else None,
+        'maxMs': ms(ordered[-1]) if ordered else None,
+        'throughputRps': round(len(ordered) / total, 2) if total else None,
+        'bytesMean': round(sum(sizes) / len(sizes)) if sizes else None,
+        'bytesMax': max(sizes) if sizes else None,
+    }
+
+def run_scenario(app, client, scenario, fixture, iterations, warmup, warm_cache, token):
+    from cache import stats_cache
+
+    adapter = app.url_map.bind('localhost')
+    endpoint = None
+    timings, sizes, statuses = [], [], []
+    for i in range(-warmup, scenario.iterations or iterations):
+        values = dict(fixture, i=i, token=token)
+        if scenario.setup is not None:
+            values.update(scenario.setup(client, values))
+        path = scenario.path.format(**values)
+        body = scenario.body(values) if scenario.body is not None else None
+        if endpoint is None:
+            endpoint = adapter.match(path.split('?')[0], method=scenario.method)[0]
+        if not warm_cache:
+            stats_cache.clear()
+
+        started = time.perf_counter()
+        response = client.open(path, method=scenario.method, json=body, buffered=not scenario.stream)
+        data = next(iter(response.response), b'') if scenario.stream else response.get_data()
+        elapsed = time.perf_counter() - started
+        # Runs the close hooks (request metrics) as a WSGI server would
+        response.close()
+
+        if scenario.status != response.status_code and i == 0:
+            print(f"[DEV] {scenario.name}: {response.status_code} {data[:200]!r}")
+        if i >= 0:
+            timings.append(elapsed)
+            sizes.append(len(data))
+            statuses.append(response.status_code)
+    return summarize(scenario, endpoint, timings, sizes, statuses)
+
+def run_size(size, workdir, args, token):
+    import db
+    from app import app
+    from cache import stats_cache
+    from leaderboard import leaderboard_engine
+
+    path = Path(workdir) / f"puttingleague-{size}.db"
+    if path.exists():
+        path.unlink()
+    print(f"[DEV] Building {size} stand-in at {path}")
+    started = time.perf_counter()
+    database, counts = standin.build_database(path, seed=args.seed, **SIZES[size])
+    build_seconds = time.perf_counter() - started
+    fixture = load_fixture(str(path))
+
+    db.pool.close_all()
+    db.pool._connect = database.connect
+    stats_cache.clear()
+    leaderboard_engine.reset()
+
+    client = app.test_client()
+    results = {}
+    for scenario in SCENARIOS:
+        if args.scenario and args.scenario not in scenario.name:
+            continue
+        results[scenario.name] = run_scenario(
+            app, client, scenario, fixture, args.iterations, args.warmup, args.warm_cache, token,
+        )
+        print(f"[DEV]   {scenario.name:<70} p95 {results[scenario.name]['p95Ms']:>9} ms")
+    db.pool.close_all()
+    return {
+        'rows': counts,
+        'buildSeconds': round(build_seconds, 2),
+        'fixture': fixture,
+        'scenarios': results,
+    }
+
+def uncovered_routes():
+    """GET/POST API routes no scenario exercises, as 'METHOD endpoint'"""
+    from app import app
+
+    adapter = app.url_map.bind('localhost')
+    fixture = {
+        'eventId': 1, 'holeCount': 9, 'scorecardId': 1, 'playerId': 1, 'comparePlayerId': 1,
+        'memberIds': [1], 'newScorecardId': 1, 'newEventId': 1, 'i': 0, 'token': '',
+    }
+    covered = {
+        (scenario.method, adapter.match(scenario.path.format(**fixture).split('?')[0],
+                                        method=scenario.method)[0])
+        for scenario in SCENARIOS
+    }
+    routes = {
+        (method, rule.endpoint)
+        for rule in app.url_map.iter_rules() if rule.rule.startswith('/api/')
+        for method in rule.methods & {'GET', 'POST'}
+    }
+    return sorted(f"{method} {endpoint}" for method, endpoint in routes - covered)
+
+# ============================================
+# THRESHOLDS
+# ============================================
+# thresholds.json:
+#   {"default": {...}, "sizes": {"large": {...}}, "scenarios": {"GET /api/players": {...}}}
+# Later sections override earlier ones key by key. Keys:
+#   p95Ms           absolute p95 ceiling
+#   maxErrorRate    fraction of responses with an unexpected status
+#   maxRegression   allowed p95 growth over the baseline report (0.25 = +25%)
+#   minRegressionMs p95 growth below this many ms is never a regression (noise floor)
+
+def thresholds_for(thresholds, size, name):
+    limits = dict(thresholds.get('default', {}))
+    limits.update(thresholds.get('sizes', {}).get(size, {}))
+    limits.update(thresholds.get('scenarios', {}).get(name, {}))
+    return limits
+
+def check(report, thresholds, baseline=None):
+    violations = [
+        {'route': route, 'reason': 'no benchmark scenario'} for route in report['uncoveredRoutes']
+    ]
+    for size, size_report in report['sizes'].items():
+        for name, result in size_report['scenarios'].items():
+            limits = thresholds_for(thresholds, size, name)
+
+            def violation(reason, **values):
+                violations.append(dict({'size': size, 'scenario': name, 'reason': reason}, **values))
+
+            p95 = result['p95Ms']
+            if 'p95Ms' in limits and p95 is not None and p95 > limits['p95Ms']:
+                violation('p95 over threshold', p95Ms=p95, limitMs=limits['p95Ms'])
+            if 'maxErrorRate' in limits and result['errorRate'] is not None \
+                    and result['errorRate'] > limits['maxErrorRate']:
+                violation('error rate over threshold', errorRate=result['errorRate'],
+                          statusCodes=result['statusCodes'], limit=limits['maxErrorRate'])
+
+            previous = (baseline or {}).get('sizes', {}).get(size, {}).get('scenarios', {}).get(name)
+            if previous is None or 'maxRegression' not in limits or not previous.get('p95Ms') or p95 is None:
+                continue
+            growth = p95 - previous['p95Ms']
+            if growth > limits.get('minRegressionMs', 0) and growth / previous['p95Ms'] > limits['maxRegression']:
+                violation('p95 regressed against baseline', p95Ms=p95, baselineP95Ms=previous['p95Ms'],
+                          regression=round(growth / previous['p95Ms'], 3), limit=limits['maxRegression'])
+    return violations
+
+# ============================================
+# CLI
+# ============================================
+
+def _load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='small,medium',
+                        help=f"comma-separated data sizes ({', '.join(SIZES)})")
+    parser.add_argument('--iterations', type=int, default=30, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=2, help='untimed requests per scenario first')
+    parser.add_argument('--warm-cache', action='store_true',
+                        help='keep the stats cache between requests (default: clear it so every request queries)')
+    parser.add_argument('--scenario', help='only run scenarios whose name contains this text')
+    parser.add_argument('--seed', type=int, default=2024, help='data generator seed')
+    parser.add_argument('--workdir', help='where to build the databases (default: a temporary directory)')
+    parser.add_argument('--output', help='write the JSON report here (default: stdout)')
+    parser.add_argument('--thresholds', default=str(DEFAULT_THRESHOLDS) if DEFAULT_THRESHOLDS.exists() else None,
+                        help='thresholds JSON (default: benchmarks/thresholds.json)')
+    parser.add_argument('--baseline', help='earlier report to check p95 regressions against')
+    args = parser.parse_args(argv)
+    args.sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in args.sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    token = uuid.uuid4().hex[:8]
+    report = {
+        'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'engine': f"sqlite {sqlite3.sqlite_version}",
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'warmCache': args.warm_cache,
+        'seed': args.seed,
+        'sizes': {},
+        'uncoveredRoutes': uncovered_routes(),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            report['sizes'][size] = run_size(size, args.workdir or tmp, args, token)
+
+    thresholds = _load_json(args.thresholds) if args.thresholds else {}
+    baseline = _load_json(args.baseline) if args.baseline else None
+    report['thresholds'] = thresholds
+    report['baseline'] = args.baseline
+    report['violations'] = check(report, thresholds, baseline)
+
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"[DEV] Report written to {args.output}")
+    else:
+        print(text)
+    for violation in report['violations']:
+        print(f"[DEV] THRESHOLD: {violation}", file=sys.stderr)
+    return 1 if report['violations'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
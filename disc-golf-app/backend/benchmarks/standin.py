@@ -0,0 +1,281 @@
+"""
+Local PuttingLeague stand-in for the benchmarks
+
+build_database() creates a SQLite file with the PuttingLeague tables, a
+generated season of data (season.py), course layouts, and every view from
+'Scoreboard Views.md' and the migrations, translated by sqlite_compat. The
+stored procedures the POST routes call are reimplemented here in Python
+with the same validation rules and result sets.
+"""
+import random
+import sqlite3
+from datetime import datetime
+
+import season
+from sqlite_compat import ProcedureError, SQLiteDatabase, create_views
+
+LAYOUT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS EventLayout (
+    LayoutID INTEGER NOT NULL,
+    HoleNumber INTEGER NOT NULL,
+    DistanceFeet INTEGER NOT NULL,
+    PRIMARY KEY (LayoutID, HoleNumber)
+);
+CREATE TABLE IF NOT EXISTS Basket (
+    BasketID INTEGER PRIMARY KEY,
+    Brand TEXT NOT NULL,
+    Model TEXT NOT NULL,
+    ChainCount INTEGER NOT NULL,
+    HasUpperBand INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS LayoutBasket (
+    LayoutID INTEGER NOT NULL,
+    HoleNumber INTEGER NOT NULL,
+    BasketID INTEGER NOT NULL REFERENCES Basket (BasketID),
+    PRIMARY KEY (LayoutID, HoleNumber)
+);
+CREATE TABLE IF NOT EXISTS Obstacle (
+    ObstacleID INTEGER PRIMARY KEY,
+    Elevation INTEGER NOT NULL,
+    IsMandatory INTEGER NOT NULL,
+    BodyPosition TEXT,
+    Obstruction INTEGER NOT NULL,
+    Description TEXT
+);
+CREATE TABLE IF NOT EXISTS LayoutObstacle (
+    LayoutID INTEGER NOT NULL,
+    HoleNumber INTEGER NOT NULL,
+    ObstacleID INTEGER NOT NULL REFERENCES Obstacle (ObstacleID),
+    PRIMARY KEY (LayoutID, HoleNumber)
+);
+"""
+
+BASKETS = [
+    (1, 'Innova', 'DISCatcher Pro', 28, 1),
+    (2, 'Dynamic Discs', 'Recruit', 24, 0),
+    (3, 'MVP', 'Black Hole Pro', 24, 1),
+    (4, 'Axiom', 'Pitch Black', 24, 0),
+    (5, 'Prodigy', 'T2', 26, 1),
+]
+
+OBSTACLES = [
+    (1, 0, 1, 'Standing', 0, 'Straddle putt required'),
+    (2, 2, 0, 'Standing', 1, 'Tree trunk in the putting line'),
+    (3, -1, 0, 'Kneeling', 0, 'Kneeling putt from a dip'),
+    (4, 3, 1, 'Standing', 1, 'Elevated basket behind a hedge'),
+    (5, 0, 1, 'One foot', 0, 'One-foot putt'),
+]
+
+def seed_layouts(conn, holes, seed=None):
+    """One layout per event (the views join EventLayout.LayoutID to EventID)"""
+    rng = random.Random(seed)
+    event_ids = [row[0] for row in conn.execute("SELECT EventID FROM Event ORDER BY EventID")]
+    layouts, baskets, obstacles = [], [], []
+    for event_id in event_ids:
+        for hole in range(1, holes + 1):
+            layouts.append((event_id, hole, rng.randint(15, 40)))
+            baskets.append((event_id, hole, rng.choice(BASKETS)[0]))
+            if rng.random() < 0.3:
+                obstacles.append((event_id, hole, rng.choice(OBSTACLES)[0]))
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO Basket VALUES (?, ?, ?, ?, ?)", BASKETS)
+        conn.executemany("INSERT OR IGNORE INTO Obstacle VALUES (?, ?, ?, ?, ?, ?)", OBSTACLES)
+        conn.executemany("INSERT OR REPLACE INTO EventLayout VALUES (?, ?, ?)", layouts)
+        conn.executemany("INSERT OR REPLACE INTO LayoutBasket VALUES (?, ?, ?)", baskets)
+        conn.executemany("INSERT OR REPLACE INTO LayoutObstacle VALUES (?, ?, ?)", obstacles)
+
+def build_database(path, players, events, players_per_event, holes=9, seed=None):
+    """Create and fill a stand-in database file; returns (SQLiteDatabase, row counts)"""
+    data = season.generate_season(
+        players=players, events=events, players_per_event=players_per_event,
+        holes=holes, seed=seed,
+    )
+    counts = season.load_sqlite(data, str(path))
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(LAYOUT_SCHEMA)
+        seed_layouts(conn, holes, seed)
+        create_views(conn)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    return SQLiteDatabase(str(path), PROCEDURES), counts
+
+# ============================================
+# STORED PROCEDURES
+# ============================================
+# Each takes the sqlite_compat.Connection followed by the EXEC arguments and
+# returns (columns, rows) for its result set.
+
+def _exists(conn, sql, *params):
+    return conn.raw.execute(sql, params).fetchone() is not None
+
+def _now():
+    return datetime.now().replace(microsecond=0)
+
+def create_player(conn, first_name, last_name, email, skill_division):
+    if skill_division not in season.DIVISIONS:
+        raise ProcedureError('Skill division must be Beginner, Intermediate, or Advanced')
+    if _exists(conn, "SELECT 1 FROM Player WHERE Email = ?", email):
+        raise ProcedureError('Email already exists')
+    player_id = conn.database.next_value('PlayerID_Seq')
+    conn.raw.execute(
+        "INSERT INTO Player (PlayerID, FirstName, LastName, Email, SkillDivision, DateInserted) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (player_id, first_name, last_name, email, skill_division, _now()),
+    )
+    return (('NewPlayerID', 'FirstName', 'LastName', 'Email', 'SkillDivision'),
+            [(player_id, first_name, last_name, email, skill_division)])
+
+def create_event(conn, name, layout_id=1, hole_count=9):
+    layout_id = 1 if layout_id is None else layout_id
+    hole_count = 9 if hole_count is None else hole_count
+    if name is None or not name.strip():
+        raise ProcedureError('Event name is required')
+    if not 0 < hole_count <= 9:
+        raise ProcedureError('Hole count must be greater than 0 and less than 10')
+    if not _exists(conn, "SELECT 1 FROM EventLayout WHERE LayoutID = ?", layout_id):
+        raise ProcedureError('Invalid LayoutID - layout does not exist')
+    event_id = conn.database.next_value('Event_Seq')
+    now = _now()
+    conn.raw.execute(
+        "INSERT INTO Event (EventID, EventDate, HoleCount, Name) VALUES (?, ?, ?, ?)",
+        (event_id, now, hole_count, name),
+    )
+    return (('NewEventID', 'EventName', 'EventDate', 'HoleCount', 'LayoutID'),
+            [(event_id, name, now, hole_count, layout_id)])
+
+def create_scorecard(conn, event_id, created_by_player_id):
+    if not _exists(conn, "SELECT 1 FROM Event WHERE EventID = ?", event_id):
+        raise ProcedureError('Invalid EventID')
+    if not _exists(conn, "SELECT 1 FROM Player WHERE PlayerID = ?", created_by_player_id):
+        raise ProcedureError('Invalid PlayerID')
+    scorecard_id = conn.database.next_value('Scorecard_Seq')
+    now = _now()
+    conn.raw.execute(
+        "INSERT INTO Scorecard (ScorecardID, EventID, CreatedByPlayerID, CreatedAt) VALUES (?, ?, ?, ?)",
+        (scorecard_id, event_id, created_by_player_id, now),
+    )
+    return (('NewScorecardID', 'EventID', 'CreatedByPlayerID', 'CreatedAt'),
+            [(scorecard_id, event_id, created_by_player_id, now)])
+
+def add_scorecard_members(conn, scorecard_id, event_id, *player_ids):
+    if not _exists(conn, "SELECT 1 FROM Scorecard WHERE ScorecardID = ?", scorecard_id):
+        raise ProcedureError('Invalid ScorecardID')
+    if not _exists(conn, "SELECT 1 FROM Event WHERE EventID = ?", event_id):
+        raise ProcedureError('Invalid EventID')
+    if all(player_id is None for player_id in player_ids):
+        raise ProcedureError('At least one PlayerID must be provided')
+    added = 0
+    for position, player_id in enumerate(player_ids, start=1):
+        if player_id is None:
+            continue
+        if not _exists(conn, "SELECT 1 FROM Player WHERE PlayerID = ?", player_id):
+            raise ProcedureError(f'Invalid Player{position}ID')
+        conn.raw.execute(
+            "INSERT INTO ScorecardMember (ScorecardID, PlayerID, MemberPosition) VALUES (?, ?, ?)",
+            (scorecard_id, player_id, position),
+        )
+        added += 1
+    return (('MembersAdded', 'ScorecardID', 'EventID'), [(added, scorecard_id, event_id)])
+
+def insert_hole_scores(conn, scorecard_id, hole_number, *players):
+    card = conn.raw.execute(
+        "SELECT e.HoleCount FROM Scorecard sc JOIN Event e ON sc.EventID = e.EventID "
+        "WHERE sc.ScorecardID = ?", (scorecard_id,),
+    ).fetchone()
+    if card is None:
+        raise ProcedureError('Invalid ScorecardID')
+    if not 1 <= hole_number <= card[0]:
+        raise ProcedureError('Invalid hole number for this event')
+    if _exists(conn, "SELECT 1 FROM Score WHERE ScorecardID = ? AND HoleNumber = ?", scorecard_id, hole_number):
+        raise ProcedureError('Scores already exist for this hole. Use UPDATE instead.')
+    pairs = list(zip(players[0::2], players[1::2]))
+    rows = []
+    for n, (player_id, strokes) in enumerate(pairs, start=1):
+        if n > 2 and player_id is None and strokes is None:
+            continue
+        if player_id is None or strokes is None:
+            raise ProcedureError(f'Player {n} ID and Score are required' if n <= 2 else
+                                 f'Player {n} ID and Score must both be provided or both be NULL')
+        if not 0 <= strokes <= 3:
+            raise ProcedureError(f'Player {n} score must be between 0 and 3')
+        if not _exists(conn, "SELECT 1 FROM Player WHERE PlayerID = ?", player_id):
+            raise ProcedureError(f'Player {n} ID is invalid')
+        rows.append((conn.database.next_value('ScoreID_Seq'), scorecard_id, player_id, hole_number, strokes, _now()))
+    conn.raw.executemany(
+        "INSERT INTO Score (ScoreID, ScorecardID, PlayerID, HoleNumber, Strokes, RecordedAt) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows,
+    )
+    return (('Result', 'PlayersInserted'),
+            [(f'Successfully inserted scores for {len(rows)} players on hole {hole_number}', len(rows))])
+
+def generate_scorecards(conn, event_id):
+    """Put every player not yet on a card for the event onto cards of up to 4"""
+    if not _exists(conn, "SELECT 1 FROM Event WHERE EventID = ?", event_id):
+        raise ProcedureError('Invalid EventID')
+    player_ids = [row[0] for row in conn.raw.execute("""
+        SELECT PlayerID FROM Player
+        WHERE PlayerID NOT IN (
+            SELECT sm.PlayerID FROM ScorecardMember sm
+            JOIN Scorecard sc ON sm.ScorecardID = sc.ScorecardID
+            WHERE sc.EventID = ?
+        )
+    """, (event_id,))]
+    random.shuffle(player_ids)
+    card_count = -(-len(player_ids) // season.MAX_CARD_SIZE) if len(player_ids) >= 2 else 0
+    now = _now()
+    cards, members = [], []
+    for card in range(card_count):
+        scorecard_id = conn.database.next_value('Scorecard_Seq')
+        card_players = player_ids[card::card_count]
+        cards.append((scorecard_id, event_id, card_players[0], now))
+        members.extend((scorecard_id, player_id, position)
+                       for position, player_id in enumerate(card_players, start=1))
+    conn.raw.executemany("INSERT INTO Scorecard VALUES (?, ?, ?, ?)", cards)
+    conn.raw.executemany("INSERT INTO ScorecardMember VALUES (?, ?, ?)", members)
+    return (('Result',), [(f'Generated {len(cards)} scorecards for event {event_id}',)])
+
+# Stroke ranges GenerateScoresForHole draws from (upper bound exclusive)
+GENERATED_STROKES = {'Beginner': (0, 2), 'Intermediate': (0, 3), 'Advanced': (1, 4)}
+
+def generate_scores_for_event(conn, event_id):
+    """Score every unscored hole on the event's cards, by skill division"""
+    event = conn.raw.execute("SELECT HoleCount FROM Event WHERE EventID = ?", (event_id,)).fetchone()
+    if event is None:
+        raise ProcedureError('Invalid EventID')
+    members = conn.raw.execute("""
+        SELECT sm.ScorecardID, sm.PlayerID, p.SkillDivision
+        FROM ScorecardMember sm
+        JOIN Scorecard sc ON sm.ScorecardID = sc.ScorecardID
+        JOIN Player p ON sm.PlayerID = p.PlayerID
+        WHERE sc.EventID = ?
+        ORDER BY sm.ScorecardID, sm.MemberPosition
+    """, (event_id,)).fetchall()
+    scored = set(conn.raw.execute("""
+        SELECT DISTINCT s.ScorecardID, s.HoleNumber FROM Score s
+        JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+        WHERE sc.EventID = ?
+    """, (event_id,)).fetchall())
+    now = _now()
+    rows = []
+    for scorecard_id, player_id, division in members:
+        low, high = GENERATED_STROKES.get(division, GENERATED_STROKES['Advanced'])
+        for hole in range(1, event[0] + 1):
+            if (scorecard_id, hole) not in scored:
+                rows.append((conn.database.next_value('ScoreID_Seq'), scorecard_id, player_id,
+                             hole, random.randrange(low, high), now))
+    conn.raw.executemany("INSERT INTO Score VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return (('Result',), [(f'Generated {len(rows)} scores for event {event_id}',)])
+
+PROCEDURES = {
+    'CreatePlayer': create_player,
+    'CreateEvent': create_event,
+    'CreateScorecard': create_scorecard,
+    'AddScorecardMembers': add_scorecard_members,
+    'InsertHoleScores': insert_hole_scores,
+    'GenerateScorecards': generate_scorecards,
+    'GenerateScoresForEvent': generate_scores_for_event,
+}
@@ -0,0 +1,153 @@
+"""
+In-process result cache for the stats and leaderboard endpoints, and the
+per-table data versions used for ETags
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+
+# Cache configuration (override with environment variables)
+CACHE_CONFIG = {
+    'max_entries': int(os.environ.get('STATS_CACHE_MAX_ENTRIES', 256)),
+    'ttl': float(os.environ.get('STATS_CACHE_TTL', 300)),
+}
+
+class ResultCache:
+    """Thread-safe LRU cache with a TTL and per-table invalidation
+
+    Every entry records the tables its query read from. invalidate('Score')
+    drops exactly the entries that depend on Score. A result computed while
+    an invalidation happened is not stored, so a slow query that started
+    before a write commits can never repopulate the cache with stale rows.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, tables, expires_at)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        # Counters reported by stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return False, None
+
+    def generation(self):
+        """Counter that changes on every invalidation; pass it back to put()"""
+        with self._lock:
+            return self._generation
+
+    def put(self, key, value, tables, generation):
+        """Store a value unless an invalidation happened since `generation`"""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = (value, frozenset(tables), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, *tables):
+        """Drop every entry that read from any of the given tables"""
+        changed = set(tables)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (_, deps, _) in self._entries.items() if deps & changed]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def cached(self, endpoint, tables):
+        """Decorator caching a fetch function's result by endpoint and arguments"""
+        def decorator(fetch):
+            @wraps(fetch)
+            def wrapper(*args):
+                key = (endpoint,) + args
+                hit, value = self.get(key)
+                if hit:
+                    return value
+                generation = self.generation()
+                value = fetch(*args)
+                self.put(key, value, tables, generation)
+                return value
+            wrapper.uncached = fetch
+            return wrapper
+        return decorator
+
+    def stats(self):
+        """Snapshot of cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRate": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+stats_cache = ResultCache(**CACHE_CONFIG)
+
+class DataVersions:
+    """Monotonically increasing version counter per table
+
+    Write routes bump the tables they change; read routes derive their ETag
+    from the versions of the tables they read. The epoch changes on every
+    process start so ETags issued before a restart never match afterwards.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, tables):
+        """Current version of each table, in the order given"""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def etag(self, tables, *parts):
+        """ETag for a response that read `tables`, varied by `parts` (path, query)"""
+        versions = self.snapshot(tables)
+        digest = hashlib.sha1(repr((tables, versions, parts)).encode()).hexdigest()[:16]
+        return f"{self.epoch}-{digest}"
+
+data_versions = DataVersions()
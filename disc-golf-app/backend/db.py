@@ -3,6 +3,17 @@ Database connection module for Azure SQL Server
 """
 import pyodbc
 import os
+import re
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+import metrics
+from metrics import query_name
+from rows import Rows
 
 # Database configuration
 DB_CONFIG = {
@@ -13,6 +24,31 @@ DB_CONFIG = {
     'password': 'D1sk&Chain'
 }
 
+# Connection pool configuration (override with environment variables)
+POOL_CONFIG = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+    # Seconds a caller waits for a free connection before giving up
+    'borrow_timeout': float(os.environ.get('DB_POOL_BORROW_TIMEOUT', 15)),
+    # Connections older than this are closed and replaced on borrow
+    'max_age': float(os.environ.get('DB_POOL_MAX_AGE', 1800)),
+    # Connections idle longer than this are pinged before being handed out
+    'ping_after_idle': float(os.environ.get('DB_POOL_PING_AFTER_IDLE', 5)),
+}
+
+# Rows per fetchmany() call for streamed queries (see stream_query)
+STREAM_BATCH_SIZE = int(os.environ.get('DB_STREAM_BATCH_SIZE', 500))
+
+# Coalescing of identical concurrent reads (see _single_flight)
+SINGLE_FLIGHT_CONFIG = {
+    'enabled': os.environ.get('DB_SINGLE_FLIGHT', '1').lower() not in ('0', 'false', 'no'),
+    # Seconds a caller waits on an identical query already running before giving up
+    'timeout': float(os.environ.get('DB_SINGLE_FLIGHT_TIMEOUT', 30)),
+}
+
+# SQLSTATEs that mean the connection itself is gone (not just the statement)
+DISCONNECT_SQLSTATES = ('08S01', '08001', '08003', '08004', '08007', 'HYT00', 'HYT01')
+
 def get_connection():
     """Create and return a database connection"""
     conn_str = (
@@ -27,60 +63,857 @@ def get_connection():
     )
     return pyodbc.connect(conn_str)
 
-def execute_query(query, params=None):
-    """Execute a SELECT query and return results as list of dicts"""
-    conn = get_connection()
-    cursor = conn.cursor()
+def is_disconnect_error(error):
+    """Return True if a pyodbc error means the connection is no longer usable"""
+    if not isinstance(error, pyodbc.Error):
+        return False
+    sqlstate = error.args[0] if error.args else ''
+    return sqlstate in DISCONNECT_SQLSTATES
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection becomes free within the borrow timeout"""
+
+class _PooledConnection:
+    """A raw pyodbc connection plus the bookkeeping the pool needs"""
+    __slots__ = ('conn', 'created_at', 'returned_at')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.returned_at = self.created_at
+
+class ConnectionPool:
+    """Thread-safe pool of reusable pyodbc connections
+
+    Connections are created lazily up to max_size. On borrow a connection is
+    replaced if it is older than max_age and pinged with SELECT 1 if it has
+    been idle longer than ping_after_idle. Callers that find the pool empty
+    wait up to borrow_timeout for a connection to be returned.
+    """
+
+    def __init__(self, connect=get_connection, min_size=2, max_size=10,
+                 borrow_timeout=15, max_age=1800, ping_after_idle=5):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.borrow_timeout = borrow_timeout
+        self.max_age = max_age
+        self.ping_after_idle = ping_after_idle
+
+        self._idle = deque()
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        # Counters reported by stats()
+        self._borrows = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._exhausted = 0
+        self._created = 0
+        self._recycled = 0
+        self._broken = 0
+
+    @property
+    def size(self):
+        """Number of open connections (idle + in use)"""
+        return len(self._idle) + self._in_use
+
+    def _open(self):
+        conn = _PooledConnection(self._connect())
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def _close(self, pooled):
+        try:
+            pooled.conn.close()
+        except pyodbc.Error:
+            pass
+
+    def _is_alive(self, pooled):
+        try:
+            cursor = pooled.conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except pyodbc.Error:
+            return False
+
+    def warm(self):
+        """Open connections until min_size are idle in the pool"""
+        while True:
+            with self._lock:
+                if self.size >= self.min_size:
+                    return
+                self._in_use += 1  # reserve the slot while connecting
+            try:
+                pooled = self._open()
+            except Exception:
+                with self._available:
+                    self._in_use -= 1
+                    self._available.notify()
+                raise
+            with self._available:
+                self._in_use -= 1
+                self._idle.append(pooled)
+                self._available.notify()
+
+    def acquire(self):
+        """Borrow a connection, waiting up to borrow_timeout for one to free up"""
+        started = time.monotonic()
+        waited = False
+        with self._available:
+            while not self._idle and self.size >= self.max_size:
+                remaining = self.borrow_timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._exhausted += 1
+                    raise PoolExhaustedError(
+                        f"No database connection available after {self.borrow_timeout}s "
+                        f"(pool max_size={self.max_size})"
+                    )
+                waited = True
+                self._available.wait(remaining)
+
+            pooled = self._idle.pop() if self._idle else None
+            self._in_use += 1
+
+            wait_time = time.monotonic() - started
+            self._borrows += 1
+            if waited:
+                self._waits += 1
+                self._wait_time_total += wait_time
+                self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        # Connecting and pinging happen outside the lock
+        try:
+            if pooled is not None:
+                now = time.monotonic()
+                if now - pooled.created_at > self.max_age:
+                    self._close(pooled)
+                    pooled = None
+                    with self._lock:
+                        self._recycled += 1
+                elif now - pooled.returned_at > self.ping_after_idle and not self._is_alive(pooled):
+                    self._close(pooled)
+                    pooled = None
+                    with self._lock:
+                        self._broken += 1
+            if pooled is None:
+                pooled = self._open()
+        except Exception:
+            with self._available:
+                self._in_use -= 1
+                self._available.notify()
+            raise
+        return pooled
+
+    def release(self, pooled, broken=False, reset=True):
+        """Return a borrowed connection; broken connections are closed and dropped
+
+        reset=False skips the rollback for callers that know the connection
+        has no open transaction (it has just been committed or rolled back).
+        """
+        if not broken and reset:
+            try:
+                # Never hand the next borrower an open transaction
+                pooled.conn.rollback()
+            except pyodbc.Error:
+                broken = True
+
+        if broken:
+            self._close(pooled)
+
+        with self._available:
+            self._in_use -= 1
+            if broken:
+                self._broken += 1
+            else:
+                pooled.returned_at = time.monotonic()
+                self._idle.append(pooled)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection and always returns it"""
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.conn
+        except Exception as e:
+            broken = is_disconnect_error(e)
+            raise
+        finally:
+            self.release(pooled, broken=broken)
+
+    def close_all(self):
+        """Close every idle connection (in-use connections close on release)"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        """Snapshot of pool state and counters"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "inUse": self._in_use,
+                "minSize": self.min_size,
+                "maxSize": self.max_size,
+                "borrows": self._borrows,
+                "waits": self._waits,
+                "waitTimeTotalMs": round(self._wait_time_total * 1000, 2),
+                "waitTimeMaxMs": round(self._wait_time_max * 1000, 2),
+                "exhausted": self._exhausted,
+                "created": self._created,
+                "recycled": self._recycled,
+                "broken": self._broken,
+            }
+
+pool = ConnectionPool(get_connection, **POOL_CONFIG)
+
+# ============================================
+# UNIT OF WORK
+# ============================================
+
+class UnitOfWork:
+    """One pooled connection and one transaction shared by every db helper
+
+    The connection is borrowed lazily on the first statement, so requests
+    that never touch the database never borrow one. Writes made through
+    execute_proc/execute_insert mark the unit dirty; nothing is committed
+    until commit() is called once at the end. A read_only unit (a GET
+    request's) promises not to write, so its reads may be shared with other
+    requests (see _single_flight).
+    """
+
+    def __init__(self, pool, read_only=False):
+        self._pool = pool
+        self.read_only = read_only
+        self._pooled = None
+        self._clean = True
+        self._after_commit = []
+        self._after_rollback = []
+        self.dirty = False
+        self.lost = False
+
+    @property
+    def connection(self):
+        """The unit's connection, borrowed from the pool on first use"""
+        if self._pooled is None:
+            self._pooled = self._pool.acquire()
+        self._clean = False
+        return self._pooled.conn
+
+    @property
+    def active(self):
+        """True once a connection has been borrowed"""
+        return self._pooled is not None
+
+    def discard_connection(self):
+        """Drop a dead connection; pending writes on it are lost"""
+        if self._pooled is not None:
+            self._pool.release(self._pooled, broken=True)
+            self._pooled = None
+            if self.dirty:
+                self.lost = True
+
+    def on_commit(self, callback, rolled_back=None):
+        """Run callback once this unit's writes have been committed
+
+        rolled_back, if given, runs instead when the unit is rolled back or
+        closed without committing.
+        """
+        self._after_commit.append(callback)
+        if rolled_back is not None:
+            self._after_rollback.append(rolled_back)
+
+    def _run_rolled_back(self):
+        self._after_commit.clear()
+        callbacks, self._after_rollback = self._after_rollback, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[DB] after-rollback callback failed: {e}")
+
+    def commit(self):
+        """Commit pending writes (no-op for read-only units), then run on_commit callbacks"""
+        if self.lost:
+            self._run_rolled_back()
+            raise pyodbc.OperationalError(
+                '08S01', 'Database connection was lost before the transaction could be committed'
+            )
+        if self._pooled is not None and self.dirty:
+            self._pooled.conn.commit()
+            _writes_committed()
+            self.dirty = False
+            self._clean = True
+        self._after_rollback.clear()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[DB] after-commit callback failed: {e}")
+
+    def rollback(self):
+        """Discard pending writes (and their on_commit callbacks)"""
+        self._run_rolled_back()
+        if self._pooled is not None and not self._clean:
+            try:
+                self._pooled.conn.rollback()
+                self._clean = True
+            except pyodbc.Error as e:
+                if is_disconnect_error(e):
+                    self.discard_connection()
+                else:
+                    raise
+        self.dirty = False
+
+    def close(self):
+        """Roll back anything uncommitted and return the connection to the pool"""
+        self._run_rolled_back()
+        if self._pooled is not None:
+            # release() rolls back unless we already ended the transaction
+            self._pool.release(self._pooled, reset=not self._clean)
+            self._pooled = None
+        self.dirty = False
+
+_current_unit = contextvars.ContextVar('db_unit_of_work', default=None)
+
+def begin_unit_of_work(read_only=False):
+    """Start a unit of work that the db helpers in this context will share"""
+    unit = UnitOfWork(pool, read_only)
+    _current_unit.set(unit)
+    return unit
+
+def end_unit_of_work():
+    """Close the current unit of work (rolling back anything uncommitted)"""
+    unit = _current_unit.get()
+    _current_unit.set(None)
+    if unit is not None:
+        unit.close()
+
+def current_unit_of_work():
+    """Return the unit of work for this context, or None"""
+    return _current_unit.get()
+
+def after_commit(callback, rolled_back=None):
+    """Run callback after the current unit of work commits
+
+    Outside a unit of work every helper commits immediately, so the
+    callback runs right away. rolled_back, if given, runs instead when the
+    unit of work ends without committing.
+    """
+    unit = _current_unit.get()
+    if unit is None:
+        callback()
+    else:
+        unit.on_commit(callback, rolled_back)
+
+@contextmanager
+def _connection(write=False, timer=None):
+    """Yield (connection, owns_transaction) for one helper call
+
+    Inside a unit of work the unit's connection is reused and the caller
+    must not commit; otherwise a connection is borrowed for this call only.
+    """
+    started = time.perf_counter()
+    unit = _current_unit.get()
+    if unit is None:
+        with pool.connection() as conn:
+            if timer is not None:
+                timer.acquired(started)
+            yield conn, True
+        return
+
+    if write:
+        unit.dirty = True
     try:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        
-        columns = [column[0] for column in cursor.description]
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
+        conn = unit.connection
+        if timer is not None:
+            timer.acquired(started)
+        yield conn, False
+    except Exception as e:
+        if is_disconnect_error(e):
+            unit.discard_connection()
+        raise
+
+# ============================================
+# READ ROUTING
+# ============================================
+# A request can send its reads to another pool, e.g. a local read replica's
+# (see replica.py). Once the request's unit of work has written anything its
+# reads go back to the primary, so they see its own uncommitted writes.
+
+_read_pool = contextvars.ContextVar('db_read_pool', default=None)
+
+def route_reads(read_pool):
+    """Send reads in this context to read_pool (None: the primary)"""
+    _read_pool.set(read_pool)
+
+def routed_read_pool():
+    """The pool reads in this context currently go to, or None for the primary"""
+    return _read_pool.get()
+
+def _replica_pool():
+    read_pool = _read_pool.get()
+    unit = _current_unit.get()
+    if read_pool is None or (unit is not None and unit.dirty):
+        return None
+    return read_pool
+
+# ============================================
+# QUERY METRICS
+# ============================================
+# Every helper call is timed and recorded in metrics.py. A context can also
+# observe its own calls one by one, e.g. to profile a request (profiling.py).
+
+_query_observer = contextvars.ContextVar('db_query_observer', default=None)
+
+def observe_queries(observer):
+    """Call observer(entry) with each helper call finished in this context
+
+    entry is a dict of the query's name, kind, source, SQL, start time and
+    its total, acquire, execute and fetch seconds, rows and error flag.
+    None stops observing.
+    """
+    _query_observer.set(observer)
+
+def query_observer():
+    """The observer set in this context by observe_queries, or None"""
+    return _query_observer.get()
+
+class _QueryTimer:
+    """Wall time, connection-acquire time and row count of one helper call
+
+    Finished calls are recorded in the metrics module and passed to the
+    context's query observer, if any (see observe_queries).
+    """
+
+    def __init__(self, kind, sql):
+        self.kind = kind
+        self.sql = sql
+        self.name = query_name(sql)
+        self.source = 'primary'
+        self.rows = None
+        self.acquire = 0.0
+        self.started = time.perf_counter()
+        self.acquired_at = self.executed_at = None
+        self.observer = _query_observer.get()
+
+    def acquired(self, started, source='primary'):
+        self.acquired_at = time.perf_counter()
+        self.acquire += self.acquired_at - started
+        self.source = source
+
+    def executed(self):
+        """Mark the statement as executed; the rest of the call is fetching"""
+        self.executed_at = time.perf_counter()
+
+    def finish(self, error=False):
+        finished = time.perf_counter()
+        labels = {'query': self.name, 'kind': self.kind, 'source': self.source}
+        metrics.db_query_seconds.observe(finished - self.started, **labels)
+        metrics.db_acquire_seconds.observe(self.acquire, **labels)
+        if error:
+            metrics.db_query_errors.inc(**labels)
+        elif self.rows is not None:
+            metrics.db_query_rows.observe(self.rows, **labels)
+        if self.observer is not None:
+            executed_at = self.executed_at or finished
+            self.observer({
+                'query': self.name,
+                'kind': self.kind,
+                'source': self.source,
+                'sql': self.sql,
+                'started': self.started,
+                'seconds': finished - self.started,
+                'acquireSeconds': self.acquire,
+                'executeSeconds': executed_at - (self.acquired_at or executed_at),
+                'fetchSeconds': finished - executed_at,
+                'rows': self.rows,
+                'error': error,
+            })
+
+@contextmanager
+def _timed(kind, sql):
+    """Record one helper call in the metrics module (see metrics.py)"""
+    timer = _QueryTimer(kind, sql)
+    try:
+        yield timer
+    except BaseException:
+        timer.finish(error=True)
+        raise
+    timer.finish()
+
+# ============================================
+# SINGLE-FLIGHT READS
+# ============================================
+# Identical reads that overlap in time (same kind, normalized SQL,
+# parameters and read pool) share one execution: the first caller runs the
+# query and the others wait for its rows, or its error. A burst of the same
+# leaderboard request collapses to one query. A read never joins a query
+# that started before this process's latest committed write. Only reads
+# outside a write are shared: those of read-only units (GET requests) or
+# outside any unit. A write request's reads run in its own transaction,
+# and so do locking reads (UPDLOCK, HOLDLOCK, XLOCK), wherever they come
+# from. The shared Rows are read-only, like cached stats results.
+
+class _Flight:
+    """One running query and the callers waiting on it"""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+_flights = {}
+_flights_lock = threading.Lock()
+_write_generation = 0
+
+def _writes_committed():
+    """Start a new generation: later reads must not share earlier queries"""
+    global _write_generation
+    with _flights_lock:
+        _write_generation += 1
+
+_SQL_LITERALS = re.compile(r"('(?:[^']|'')*')")
+_WHITESPACE = re.compile(r"\s+")
+_LOCK_HINTS = re.compile(r"\b(?:UPDLOCK|HOLDLOCK|XLOCK)\b", re.IGNORECASE)
+
+def _shareable(sql):
+    """True if a read may join (or lead) an identical query from another request"""
+    if not SINGLE_FLIGHT_CONFIG['enabled'] or _LOCK_HINTS.search(sql):
+        return False
+    unit = _current_unit.get()
+    return unit is None or (unit.read_only and not unit.dirty)
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """SQL with whitespace collapsed outside string literals"""
+    parts = _SQL_LITERALS.split(sql)
+    return ''.join(part if i % 2 else _WHITESPACE.sub(' ', part) for i, part in enumerate(parts)).strip()
+
+def _single_flight(sql, params, timer, run):
+    """Return run(), sharing one call among identical concurrent reads
+
+    Callers that join a running query wait up to SINGLE_FLIGHT_CONFIG's
+    timeout and then raise a pyodbc timeout error (SQLSTATE HYT00). They are
+    recorded in the metrics with source 'coalesced'.
+    """
+    if not _shareable(sql):
+        return run()
+    try:
+        key = (timer.kind, normalize_sql(sql), tuple(params or ()), _replica_pool())
+        hash(key)
+    except TypeError:
+        return run()
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None or flight.generation != _write_generation
+        if leader:
+            flight = _flights[key] = _Flight(_write_generation)
+
+    if leader:
+        try:
+            flight.result = run()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with _flights_lock:
+                if _flights.get(key) is flight:
+                    del _flights[key]
+            flight.done.set()
+
+    timer.source = 'coalesced'
+    timeout = SINGLE_FLIGHT_CONFIG['timeout']
+    if not flight.done.wait(timeout):
+        raise pyodbc.OperationalError(
+            'HYT00', f"Timed out after {timeout:g}s waiting for an identical query to finish"
+        )
+    if flight.error is not None:
+        raise flight.error
+    return flight.result
+
+# ============================================
+# QUERY HELPERS
+# ============================================
+
+def _fetch_rows(cursor):
+    """All remaining rows of the current result set, as Rows"""
+    return Rows([column[0] for column in cursor.description], cursor.fetchall())
+
+def _run_read(work, timer=None):
+    """Run work(conn) for a read, retrying once if the connection was dead
+
+    No retry happens if the current unit of work has lost uncommitted writes.
+    Reads routed to a replica fall back to the primary if the replica fails.
+    """
+    replica = _replica_pool()
+    if replica is not None:
+        try:
+            started = time.perf_counter()
+            with replica.connection() as conn:
+                if timer is not None:
+                    timer.acquired(started, source='replica')
+                return work(conn)
+        except pyodbc.Error as e:
+            print(f"[DB] Replica read failed, using the primary: {e}")
+    for attempt in range(2):
+        try:
+            with _connection(timer=timer) as (conn, _):
+                return work(conn)
+        except pyodbc.Error as e:
+            unit = _current_unit.get()
+            if attempt == 0 and is_disconnect_error(e) and not (unit and unit.lost):
+                continue
+            raise
+
+def execute_query(query, params=None):
+    """Execute a SELECT query and return its rows (a Rows of dict-like records)
+
+    Reads are retried once on a fresh connection if the pooled one turns out
+    to be dead (unless the current unit of work has uncommitted writes).
+    """
+    with _timed('query', query) as timer:
+        def work(conn):
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                timer.executed()
+                return _fetch_rows(cursor)
+            finally:
+                cursor.close()
+        rows = _single_flight(query, params, timer, lambda: _run_read(work, timer))
+        timer.rows = len(rows)
+        return rows
+
+def execute_query_columnar(query, params=None):
+    """Execute a SELECT query and return {columns, rows} with each row a list
+
+    Skips building a dict per row; used for the columnar wire format.
+    """
+    with _timed('columnar', query) as timer:
+        def work(conn):
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                timer.executed()
+                columns = [column[0] for column in cursor.description]
+                rows = [list(row) for row in cursor.fetchall()]
+                timer.rows = len(rows)
+                return {"columns": columns, "rows": rows}
+            finally:
+                cursor.close()
+        return _run_read(work, timer)
+
+def execute_batch(queries):
+    """Execute several SELECTs in one round trip and return each result set
+
+    queries: list of (name, sql, params) tuples. The statements are sent as
+    a single batch and each result set is read in order with nextset().
+
+    Returns a dict mapping each name to its Rows.
+    """
+    names = [name for name, _, _ in queries]
+    batch = "SET NOCOUNT ON;\n" + ";\n".join(sql.strip().rstrip(';') for _, sql, _ in queries)
+    params = [p for _, _, query_params in queries for p in (query_params or [])]
+
+    with _timed('batch', batch) as timer:
+        def work(conn):
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(batch, params)
+                else:
+                    cursor.execute(batch)
+                timer.executed()
+                results = {}
+                for i, name in enumerate(names):
+                    if i > 0 and not cursor.nextset():
+                        raise pyodbc.ProgrammingError(
+                            'HY010', f"Batch returned {i} result sets, expected {len(names)}"
+                        )
+                    results[name] = _fetch_rows(cursor)
+                return results
+            finally:
+                cursor.close()
+        results = _single_flight(batch, params, timer, lambda: _run_read(work, timer))
+        timer.rows = sum(len(rows) for rows in results.values())
         return results
-    finally:
-        cursor.close()
-        conn.close()
+
+class RowStream:
+    """Rows of a SELECT fetched batch by batch from its own pooled connection
+
+    Iterating yields a Rows per fetchmany batch, or lists of row value lists
+    with raw=True (see columns for the names). The
+    query runs and the first batch is fetched in the constructor, so errors
+    surface before a streaming response has started. The connection goes
+    back to the pool when iteration finishes or close() is called, whichever
+    comes first; callers must make sure close() runs if they stop early.
+    Streams routed to a read replica borrow from the replica's pool.
+    """
+
+    def __init__(self, query, params=None, batch_size=None, raw=False):
+        self.batch_size = batch_size or STREAM_BATCH_SIZE
+        self.raw = raw
+        # Recorded in the metrics when the stream is closed
+        self._timer = _QueryTimer('stream', query)
+        self._timer.rows = 0
+        self._failed = False
+        replica = _replica_pool()
+        self._pool = replica or pool
+        started = time.perf_counter()
+        try:
+            self._pooled = self._pool.acquire()
+        except Exception:
+            self._timer.finish(error=True)
+            raise
+        self._timer.acquired(started, source='replica' if replica is not None else 'primary')
+        self._cursor = None
+        try:
+            self._cursor = self._pooled.conn.cursor()
+            if params:
+                self._cursor.execute(query, params)
+            else:
+                self._cursor.execute(query)
+            self._timer.executed()
+            self.columns = [column[0] for column in self._cursor.description]
+            self._first = self._cursor.fetchmany(self.batch_size)
+        except Exception as e:
+            self._failed = True
+            self.close(broken=is_disconnect_error(e))
+            raise
+
+    def __iter__(self):
+        broken = False
+        try:
+            rows = self._first
+            self._first = None
+            while rows:
+                self._timer.rows += len(rows)
+                if self.raw:
+                    yield [list(row) for row in rows]
+                else:
+                    yield Rows(self.columns, rows)
+                if len(rows) < self.batch_size:
+                    break
+                rows = self._cursor.fetchmany(self.batch_size)
+        except Exception as e:
+            self._failed = True
+            broken = is_disconnect_error(e)
+            raise
+        finally:
+            self.close(broken=broken)
+
+    def close(self, broken=False):
+        """Return the connection to the pool (safe to call more than once)"""
+        pooled, self._pooled = self._pooled, None
+        if pooled is None:
+            return
+        if self._cursor is not None:
+            try:
+                self._cursor.close()
+            except pyodbc.Error:
+                broken = True
+        self._pool.release(pooled, broken=broken)
+        self._timer.finish(error=self._failed)
+
+def stream_query(query, params=None, batch_size=None, raw=False):
+    """Execute a SELECT and return a RowStream over its results
+
+    Unlike execute_query this never holds the full result set in memory.
+    It does not take part in the request's unit of work, so use it only for
+    reads that do not need to see the request's own uncommitted writes.
+    """
+    return RowStream(query, params, batch_size, raw)
 
 def execute_proc(proc_name, params=None):
     """Execute a stored procedure and return results"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        if params:
-            placeholders = ', '.join(['?' for _ in params])
-            cursor.execute(f"EXEC {proc_name} {placeholders}", params)
-        else:
-            cursor.execute(f"EXEC {proc_name}")
-        
-        # Try to get results if any
+    with _timed('proc', f"EXEC {proc_name}") as timer, \
+            _connection(write=True, timer=timer) as (conn, owns_transaction):
+        cursor = conn.cursor()
         try:
-            columns = [column[0] for column in cursor.description]
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
-            conn.commit()
+            if params:
+                placeholders = ', '.join(['?' for _ in params])
+                cursor.execute(f"EXEC {proc_name} {placeholders}", params)
+            else:
+                cursor.execute(f"EXEC {proc_name}")
+            timer.executed()
+
+            # Try to get results if any
+            try:
+                results = _fetch_rows(cursor)
+                timer.rows = len(results)
+            except (TypeError, pyodbc.ProgrammingError):
+                # The proc returned no result set
+                results = {"success": True}
+                timer.rows = 0
+            if owns_transaction:
+                conn.commit()
+                _writes_committed()
             return results
-        except:
-            conn.commit()
-            return {"success": True}
-    finally:
-        cursor.close()
-        conn.close()
+        finally:
+            cursor.close()
 
 def execute_insert(query, params):
     """Execute an INSERT/UPDATE query"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(query, params)
-        conn.commit()
-        return {"success": True}
-    finally:
-        cursor.close()
-        conn.close()
+    with _timed('insert', query) as timer, \
+            _connection(write=True, timer=timer) as (conn, owns_transaction):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            timer.executed()
+            if cursor.rowcount >= 0:
+                timer.rows = cursor.rowcount
+            if owns_transaction:
+                conn.commit()
+                _writes_committed()
+            return {"success": True}
+        finally:
+            cursor.close()
+
+def execute_many(query, seq_of_params):
+    """Execute an INSERT/UPDATE once per parameter row in a single round trip
 
+    Uses pyodbc's fast_executemany, which sends all rows as one parameter
+    array instead of one statement per row.
+    """
+    seq_of_params = list(seq_of_params)
+    if not seq_of_params:
+        return {"success": True, "rowCount": 0}
+    with _timed('many', query) as timer, \
+            _connection(write=True, timer=timer) as (conn, owns_transaction):
+        cursor = conn.cursor()
+        try:
+            cursor.fast_executemany = True
+            cursor.executemany(query, seq_of_params)
+            timer.executed()
+            timer.rows = len(seq_of_params)
+            if owns_transaction:
+                conn.commit()
+                _writes_committed()
+            return {"success": True, "rowCount": len(seq_of_params)}
+        finally:
+            cursor.close()
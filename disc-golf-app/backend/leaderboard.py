@@ -0,0 +1,283 @@
+"""
+Incremental in-memory leaderboard
+
+Answers /api/leaderboard?eventLimit=all (vw_PlayerLeaderboard) from memory.
+Per-(player, scorecard) totals are loaded once and then kept current by the
+write routes, which report score deltas after their transaction commits.
+Until a load settles, rows() returns None and the caller reads the view.
+"""
+import threading
+from bisect import bisect_left, insort
+
+from db import execute_batch, execute_query
+
+LOAD_QUERIES = [
+    ('players', """
+        SELECT PlayerID, FirstName, LastName, SkillDivision FROM Player
+    """, None),
+    ('totals', """
+        SELECT PlayerID, ScorecardID, SUM(Strokes) AS ScorecardTotal, COUNT(*) AS ScoreCount
+        FROM Score
+        GROUP BY PlayerID, ScorecardID
+    """, None),
+]
+
+COLUMNS = ('SkillDivision', 'FirstName', 'LastName', 'RoundsPlayed',
+           'HighTotal', 'BestScorecardTotal', 'DivisionRank')
+
+class _PlayerState:
+    """One player's round totals, kept sorted so the top 3 are always at hand"""
+    __slots__ = ('first_name', 'last_name', 'division', 'rounds', 'sorted_totals')
+
+    def __init__(self, first_name, last_name, division):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.division = division
+        self.rounds = {}          # scorecard_id -> [total, score_count]
+        self.sorted_totals = []   # negated totals, ascending (= totals descending)
+
+    def high_total(self):
+        return -sum(self.sorted_totals[:3])
+
+    def best_total(self):
+        return -self.sorted_totals[0]
+
+class LeaderboardEngine:
+    """vw_PlayerLeaderboard maintained incrementally in memory
+
+    HighTotal is the sum of a player's top 3 scorecard totals, RoundsPlayed
+    the number of scorecards they have scores on, and DivisionRank the
+    RANK() of HighTotal within their skill division. Each division keeps a
+    sorted index of (-HighTotal, PlayerID) that is patched on every delta.
+    The rendered rows are cached until the next delta, so reads between
+    writes are a dictionary lookup.
+
+    A write is in flight from write_started() (before its transaction
+    commits) until its delta has run or the transaction has rolled back
+    (write_finished()). A load is only installed if no write was in flight
+    and no delta ran while it was read; otherwise the snapshot may already
+    contain a write whose delta would then be applied twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._changes = 0  # bumped by every delta; detects writes during a load
+        self._in_flight = 0  # writes whose delta has not run yet
+        self._players = {}
+        self._by_scorecard = {}  # scorecard_id -> set of player ids with scores on it
+        self._divisions = {}     # division -> sorted list of (-HighTotal, player_id)
+        self._rendered = {}
+
+    # ----- loading -----
+
+    def reset(self):
+        """Forget everything; the next read reloads from the database"""
+        with self._lock:
+            self._loaded = False
+            self._changes += 1
+            self._players = {}
+            self._by_scorecard = {}
+            self._divisions = {}
+            self._rendered = {}
+
+    def _ensure_loaded(self):
+        """Load if needed; False if writes kept the load from settling"""
+        with self._lock:
+            if self._loaded:
+                return True
+        for _ in range(3):
+            with self._lock:
+                if self._in_flight:
+                    continue
+                changes_before = self._changes
+            batch = execute_batch(LOAD_QUERIES)
+            with self._lock:
+                if self._loaded:
+                    return True
+                if self._changes == changes_before and not self._in_flight:
+                    self._install(batch['players'], batch['totals'])
+                    return True
+        print("[LEADERBOARD] Writes kept arriving while loading; reading the view instead")
+        return False
+
+    def _install(self, players, totals):
+        self._players = {
+            row['PlayerID']: _PlayerState(row['FirstName'], row['LastName'], row['SkillDivision'])
+            for row in players
+        }
+        self._by_scorecard = {}
+        for row in totals:
+            player = self._players.get(row['PlayerID'])
+            if player is None:
+                continue
+            player.rounds[row['ScorecardID']] = [row['ScorecardTotal'], row['ScoreCount']]
+            self._by_scorecard.setdefault(row['ScorecardID'], set()).add(row['PlayerID'])
+        self._divisions = {}
+        for player_id, player in self._players.items():
+            player.sorted_totals = sorted(-total for total, _ in player.rounds.values())
+            if player.rounds:
+                self._divisions.setdefault(player.division, []).append((-player.high_total(), player_id))
+        for index in self._divisions.values():
+            index.sort()
+        self._rendered = {}
+        self._loaded = True
+
+    # ----- deltas (call after the write has committed) -----
+
+    def write_started(self):
+        """A write whose delta will follow is about to commit"""
+        with self._lock:
+            self._in_flight += 1
+
+    def write_finished(self):
+        """The write's delta has run, or it rolled back"""
+        with self._lock:
+            self._in_flight -= 1
+
+    def _unindex(self, player_id, player):
+        if player.rounds:
+            index = self._divisions[player.division]
+            del index[bisect_left(index, (-player.high_total(), player_id))]
+
+    def _reindex(self, player_id, player):
+        if player.rounds:
+            insort(self._divisions.setdefault(player.division, []), (-player.high_total(), player_id))
+
+    def _change_round(self, player_id, scorecard_id, delta, score_delta):
+        player = self._players.get(player_id)
+        if player is None:
+            # A player we have never seen; start over rather than guess
+            self.reset()
+            return False
+        self._unindex(player_id, player)
+        current = player.rounds.get(scorecard_id)
+        if current is not None:
+            del player.sorted_totals[bisect_left(player.sorted_totals, -current[0])]
+            total, count = current[0] + delta, current[1] + score_delta
+        else:
+            total, count = delta, score_delta
+        if count > 0:
+            player.rounds[scorecard_id] = [total, count]
+            insort(player.sorted_totals, -total)
+            self._by_scorecard.setdefault(scorecard_id, set()).add(player_id)
+        else:
+            player.rounds.pop(scorecard_id, None)
+            members = self._by_scorecard.get(scorecard_id)
+            if members is not None:
+                members.discard(player_id)
+                if not members:
+                    del self._by_scorecard[scorecard_id]
+        self._reindex(player_id, player)
+        return True
+
+    def add_player(self, player_id, first_name, last_name, division):
+        with self._lock:
+            self._changes += 1
+            if self._loaded and player_id not in self._players:
+                self._players[player_id] = _PlayerState(first_name, last_name, division)
+
+    def add_scores(self, scorecard_id, player_strokes):
+        """New Score rows: iterable of (player_id, strokes)"""
+        with self._lock:
+            self._changes += 1
+            if not self._loaded:
+                return
+            for player_id, strokes in player_strokes:
+                if not self._change_round(player_id, scorecard_id, strokes, 1):
+                    return
+            self._rendered = {}
+
+    def update_score(self, player_id, scorecard_id, old_strokes, new_strokes):
+        """An existing Score row changed from old_strokes to new_strokes"""
+        with self._lock:
+            self._changes += 1
+            if not self._loaded:
+                return
+            if self._change_round(player_id, scorecard_id, new_strokes - old_strokes, 0):
+                self._rendered = {}
+
+    def remove_round(self, player_id, scorecard_id):
+        """All of a player's scores on a scorecard were deleted"""
+        with self._lock:
+            self._changes += 1
+            if not self._loaded:
+                return
+            player = self._players.get(player_id)
+            current = player.rounds.get(scorecard_id) if player else None
+            if current is not None:
+                self._change_round(player_id, scorecard_id, -current[0], -current[1])
+                self._rendered = {}
+
+    def remove_scorecard(self, scorecard_id):
+        """Every score on a scorecard was deleted"""
+        with self._lock:
+            for player_id in list(self._by_scorecard.get(scorecard_id, ())):
+                self.remove_round(player_id, scorecard_id)
+            self._changes += 1
+
+    # ----- reads -----
+
+    def rows(self, division=None):
+        """Leaderboard rows in the same shape and order as the SQL view query
+
+        None while the engine cannot load (see _ensure_loaded).
+        """
+        if not self._ensure_loaded():
+            return None
+        with self._lock:
+            rendered = self._rendered.get(division)
+            if rendered is None:
+                rendered = self._render(division)
+                self._rendered[division] = rendered
+            return rendered
+
+    def _render(self, division):
+        divisions = [division] if division else sorted(self._divisions)
+        rows = []
+        for name in divisions:
+            index = self._divisions.get(name, [])
+            rank = 0
+            previous = None
+            for position, (neg_high, player_id) in enumerate(index, start=1):
+                if neg_high != previous:
+                    rank, previous = position, neg_high
+                player = self._players[player_id]
+                rows.append({
+                    'SkillDivision': player.division,
+                    'FirstName': player.first_name,
+                    'LastName': player.last_name,
+                    'RoundsPlayed': len(player.rounds),
+                    'HighTotal': -neg_high,
+                    'BestScorecardTotal': player.best_total(),
+                    'DivisionRank': rank,
+                })
+        return rows
+
+    def verify(self):
+        """Compare the in-memory leaderboard with vw_PlayerLeaderboard
+
+        Returns a dict with consistent (bool) and the rows found only in
+        memory or only in the view.
+        """
+        def key(row):
+            return tuple(row[column] for column in COLUMNS)
+
+        actual = self.rows()
+        if actual is None:
+            return {"consistent": False, "error": "Leaderboard could not load while writes were arriving"}
+        expected = execute_query("SELECT * FROM vw_PlayerLeaderboard")
+        expected_keys = sorted(map(key, expected))
+        actual_keys = sorted(map(key, actual))
+        expected_set, actual_set = set(expected_keys), set(actual_keys)
+        only_view = [dict(zip(COLUMNS, k)) for k in expected_keys if k not in actual_set]
+        only_memory = [dict(zip(COLUMNS, k)) for k in actual_keys if k not in expected_set]
+        return {
+            "consistent": expected_keys == actual_keys,
+            "viewRows": len(expected_keys),
+            "memoryRows": len(actual_keys),
+            "onlyInView": only_view,
+            "onlyInMemory": only_memory,
+        }
+
+leaderboard_engine = LeaderboardEngine()
@@ -0,0 +1,392 @@
+"""
+Live event scoreboard: in-process pub/sub behind /api/events/<id>/live
+
+Score writes publish one compact delta per committed transaction: the hole
+scores written, the affected round totals, and the standings ranks that
+changed (RANK() by RoundTotal, highest first, overall and per division,
+as in vw_HotRoundPerEvent). Every subscriber to the event gets the same
+message, so a write costs one push however many scoreboards are open.
+
+Messages carry a sequence number (the SSE id). Each watched event keeps
+its last LIVE_HISTORY messages, so a client that reconnects with
+Last-Event-ID gets what it missed; if that is no longer in memory (or the
+id comes from an earlier server process) it gets a "reset" and should
+reload the scoreboard. Sequence numbers start at the process's start time
+in milliseconds, so ids from an earlier process are always out of range.
+
+An event's feed (history and standings) is created when its first
+subscriber connects, loading the standings, which each delta then patches.
+Writes to events nobody is watching are not kept, and a feed is dropped
+LIVE_IDLE_TTL seconds after its last subscriber leaves.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Live feed configuration (override with environment variables)
+LIVE_CONFIG = {
+    # Seconds between keep-alive comments on an idle stream
+    'heartbeat': float(os.environ.get('LIVE_HEARTBEAT_INTERVAL', 15)),
+    # Messages kept per event for clients resuming with Last-Event-ID
+    'history': int(os.environ.get('LIVE_HISTORY', 500)),
+    # Seconds an event's feed outlives its last subscriber (for reconnects)
+    'idle_ttl': float(os.environ.get('LIVE_IDLE_TTL', 300)),
+    # Reconnect delay suggested to EventSource clients, in milliseconds
+    'retry_ms': int(os.environ.get('LIVE_RETRY_MS', 3000)),
+}
+
+# Set in the WSGI environ by the live route; asgi.py serves the rest of the
+# stream on its event loop instead of holding a worker thread
+ENVIRON_KEY = 'discgolf.live_stream'
+
+STANDINGS_SQL = """
+    SELECT s.ScorecardID, s.PlayerID, p.SkillDivision,
+           SUM(s.Strokes) AS RoundTotal, COUNT(s.HoleNumber) AS HolesPlayed
+    FROM Score s
+    JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+    JOIN Player p ON s.PlayerID = p.PlayerID
+    WHERE sc.EventID = ?
+    GROUP BY s.ScorecardID, s.PlayerID, p.SkillDivision
+"""
+
+def _ranks(standings):
+    """{(scorecard, player): (overall rank, division rank)}, RANK() by total descending"""
+    ranks = {}
+    overall = sorted(standings.items(), key=lambda item: -item[1][0])
+    by_division = {}
+    for position, (key, (total, division)) in enumerate(overall):
+        if position and total == overall[position - 1][1][0]:
+            rank = ranks[overall[position - 1][0]][0]
+        else:
+            rank = position + 1
+        ranks[key] = (rank, None)
+        by_division.setdefault(division, []).append((key, total))
+    for entries in by_division.values():
+        previous_total, previous_rank = None, None
+        for position, (key, total) in enumerate(entries):
+            rank = previous_rank if total == previous_total else position + 1
+            ranks[key] = (ranks[key][0], rank)
+            previous_total, previous_rank = total, rank
+    return ranks
+
+class _Feed:
+    """One event's message history, standings and waiting subscribers"""
+
+    def __init__(self, floor, history):
+        self.messages = deque(maxlen=history)
+        self.floor = floor          # newest seq no longer in messages
+        self.seq = floor            # seq of the feed's newest message
+        self.standings = None       # (scorecard, player) -> (total, division), once loaded
+        self.subscribers = 0
+        self.listeners = set()      # callbacks run on publish (async subscribers)
+        self.idle_since = None      # monotonic time the last subscriber left
+        self.deleted = False
+
+class LiveHub:
+    """Per-event message feeds with resumable sequence numbers"""
+
+    def __init__(self, history=500, idle_ttl=300):
+        self.history = history
+        self.idle_ttl = idle_ttl
+        self.base = time.time_ns() // 1_000_000
+        self._seq = self.base
+        self._feeds = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+        # Counters reported by stats()
+        self._published = 0
+        self._resets = 0
+
+    def _feed(self, event_id):
+        feed = self._feeds.get(event_id)
+        if feed is None:
+            self._evict_idle()
+            feed = self._feeds[event_id] = _Feed(self._seq, self.history)
+        return feed
+
+    def _evict_idle(self):
+        """Drop feeds nobody has watched for idle_ttl seconds"""
+        expired = time.monotonic() - self.idle_ttl
+        for event_id in [event_id for event_id, feed in self._feeds.items()
+                         if feed.idle_since is not None and feed.idle_since < expired]:
+            del self._feeds[event_id]
+
+    # ----- publishing -----
+
+    def publish(self, event_id, scores=(), totals=(), removed=()):
+        """Publish one committed write to the event's subscribers
+
+        scores: hole scores written, as dicts
+        totals: rows of ScorecardID, PlayerID, SkillDivision, RoundTotal, HolesPlayed
+            for every (scorecard, player) the write touched that still has scores
+        removed: (scorecard_id, player_id or None) pairs that no longer have
+            scores; None removes every player on the scorecard
+        """
+        data = {'eventId': event_id}
+        if scores:
+            data['scores'] = list(scores)
+        if totals:
+            data['totals'] = [{
+                'scorecardId': row['ScorecardID'],
+                'playerId': row['PlayerID'],
+                'roundTotal': row['RoundTotal'],
+                'holesPlayed': row['HolesPlayed'],
+            } for row in totals]
+        if removed:
+            data['removed'] = [
+                {'scorecardId': scorecard_id, 'playerId': player_id}
+                for scorecard_id, player_id in removed
+            ]
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            if feed is None:
+                # Nobody is watching; nothing to send or keep
+                return
+            if feed.standings is not None:
+                ranks = self._apply(feed, totals, removed)
+                if ranks:
+                    data['ranks'] = ranks
+            self._append(feed, 'delta', data)
+
+    def publish_deleted(self, event_id):
+        """Tell the event's subscribers it was deleted, and drop its feed"""
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            if feed is None:
+                return
+            feed.deleted = True
+            self._append(feed, 'deleted', {'eventId': event_id})
+            if not feed.subscribers:
+                del self._feeds[event_id]
+
+    def _append(self, feed, kind, data):
+        self._seq += 1
+        if len(feed.messages) == feed.messages.maxlen:
+            feed.floor = feed.messages[0][0]
+        feed.messages.append((self._seq, kind, data))
+        feed.seq = self._seq
+        self._published += 1
+        self._changed.notify_all()
+        for listener in list(feed.listeners):
+            listener()
+
+    def _apply(self, feed, totals, removed):
+        """Patch the standings; return the rank changes"""
+        before = _ranks(feed.standings)
+        for scorecard_id, player_id in removed:
+            for key in [key for key in feed.standings
+                        if key[0] == scorecard_id and player_id in (None, key[1])]:
+                del feed.standings[key]
+        for row in totals:
+            feed.standings[(row['ScorecardID'], row['PlayerID'])] = (row['RoundTotal'], row['SkillDivision'])
+        after = _ranks(feed.standings)
+        changes = []
+        for key, (overall, division) in sorted(after.items(), key=lambda item: item[1]):
+            previous = before.get(key, (None, None))
+            if previous != (overall, division):
+                changes.append({
+                    'scorecardId': key[0],
+                    'playerId': key[1],
+                    'rank': overall,
+                    'previousRank': previous[0],
+                    'divisionRank': division,
+                    'previousDivisionRank': previous[1],
+                })
+        return changes
+
+    # ----- subscribing -----
+
+    def subscribe(self, event_id, load_standings):
+        """Register a subscriber; returns the event's current sequence number
+
+        load_standings(event_id) returns the STANDINGS_SQL rows; it is called
+        (outside the lock) when the event's standings are not loaded yet.
+        """
+        with self._lock:
+            feed = self._feed(event_id)
+            feed.subscribers += 1
+            feed.idle_since = None
+            loaded = feed.standings is not None
+            current = self._seq
+        if loaded:
+            return current
+        for _ in range(3):
+            with self._lock:
+                started = feed.seq
+            try:
+                rows = load_standings(event_id)
+            except Exception:
+                self.unsubscribe(event_id)
+                raise
+            with self._lock:
+                if feed.seq == started:
+                    # No write to this event was published while loading
+                    feed.standings = {
+                        (row['ScorecardID'], row['PlayerID']): (row['RoundTotal'], row['SkillDivision'])
+                        for row in rows
+                    }
+                    return self._seq
+        print(f"[LIVE] Standings for event {event_id} kept changing while loading; sending deltas without ranks")
+        return current
+
+    def unsubscribe(self, event_id):
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            if feed is None:
+                return
+            feed.subscribers -= 1
+            if feed.subscribers <= 0:
+                if feed.deleted:
+                    del self._feeds[event_id]
+                else:
+                    feed.idle_since = time.monotonic()
+
+    def messages_after(self, event_id, seq):
+        """(messages newer than seq, reset) where reset means seq is not resumable"""
+        with self._lock:
+            return self._messages_after(event_id, seq)
+
+    def _messages_after(self, event_id, seq):
+        feed = self._feeds.get(event_id)
+        if feed is None:
+            return [], False
+        if seq < feed.floor or seq > self._seq:
+            self._resets += 1
+            return [], True
+        return [message for message in feed.messages if message[0] > seq], False
+
+    def wait(self, event_id, seq, timeout):
+        """messages_after, blocking up to timeout seconds for something new"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                messages, reset = self._messages_after(event_id, seq)
+                remaining = deadline - time.monotonic()
+                if messages or reset or remaining <= 0:
+                    return messages, reset
+                self._changed.wait(remaining)
+
+    def add_listener(self, event_id, callback):
+        """Call callback() (from the publishing thread) on each new message"""
+        with self._lock:
+            self._feed(event_id).listeners.add(callback)
+
+    def remove_listener(self, event_id, callback):
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            if feed is not None:
+                feed.listeners.discard(callback)
+
+    def current_seq(self):
+        with self._lock:
+            return self._seq
+
+    def stats(self):
+        with self._lock:
+            return {
+                "events": len(self._feeds),
+                "subscribers": sum(feed.subscribers for feed in self._feeds.values()),
+                "published": self._published,
+                "resets": self._resets,
+            }
+
+live_hub = LiveHub(history=LIVE_CONFIG['history'], idle_ttl=LIVE_CONFIG['idle_ttl'])
+
+# ============================================
+# SERVER-SENT EVENTS
+# ============================================
+
+def format_event(seq, kind, data):
+    return f"id: {seq}\nevent: {kind}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+class LiveStream:
+    """One subscriber's SSE body, iterable by a WSGI server or asyncio
+
+    Both kinds of iteration share the position, so asgi.py can send the
+    first chunk through Flask and continue on its event loop.
+    """
+
+    def __init__(self, hub, event_id, after_seq, resumed, heartbeat=None):
+        self.hub = hub
+        self.event_id = event_id
+        self.seq = after_seq
+        self.heartbeat = heartbeat or LIVE_CONFIG['heartbeat']
+        self._pending = [f"retry: {LIVE_CONFIG['retry_ms']}\n\n"]
+        if not resumed:
+            self._pending.append(format_event(after_seq, 'ready', {'eventId': event_id, 'seq': after_seq}))
+        self._done = False
+        self._detached = False
+        self._closed = False
+
+    def _render(self, messages, reset):
+        """Chunks for a wait() result, advancing the position"""
+        if reset:
+            self.seq = self.hub.current_seq()
+            return [format_event(self.seq, 'reset', {'eventId': self.event_id, 'seq': self.seq})]
+        chunks = []
+        for seq, kind, data in messages:
+            chunks.append(format_event(seq, kind, data))
+            self.seq = seq
+            if kind == 'deleted':
+                self._done = True
+                break
+        return chunks or [": heartbeat\n\n"]
+
+    def _first(self):
+        """Missed messages (or a reset) for a resuming client"""
+        messages, reset = self.hub.messages_after(self.event_id, self.seq)
+        if reset or messages:
+            self._pending.extend(self._render(messages, reset))
+        return ''.join(self._pending)
+
+    def __iter__(self):
+        if self._pending:
+            first, self._pending = self._first(), []
+            yield first
+        while not self._done:
+            messages, reset = self.hub.wait(self.event_id, self.seq, self.heartbeat)
+            yield ''.join(self._render(messages, reset))
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def wake():
+            loop.call_soon_threadsafe(changed.set)
+
+        self.hub.add_listener(self.event_id, wake)
+        try:
+            if self._pending:
+                first, self._pending = self._first(), []
+                yield first
+            while not self._done:
+                changed.clear()
+                messages, reset = self.hub.messages_after(self.event_id, self.seq)
+                if not messages and not reset:
+                    try:
+                        await asyncio.wait_for(changed.wait(), self.heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                    messages, reset = self.hub.messages_after(self.event_id, self.seq)
+                yield ''.join(self._render(messages, reset))
+        finally:
+            self.hub.remove_listener(self.event_id, wake)
+            self._unsubscribe()
+
+    def detach(self):
+        """Hand the stream over to async iteration: the WSGI close() no longer ends it"""
+        self._detached = True
+
+    def close(self):
+        """Called by the WSGI server when the response ends"""
+        if not self._detached:
+            self._unsubscribe()
+
+    def _unsubscribe(self):
+        if not self._closed:
+            self._closed = True
+            self.hub.unsubscribe(self.event_id)
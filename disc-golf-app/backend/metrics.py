@@ -0,0 +1,225 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+Counters and histograms keyed by label values, plus gauges sampled at
+scrape time. db.py records every query helper call and app.py every
+request; GET /api/metrics renders the registry.
+"""
+import hashlib
+import re
+import threading
+from functools import lru_cache
+
+# Histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonically increasing count per label combination"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, _format_labels(self.label_names, key), value
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values = {}  # key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.label_names)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+        for key, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, [('le', _format_number(bound))])
+                yield f"{self.name}_bucket", labels, cumulative
+            yield f"{self.name}_sum", _format_labels(self.label_names, key), state[-2]
+            yield f"{self.name}_count", _format_labels(self.label_names, key), state[-1]
+
+class Gauge:
+    """Values read at scrape time: sample() returns {label values tuple: value}
+
+    type_name='counter' exposes a running total kept elsewhere (e.g. the
+    pool's borrow count) as a counter.
+    """
+
+    def __init__(self, name, help_text, sample, labels=(), type_name='gauge'):
+        self.type_name = type_name
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._sample = sample
+
+    def samples(self):
+        try:
+            values = self._sample()
+        except Exception as e:
+            print(f"[METRICS] gauge {self.name} failed: {e}")
+            return
+        for key, value in values.items():
+            if value is not None:
+                yield self.name, _format_labels(self.label_names, key), value
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self.register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, sample, labels=(), type_name='gauge'):
+        return self.register(Gauge(name, help_text, sample, labels, type_name))
+
+    def render(self):
+        """The whole registry in Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+# ============================================
+# QUERY NAMES
+# ============================================
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_LITERALS = re.compile(r"'(?:[^']|'')*'")
+# (?, ?, ?) and (?, ?), (?, ?) lists of any length collapse to (?)
+_PARAM_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_TARGET = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|MERGE(?:\s+INTO)?|EXEC(?:UTE)?)\s+(?:\[?dbo\]?\.)?\[?(\w+)",
+    re.IGNORECASE,
+)
+
+@lru_cache(maxsize=1024)
+def query_name(sql):
+    """Stable, readable metric label for a SQL statement
+
+    <verb>_<first table or view>_<hash of the normalized text>, e.g.
+    select_vw_PlayerLeaderboard_1f0c2a9e. Whitespace, comments, literal
+    values and the length of parameter lists do not change the name.
+    """
+    normalized = _COMMENTS.sub(' ', sql)
+    normalized = _LITERALS.sub("''", normalized)
+    normalized = _PARAM_LISTS.sub('(?)', normalized)
+    normalized = re.sub(r"^\s*SET\s+NOCOUNT\s+ON\s*;", '', normalized, flags=re.IGNORECASE)
+    normalized = ' '.join(normalized.split())
+    words = normalized.split(' ', 1)
+    verb = words[0].lower() if words[0] else 'sql'
+    if verb == 'with':
+        # A CTE is still a read
+        verb = 'select'
+    target = _TARGET.search(normalized)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:8]
+    return f"{verb}_{target.group(1) if target else 'none'}_{digest}"
+
+# ============================================
+# METRICS
+# ============================================
+
+db_query_seconds = registry.histogram(
+    'db_query_duration_seconds',
+    'Wall time of db helper calls, from borrowing a connection to the last row',
+    ('query', 'kind', 'source'),
+)
+db_acquire_seconds = registry.histogram(
+    'db_query_acquire_seconds',
+    'Time db helper calls spent getting a connection',
+    ('query', 'kind', 'source'),
+)
+db_query_rows = registry.histogram(
+    'db_query_rows',
+    'Rows returned (or written, for execute_many) per db helper call',
+    ('query', 'kind', 'source'), buckets=ROW_BUCKETS,
+)
+db_query_errors = registry.counter(
+    'db_query_errors_total',
+    'db helper calls that raised',
+    ('query', 'kind', 'source'),
+)
+
+http_request_seconds = registry.histogram(
+    'http_request_duration_seconds',
+    'Time from the start of a request to the end of its response body',
+    ('method', 'route'),
+)
+http_requests = registry.counter(
+    'http_requests_total',
+    'Requests by route and status code',
+    ('method', 'route', 'status'),
+)
+http_response_bytes = registry.histogram(
+    'http_response_size_bytes',
+    'Response body sizes',
+    ('method', 'route'), buckets=SIZE_BUCKETS,
+)
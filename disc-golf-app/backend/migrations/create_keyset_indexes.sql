@@ -0,0 +1,61 @@
+-- =====================================================
+-- KEYSET PAGINATION MIGRATION
+-- Indexes behind the paged list endpoints (pagination.py). Each page seeks
+-- its sort key and reads only `limit` rows; without these indexes SQL
+-- Server sorts the whole table (or join) for every page.
+-- Run this against your PuttingLeague database after create_round_totals.sql.
+-- =====================================================
+
+USE [PuttingLeague]
+GO
+
+-- =====================================================
+-- 1. /api/scorecards: newest first
+-- =====================================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Scorecard_CreatedAt' AND object_id = OBJECT_ID('dbo.Scorecard'))
+BEGIN
+    CREATE INDEX IX_Scorecard_CreatedAt ON [dbo].[Scorecard] (CreatedAt DESC, ScorecardID DESC);
+END
+GO
+
+-- =====================================================
+-- 2. /api/events: most recent first
+-- =====================================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Event_EventDate' AND object_id = OBJECT_ID('dbo.Event'))
+BEGIN
+    CREATE INDEX IX_Event_EventDate ON [dbo].[Event] (EventDate DESC, EventID DESC);
+END
+GO
+
+-- =====================================================
+-- 3. /api/players: by name
+-- =====================================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Player_Name' AND object_id = OBJECT_ID('dbo.Player'))
+BEGIN
+    CREATE INDEX IX_Player_Name ON [dbo].[Player] (LastName, FirstName, PlayerID);
+END
+GO
+
+-- =====================================================
+-- 4. /api/players/<id>/history: a player's rounds, best first
+-- Replaces IX_RoundTotals_Player from create_round_totals.sql with one that
+-- also orders tied totals by ScorecardID, the page key's tie-breaker.
+-- =====================================================
+
+CREATE INDEX IX_RoundTotals_Player ON [dbo].[RoundTotals] (PlayerID, RoundTotal DESC, ScorecardID DESC)
+    INCLUDE (EventID)
+    WITH (DROP_EXISTING = ON);
+GO
+
+-- =====================================================
+-- 5. /api/players/<id>/scorecards: the player's own cards
+-- =====================================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ScorecardMember_Player' AND object_id = OBJECT_ID('dbo.ScorecardMember'))
+BEGIN
+    CREATE INDEX IX_ScorecardMember_Player ON [dbo].[ScorecardMember] (PlayerID, ScorecardID);
+END
+GO
@@ -0,0 +1,42 @@
+-- =====================================================
+-- READ REPLICA MIGRATION
+-- Settings the backend's local read replica (replica.py)
+-- relies on to sync cheaply. Only needed when READ_REPLICA_PATH is set.
+-- =====================================================
+
+USE [PuttingLeague]
+GO
+
+-- =====================================================
+-- 1. Change tracking
+-- Each sync asks CHANGETABLE for the Player, Event, Scorecard and Score
+-- rows inserted, updated or deleted since the version it last saw, and
+-- skips the sync when CHANGE_TRACKING_CURRENT_VERSION() has not moved.
+-- Retention must outlast the longest a replica may be down; after that it
+-- reloads the table instead.
+-- =====================================================
+
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_databases WHERE database_id = DB_ID())
+BEGIN
+    ALTER DATABASE [PuttingLeague] SET CHANGE_TRACKING = ON (CHANGE_RETENTION = 2 DAYS, AUTO_CLEANUP = ON);
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('dbo.Player'))
+    ALTER TABLE [dbo].[Player] ENABLE CHANGE_TRACKING;
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('dbo.Event'))
+    ALTER TABLE [dbo].[Event] ENABLE CHANGE_TRACKING;
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('dbo.Scorecard'))
+    ALTER TABLE [dbo].[Scorecard] ENABLE CHANGE_TRACKING;
+IF NOT EXISTS (SELECT 1 FROM sys.change_tracking_tables WHERE object_id = OBJECT_ID('dbo.Score'))
+    ALTER TABLE [dbo].[Score] ENABLE CHANGE_TRACKING;
+GO
+
+-- =====================================================
+-- 2. Snapshot isolation
+-- Each sync reads all tables in one SNAPSHOT transaction so it sees a
+-- single consistent state. On by default in Azure SQL Database.
+-- =====================================================
+
+ALTER DATABASE [PuttingLeague] SET ALLOW_SNAPSHOT_ISOLATION ON;
+GO
@@ -0,0 +1,245 @@
+-- =====================================================
+-- ROUND TOTALS MIGRATION
+-- Persists one row per (scorecard, player) with the round total so the
+-- stats views no longer re-aggregate every hole score on each query.
+-- Run this against your PuttingLeague database after create_stats_views.sql.
+-- The backend keeps the table current on every score write
+-- (see refresh_round_totals in app.py).
+-- =====================================================
+
+USE [PuttingLeague]
+GO
+
+-- =====================================================
+-- 1. RoundTotals table
+-- =====================================================
+
+IF OBJECT_ID('dbo.RoundTotals', 'U') IS NULL
+BEGIN
+    CREATE TABLE [dbo].[RoundTotals] (
+        ScorecardID INT NOT NULL,
+        PlayerID INT NOT NULL,
+        EventID INT NOT NULL,
+        RoundTotal INT NOT NULL,
+        HolesPlayed INT NOT NULL,
+        UpdatedAt DATETIME2 NOT NULL CONSTRAINT DF_RoundTotals_UpdatedAt DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_RoundTotals PRIMARY KEY (ScorecardID, PlayerID)
+    );
+
+    CREATE INDEX IX_RoundTotals_Event ON [dbo].[RoundTotals] (EventID)
+        INCLUDE (PlayerID, RoundTotal, HolesPlayed);
+
+    CREATE INDEX IX_RoundTotals_Player ON [dbo].[RoundTotals] (PlayerID, RoundTotal DESC)
+        INCLUDE (EventID);
+END
+GO
+
+-- =====================================================
+-- 2. Initial population (safe to re-run; rebuilds from Score)
+-- =====================================================
+
+BEGIN TRANSACTION;
+
+DELETE FROM [dbo].[RoundTotals];
+
+INSERT INTO [dbo].[RoundTotals] (ScorecardID, PlayerID, EventID, RoundTotal, HolesPlayed)
+SELECT
+    s.ScorecardID,
+    s.PlayerID,
+    sc.EventID,
+    SUM(s.Strokes),
+    COUNT(s.HoleNumber)
+FROM Score s
+INNER JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+GROUP BY s.ScorecardID, s.PlayerID, sc.EventID;
+
+COMMIT;
+GO
+
+-- =====================================================
+-- 3. Player Leaderboard (reads RoundTotals)
+-- =====================================================
+
+CREATE OR ALTER VIEW [dbo].[vw_PlayerLeaderboard] AS
+WITH RankedRounds AS (
+    SELECT
+        PlayerID,
+        RoundTotal,
+        ROW_NUMBER() OVER (PARTITION BY PlayerID ORDER BY RoundTotal DESC) AS ScoreRank,
+        COUNT(*) OVER (PARTITION BY PlayerID) AS TotalRounds
+    FROM RoundTotals
+),
+PlayerStats AS (
+    SELECT
+        PlayerID,
+        MAX(TotalRounds) AS TotalRounds,
+        SUM(RoundTotal) AS HighTotal,
+        MAX(RoundTotal) AS BestScorecardTotal
+    FROM RankedRounds
+    WHERE ScoreRank <= 3
+    GROUP BY PlayerID
+)
+SELECT
+    p.SkillDivision,
+    p.FirstName,
+    p.LastName,
+    ps.TotalRounds AS RoundsPlayed,
+    ps.HighTotal,
+    ps.BestScorecardTotal,
+    RANK() OVER (PARTITION BY p.SkillDivision ORDER BY ps.HighTotal DESC) AS DivisionRank
+FROM PlayerStats ps
+INNER JOIN Player p ON ps.PlayerID = p.PlayerID
+GO
+
+-- =====================================================
+-- 4. Player Score History (reads RoundTotals)
+-- =====================================================
+
+CREATE OR ALTER VIEW [dbo].[vw_PlayerScoreHistory] AS
+SELECT
+    p.PlayerID,
+    p.FirstName,
+    p.LastName,
+    p.SkillDivision,
+    rt.ScorecardID,
+    rt.EventID,
+    e.EventDate,
+    e.Name AS EventName,
+    rt.RoundTotal AS ScorecardTotal,
+    ROW_NUMBER() OVER (PARTITION BY rt.PlayerID ORDER BY rt.RoundTotal DESC) AS ScoreRank,
+    CASE
+        WHEN ROW_NUMBER() OVER (PARTITION BY rt.PlayerID ORDER BY rt.RoundTotal DESC) <= 3
+        THEN 'Yes'
+        ELSE 'No'
+    END AS CountsTowardTotal
+FROM RoundTotals rt
+INNER JOIN Player p ON rt.PlayerID = p.PlayerID
+INNER JOIN Event e ON rt.EventID = e.EventID
+GO
+
+-- =====================================================
+-- 5. Hot Round Per Event (reads RoundTotals)
+-- =====================================================
+
+CREATE OR ALTER VIEW [dbo].[vw_HotRoundPerEvent] AS
+WITH RankedRounds AS (
+    SELECT
+        rt.EventID,
+        e.Name AS EventName,
+        e.EventDate,
+        p.FirstName,
+        p.LastName,
+        p.SkillDivision,
+        rt.RoundTotal,
+        rt.HolesPlayed,
+        RANK() OVER (PARTITION BY rt.EventID, p.SkillDivision ORDER BY rt.RoundTotal DESC) AS DivisionRank,
+        RANK() OVER (PARTITION BY rt.EventID ORDER BY rt.RoundTotal DESC) AS OverallRank
+    FROM RoundTotals rt
+    INNER JOIN Player p ON rt.PlayerID = p.PlayerID
+    INNER JOIN Event e ON rt.EventID = e.EventID
+)
+SELECT
+    EventName,
+    EventDate,
+    SkillDivision,
+    FirstName + ' ' + LastName AS PlayerName,
+    RoundTotal,
+    HolesPlayed,
+    DivisionRank,
+    OverallRank,
+    CASE
+        WHEN OverallRank = 1 THEN 'Hot Round Overall'
+        WHEN DivisionRank = 1 THEN 'Hot Round - ' + SkillDivision
+        ELSE ''
+    END AS BadgeType
+FROM RankedRounds
+WHERE DivisionRank = 1
+GO
+
+-- =====================================================
+-- 6. Podium Percentage (reads RoundTotals)
+-- =====================================================
+
+CREATE OR ALTER VIEW [dbo].[vw_PodiumPercentage] AS
+WITH RankedByEvent AS (
+    SELECT
+        rt.PlayerID,
+        p.FirstName,
+        p.LastName,
+        p.SkillDivision,
+        RANK() OVER (PARTITION BY rt.EventID, p.SkillDivision ORDER BY rt.RoundTotal DESC) AS DivisionRank
+    FROM RoundTotals rt
+    INNER JOIN Player p ON rt.PlayerID = p.PlayerID
+)
+SELECT
+    FirstName + ' ' + LastName AS PlayerName,
+    SkillDivision,
+    COUNT(CASE WHEN DivisionRank <= 3 THEN 1 END) AS PodiumFinishes,
+    COUNT(*) AS TotalRounds,
+    CAST(COUNT(CASE WHEN DivisionRank <= 3 THEN 1 END) * 100.0 / NULLIF(COUNT(*), 0) AS DECIMAL(5,1)) AS PodiumPercentage
+FROM RankedByEvent
+GROUP BY PlayerID, FirstName, LastName, SkillDivision
+GO
+
+-- =====================================================
+-- 7. Top Card Per Event (reads RoundTotals)
+-- HolesPlayed is the most holes any player on the card has scored
+-- =====================================================
+
+CREATE OR ALTER VIEW [dbo].[vw_TopCardPerEvent] AS
+WITH CardTotals AS (
+    SELECT
+        rt.EventID,
+        e.Name AS EventName,
+        e.EventDate,
+        rt.ScorecardID,
+        SUM(rt.RoundTotal) AS CardTotal,
+        COUNT(*) AS PlayerCount,
+        MAX(rt.HolesPlayed) AS HolesPlayed
+    FROM RoundTotals rt
+    INNER JOIN Event e ON rt.EventID = e.EventID
+    GROUP BY rt.EventID, e.Name, e.EventDate, rt.ScorecardID
+),
+cardMates AS (
+    SELECT rt.ScorecardID, STRING_AGG(p.FirstName + ' ' + p.LastName, ', ') AS Players
+    FROM RoundTotals rt
+    JOIN Player p ON rt.PlayerID = p.PlayerID
+    GROUP BY rt.ScorecardID
+),
+RankedCards AS (
+    SELECT
+        ct.EventID,
+        EventName,
+        EventDate,
+        CardTotal,
+        PlayerCount,
+        HolesPlayed,
+        Players,
+        RANK() OVER (PARTITION BY ct.EventID ORDER BY CardTotal DESC) AS CardRank
+    FROM CardTotals ct
+    JOIN cardMates cm ON ct.ScorecardID = cm.ScorecardID
+)
+SELECT
+    EventName,
+    EventDate,
+    CardRank,
+    CardTotal,
+    PlayerCount,
+    HolesPlayed,
+    CAST(CardTotal * 1.0 / NULLIF(HolesPlayed, 0) AS DECIMAL(5,2)) AS AvgScorePerHole,
+    Players
+FROM RankedCards
+WHERE CardRank <= 3
+GO
+
+-- =====================================================
+-- VERIFICATION QUERIES
+-- =====================================================
+
+SELECT 'RoundTotals' AS ObjectName, COUNT(*) AS RowCount FROM RoundTotals;
+SELECT 'Score (grouped)' AS ObjectName, COUNT(*) AS RowCount
+FROM (SELECT DISTINCT ScorecardID, PlayerID FROM Score) t;
+GO
+
+PRINT 'Migration complete!'
+GO
@@ -0,0 +1,177 @@
+"""
+Keyset (cursor) pagination for the list endpoints
+
+A page is fetched with WHERE (sort key) after (last key seen) ORDER BY sort
+key, so its cost is the same however deep the client has scrolled. The
+cursor handed to the client is the last row's sort key, encoded as opaque
+base64url JSON. The sort keys are backed by indexes (see
+migrations/create_keyset_indexes.sql); lists that join other tables seek
+the indexed table first and join only the page's rows.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from db import execute_query, execute_query_columnar
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class InvalidPageRequest(ValueError):
+    """Bad ?limit or ?after value (reported to the client as a 400)"""
+
+def _encode_value(value):
+    # Tag the types JSON cannot carry so they decode back to the same type
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'n': str(value)}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'n' in value:
+            return Decimal(value['n'])
+        raise ValueError("unknown cursor value")
+    return value
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, expected_length):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != expected_length:
+            raise ValueError("wrong cursor length")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise InvalidPageRequest(f"Invalid cursor: {cursor}") from e
+
+def parse_page_args(args):
+    """(limit, after) from request args, or None when the client did not ask for a page"""
+    limit = args.get('limit')
+    after = args.get('after')
+    if limit is None and after is None:
+        return None
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise InvalidPageRequest(f"Invalid limit: {limit}")
+        if limit < 1:
+            raise InvalidPageRequest("limit must be at least 1")
+        limit = min(limit, MAX_PAGE_SIZE)
+    return limit, after or None
+
+class Keyset:
+    """A list query plus the unique sort key it is ordered and paged by
+
+    sql is the query without ORDER BY. keys are result column names that
+    together identify a row (last one is normally the primary key); all
+    keys sort in the same direction. A key may be given as (name, sql_type)
+    to cast the cursor value to the column's type, e.g. ('CreatedAt',
+    'datetime'): pyodbc binds Python datetimes as datetime2, which does not
+    compare equal to the same DATETIME value.
+
+    source, for a list that joins other tables, is a query over the one
+    table whose index covers the keys; sql reads it as {source} (e.g.
+    "FROM {source} AS s JOIN Event e ...") and must return one row per
+    source row. A page takes its rows from the source alone, so only those
+    are joined. The list's params are then the source's; sql has none.
+
+    numbered is an optional select list over {n}, each row's position in
+    the whole list counting from 1 (e.g. "{n} AS Rank"). Pages carry the
+    last position in the cursor rather than counting the rows before them.
+    """
+
+    def __init__(self, sql, keys, descending=False, source=None, numbered=None):
+        self.sql = sql.strip()
+        self.source = source.strip() if source else None
+        self.numbered = numbered
+        self.keys = tuple(key if isinstance(key, str) else key[0] for key in keys)
+        self._markers = tuple(
+            '?' if isinstance(key, str) else f"CAST(? AS {key[1]})" for key in keys
+        )
+        self.descending = descending
+        direction = 'DESC' if descending else 'ASC'
+        self.order_by = ', '.join(f"{key} {direction}" for key in self.keys)
+
+    def _numbered(self, n):
+        return f", {self.numbered.format(n=n)}" if self.numbered else ''
+
+    def all_sql(self):
+        """The whole list, in page order"""
+        sql = self.sql.format(source=f"({self.source})") if self.source else self.sql
+        if self.numbered:
+            numbered = self._numbered(f"ROW_NUMBER() OVER (ORDER BY {self.order_by})")
+            sql = f"SELECT keyset_page.*{numbered}\nFROM ({sql}) AS keyset_page"
+        return f"{sql}\nORDER BY {self.order_by}"
+
+    def _after(self, values):
+        # Row-value comparison (k1, k2, ...) > (v1, v2, ...) spelled out for
+        # T-SQL, led by a plain bound on k1 that the index can seek on
+        op = '<' if self.descending else '>'
+        clauses, params = [], [values[0]]
+        for i, key in enumerate(self.keys):
+            terms = [f"{prior} = {marker}" for prior, marker in zip(self.keys[:i], self._markers)]
+            terms.append(f"{key} {op} {self._markers[i]}")
+            clauses.append('(' + ' AND '.join(terms) + ')')
+            params.extend(values[:i + 1])
+        return f"{self.keys[0]} {op}= {self._markers[0]} AND ({' OR '.join(clauses)})", params
+
+    def page(self, params, limit, after=None, columnar=False):
+        """{items, next}: up to `limit` rows following the `after` cursor
+
+        With columnar=True the page is {columns, rows, next} instead.
+        """
+        where, where_params, position = '', [], 0
+        if after:
+            values = decode_cursor(after, len(self.keys) + (1 if self.numbered else 0))
+            if self.numbered:
+                position = values.pop()
+                if not isinstance(position, int) or position < 0:
+                    raise InvalidPageRequest(f"Invalid cursor: {after}")
+            condition, where_params = self._after(values)
+            where = f"WHERE {condition}"
+        numbered = self._numbered(f"(ROW_NUMBER() OVER (ORDER BY {self.order_by}) + ?)")
+        numbered_params = [position] * (self.numbered.count('{n}') if self.numbered else 0)
+        if self.source:
+            seek = (f"(SELECT TOP (?) * FROM ({self.source}) AS keyset_source {where} "
+                    f"ORDER BY {self.order_by})")
+            sql = (f"SELECT keyset_page.*{numbered} FROM ({self.sql.format(source=seek)}) AS keyset_page "
+                   f"ORDER BY {self.order_by}")
+            all_params = numbered_params + [limit + 1] + list(params or []) + where_params
+        else:
+            sql = (f"SELECT TOP (?) keyset_page.*{numbered} FROM ({self.sql}) AS keyset_page {where} "
+                   f"ORDER BY {self.order_by}")
+            all_params = [limit + 1] + numbered_params + list(params or []) + where_params
+        if columnar:
+            result = execute_query_columnar(sql, all_params)
+            rows = result["rows"]
+            positions = [result["columns"].index(key) for key in self.keys]
+            last_key = lambda row: [row[i] for i in positions]
+        else:
+            rows = execute_query(sql, all_params)
+            last_key = lambda row: [row[key] for key in self.keys]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = last_key(rows[-1])
+            if self.numbered:
+                last.append(position + limit)
+            next_cursor = encode_cursor(last)
+        if columnar:
+            return {"columns": result["columns"], "rows": rows, "next": next_cursor}
+        return {"items": rows, "next": next_cursor}
@@ -0,0 +1,233 @@
+"""
+On-demand profiling of single requests
+
+With REQUEST_PROFILING=1, a request sent with ?profile=1 (or an
+X-Profile: 1 header) runs under cProfile and tracemalloc, and every db
+helper call it makes is timed. The report shows:
+
+    * queries: each helper call in order, with its connection-acquire,
+      execute and fetch time and row count. For SQL Server the execute
+      time is mostly the query (e.g. a stats view) and the fetch time is
+      pyodbc reading rows. A streamed query's fetch time also covers the
+      JSON encoding of its batches, which happens between fetches.
+    * functions: the top functions by cumulative time, e.g. Rows building
+      or the JSON provider
+    * memory: the peak traced memory, and the allocations by line at the
+      sampled point with the most memory in use (after each query and at
+      the end of the request, once the body is built)
+
+?profile=1 replaces the response with the report (the route's own status
+and body size are included). ?profile=save returns the normal response
+and writes the report, plus a .prof file for pstats or snakeviz, to
+PROFILE_DIR; the X-Profile-Report header names the files.
+
+Only one request is profiled at a time. cProfile only sees the request's
+own thread, so work handed to a thread pool (e.g. /api/bootstrap's
+sections) shows up as waiting; its queries are still listed.
+"""
+import cProfile
+import json
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Profiling configuration (override with environment variables)
+PROFILE_CONFIG = {
+    'enabled': os.environ.get('REQUEST_PROFILING', '').lower() in ('1', 'true', 'yes'),
+    'dir': os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'discgolf-profiles')),
+    'top': int(os.environ.get('PROFILE_TOP', 30)),
+}
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Frames and allocations of the profiler itself are left out of reports
+_OWN_FILES = (os.path.abspath(__file__), tracemalloc.__file__, cProfile.__file__, pstats.__file__)
+
+_active = threading.Lock()
+
+def requested_mode(args, headers):
+    """'report' or 'save' if the request asks to be profiled, else None"""
+    value = args.get('profile') or headers.get('X-Profile')
+    if not value or value.lower() in ('0', 'false', 'no'):
+        return None
+    return 'save' if value.lower() == 'save' else 'report'
+
+def _short_path(filename):
+    """Path relative to the backend or site-packages, for readable reports"""
+    if filename.startswith(BACKEND_DIR + os.sep):
+        return os.path.relpath(filename, BACKEND_DIR)
+    marker = filename.rfind('site-packages' + os.sep)
+    if marker >= 0:
+        return filename[marker + len('site-packages') + 1:]
+    return filename
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+class RequestProfile:
+    """cProfile, tracemalloc and query log of one request
+
+    start() takes the process-wide profiling lock and returns False if
+    another request holds it. stop() is safe to call more than once.
+    """
+
+    def __init__(self, mode, top=None):
+        self.mode = mode
+        self.top = top or PROFILE_CONFIG['top']
+        self.queries = []
+        self._profiler = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._started = None
+        self._elapsed = None
+        self._owns_tracing = False
+        self._sample = None  # (bytes in use, snapshot, ms into the request)
+        self._running = False
+
+    def start(self):
+        if not _active.acquire(blocking=False):
+            return False
+        self._running = True
+        self._owns_tracing = not tracemalloc.is_tracing()
+        self._start_snapshot = None
+        if self._owns_tracing:
+            tracemalloc.start()
+        else:
+            # Already tracing (e.g. PYTHONTRACEMALLOC): report growth since now
+            tracemalloc.reset_peak()
+            self._start_snapshot = tracemalloc.take_snapshot()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return True
+
+    def query_finished(self, entry):
+        """db.observe_queries callback: log the query, sample memory"""
+        with self._lock:
+            if self._running:
+                self.queries.append(entry)
+        self.sample_memory()
+
+    def sample_memory(self):
+        """Keep an allocation snapshot if more memory is in use than at any earlier sample"""
+        with self._lock:
+            if not self._running:
+                return
+            current = tracemalloc.get_traced_memory()[0]
+            if self._sample is not None and current <= self._sample[0]:
+                return
+            snapshot = tracemalloc.take_snapshot()
+            self._sample = (current, snapshot, _ms(time.perf_counter() - self._started))
+
+    def stop(self):
+        with self._lock:
+            if not self._running:
+                return
+            self._profiler.disable()
+            self._elapsed = time.perf_counter() - self._started
+            self._peak = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracing:
+                tracemalloc.stop()
+            self._running = False
+        _active.release()
+
+    def _functions(self):
+        stats = pstats.Stats(self._profiler)
+        entries = []
+        for (filename, line, function), (primitive, calls, own, cumulative, _) in stats.stats.items():
+            if filename in _OWN_FILES:
+                continue
+            entries.append({
+                'function': function,
+                'file': _short_path(filename),
+                'line': line,
+                'calls': calls,
+                'primitiveCalls': primitive,
+                'ownMs': _ms(own),
+                'cumulativeMs': _ms(cumulative),
+            })
+        entries.sort(key=lambda entry: entry['cumulativeMs'], reverse=True)
+        return entries[:self.top]
+
+    def _memory(self):
+        memory = {
+            'peakBytes': max(self._peak - self._baseline, 0),
+            'sampledAtMs': None,
+            'sampledBytes': None,
+            'topLines': [],
+        }
+        if self._sample is None:
+            return memory
+        current, snapshot, at_ms = self._sample
+        filters = (
+            [tracemalloc.Filter(False, filename) for filename in _OWN_FILES]
+            + [tracemalloc.Filter(False, '<frozen *>')]
+        )
+        snapshot = snapshot.filter_traces(filters)
+        if self._start_snapshot is None:
+            lines = [(stat, stat.size, stat.count) for stat in snapshot.statistics('lineno')]
+        else:
+            growth = snapshot.compare_to(self._start_snapshot.filter_traces(filters), 'lineno')
+            lines = [(stat, stat.size_diff, stat.count_diff) for stat in growth if stat.size_diff > 0]
+        memory['sampledAtMs'] = at_ms
+        memory['sampledBytes'] = max(current - self._baseline, 0)
+        for stat, size, count in lines[:self.top]:
+            frame = stat.traceback[0]
+            memory['topLines'].append({
+                'file': _short_path(frame.filename),
+                'line': frame.lineno,
+                'bytes': size,
+                'blocks': count,
+            })
+        return memory
+
+    def _queries(self):
+        items = []
+        for entry in self.queries:
+            items.append({
+                'query': entry['query'],
+                'kind': entry['kind'],
+                'source': entry['source'],
+                'sql': ' '.join(entry['sql'].split()),
+                'startedAtMs': _ms(entry['started'] - self._started),
+                'ms': _ms(entry['seconds']),
+                'acquireMs': _ms(entry['acquireSeconds']),
+                'executeMs': _ms(entry['executeSeconds']),
+                'fetchMs': _ms(entry['fetchSeconds']),
+                'rows': entry['rows'],
+                'error': entry['error'],
+            })
+        items.sort(key=lambda item: item['startedAtMs'])
+        return {
+            'count': len(items),
+            'totalMs': round(sum(item['ms'] for item in items), 3),
+            'items': items,
+        }
+
+    def report(self, request_info, response_info):
+        """The profile as a JSON-ready dict (call after stop)"""
+        return {
+            'request': request_info,
+            'response': response_info,
+            'totalMs': _ms(self._elapsed),
+            'queries': self._queries(),
+            'functions': self._functions(),
+            'memory': self._memory(),
+        }
+
+    def save(self, report, directory=None):
+        """Write <name>.json and <name>.prof to directory; return the JSON path"""
+        directory = directory or PROFILE_CONFIG['dir']
+        os.makedirs(directory, exist_ok=True)
+        request_info = report['request']
+        route = re.sub(r'[^A-Za-z0-9]+', '-', request_info['route']).strip('-') or 'root'
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        base = os.path.join(directory, f"{stamp}-{request_info['method'].lower()}-{route}")
+        with open(base + '.json', 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        self._profiler.dump_stats(base + '.prof')
+        return base + '.json'
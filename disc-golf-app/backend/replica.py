@@ -0,0 +1,545 @@
+"""
+Local read replica of the PuttingLeague database
+
+Mirrors the tables the read-only routes and stats views use into a SQLite
+file on local disk, so GET requests run their queries without a round trip
+to Azure SQL. The same T-SQL is sent to the replica; sqlite_compat
+translates it and the views are recreated locally from the view scripts.
+RoundTotals is rebuilt locally from the mirrored Score rows.
+
+Startup loads a snapshot of every table. A background thread then syncs
+every sync_interval seconds, and as soon as this process commits a write:
+
+    * nothing more, when the primary's change tracking version has not
+      moved since the last sync
+    * rows inserted, updated or deleted in Player, Event, Scorecard and
+      Score, read from CHANGETABLE by ID
+    * members of the most recent scorecards (cards being filled in)
+    * every reload_interval seconds: the layout tables, reloaded, and a
+      fingerprint (row count and key checksum) per table; a table whose
+      fingerprint still differs is repaired by diffing IDs, or reloaded
+      when it has no single ID column
+
+GET requests that query the database read from the replica only while its
+last sync started less than max_staleness seconds ago and after this
+process's last committed write; otherwise they go to the primary. They
+never wait for a sync.
+
+The primary needs change tracking on the ID tables (see
+migrations/create_replica_indexes.sql); without it the replica never
+becomes ready and every read goes to the primary.
+
+Configured with environment variables (see REPLICA_CONFIG); the replica is
+off unless READ_REPLICA_PATH is set. Put the file on tmpfs (e.g. /dev/shm)
+for a memory-backed replica.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import pyodbc
+
+from db import ConnectionPool, get_connection
+from sqlite_compat import SQLiteDatabase, create_views
+
+REPLICA_CONFIG = {
+    # SQLite file the replica is built in (recreated at startup)
+    'path': os.environ.get('READ_REPLICA_PATH'),
+    # Seconds between background syncs
+    'sync_interval': float(os.environ.get('READ_REPLICA_SYNC_INTERVAL', 2)),
+    # Reads go to the primary when the replica's last sync is older than this
+    'max_staleness': float(os.environ.get('READ_REPLICA_MAX_STALENESS', 10)),
+    # Seconds between reloads of the layout tables and fingerprint checks of
+    # every table (both read whole tables on the primary)
+    'reload_interval': float(os.environ.get('READ_REPLICA_RELOAD_INTERVAL', 900)),
+    'pool_size': int(os.environ.get('READ_REPLICA_POOL_SIZE', 8)),
+}
+
+# Mirrored tables, in load order, with the columns their fingerprint sums.
+# The first key of an ID table is its single-column primary key; ID tables
+# are synced from change tracking.
+MIRRORED_TABLES = {
+    'Player': ('PlayerID',),
+    'Event': ('EventID',),
+    'Scorecard': ('ScorecardID',),
+    'ScorecardMember': ('ScorecardID', 'PlayerID', 'MemberPosition'),
+    'Score': ('ScoreID', 'Strokes'),
+    'EventLayout': ('LayoutID', 'HoleNumber'),
+    'Basket': ('BasketID',),
+    'LayoutBasket': ('LayoutID', 'HoleNumber', 'BasketID'),
+    'Obstacle': ('ObstacleID',),
+    'LayoutObstacle': ('LayoutID', 'HoleNumber', 'ObstacleID'),
+}
+ID_TABLES = ('Player', 'Event', 'Scorecard', 'Score')
+LAYOUT_TABLES = ('EventLayout', 'Basket', 'LayoutBasket', 'Obstacle', 'LayoutObstacle')
+
+# Members of this many of the newest scorecards are re-fetched every sync
+RECENT_SCORECARDS = 500
+
+# Rows per fetchmany() when copying from the primary
+COPY_BATCH_ROWS = 5000
+
+# SQLite declared types for the Python types pyodbc reports (TIMESTAMP and
+# DATE round-trip through sqlite_compat's converters)
+SQLITE_TYPES = (
+    (bool, 'INTEGER'), (int, 'INTEGER'), (float, 'REAL'), (Decimal, 'REAL'),
+    (datetime, 'TIMESTAMP'), (date, 'DATE'), (str, 'TEXT'), ((bytes, bytearray), 'BLOB'),
+)
+
+REPLICA_SCHEMA = """
+CREATE TABLE RoundTotals (
+    ScorecardID INTEGER NOT NULL,
+    PlayerID INTEGER NOT NULL,
+    EventID INTEGER NOT NULL,
+    RoundTotal INTEGER NOT NULL,
+    HolesPlayed INTEGER NOT NULL,
+    UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (ScorecardID, PlayerID)
+);
+CREATE TEMP TABLE IF NOT EXISTS TouchedScorecards (ScorecardID INTEGER PRIMARY KEY);
+CREATE TEMP TABLE IF NOT EXISTS PrimaryIDs (ID INTEGER PRIMARY KEY);
+"""
+
+REPLICA_INDEXES = """
+CREATE INDEX IF NOT EXISTS IX_Score_Scorecard ON Score (ScorecardID, HoleNumber);
+CREATE INDEX IF NOT EXISTS IX_Score_Player ON Score (PlayerID);
+CREATE INDEX IF NOT EXISTS IX_Scorecard_Event ON Scorecard (EventID);
+CREATE INDEX IF NOT EXISTS IX_ScorecardMember_Scorecard ON ScorecardMember (ScorecardID, MemberPosition);
+CREATE INDEX IF NOT EXISTS IX_ScorecardMember_Player ON ScorecardMember (PlayerID);
+CREATE INDEX IF NOT EXISTS IX_EventLayout ON EventLayout (LayoutID, HoleNumber);
+CREATE INDEX IF NOT EXISTS IX_LayoutBasket ON LayoutBasket (LayoutID, HoleNumber);
+CREATE INDEX IF NOT EXISTS IX_LayoutObstacle ON LayoutObstacle (LayoutID, HoleNumber);
+CREATE INDEX IF NOT EXISTS IX_RoundTotals_Event ON RoundTotals (EventID);
+CREATE INDEX IF NOT EXISTS IX_RoundTotals_Player ON RoundTotals (PlayerID, RoundTotal DESC, ScorecardID DESC);
+CREATE INDEX IF NOT EXISTS IX_Scorecard_CreatedAt ON Scorecard (CreatedAt DESC, ScorecardID DESC);
+CREATE INDEX IF NOT EXISTS IX_Event_EventDate ON Event (EventDate DESC, EventID DESC);
+CREATE INDEX IF NOT EXISTS IX_Player_Name ON Player (LastName, FirstName, PlayerID);
+"""
+
+REBUILD_ROUND_TOTALS_SQL = """
+    INSERT INTO RoundTotals (ScorecardID, PlayerID, EventID, RoundTotal, HolesPlayed)
+    SELECT s.ScorecardID, s.PlayerID, sc.EventID, SUM(s.Strokes), COUNT(s.HoleNumber)
+    FROM Score s
+    JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+    {where}
+    GROUP BY s.ScorecardID, s.PlayerID, sc.EventID
+"""
+
+CHANGE_TRACKING_MISSING = (
+    "Change tracking is not enabled on the primary; run migrations/create_replica_indexes.sql"
+)
+
+def fingerprint_sql(integer_type):
+    """One row per mirrored table: TableName, RowCount, KeySum
+
+    Written once for both engines; integer_type is BIGINT for SQL Server
+    (INT sums overflow) and INTEGER for SQLite.
+    """
+    selects = []
+    for table, keys in MIRRORED_TABLES.items():
+        checksum = ' + '.join(
+            f"CAST({key} AS {integer_type}) * {31 ** n}" for n, key in enumerate(keys)
+        )
+        selects.append(
+            f"SELECT '{table}' AS TableName, COUNT(*) AS RowCount, SUM({checksum}) AS KeySum FROM {table}"
+        )
+    return '\nUNION ALL\n'.join(selects)
+
+PRIMARY_FINGERPRINT_SQL = fingerprint_sql('BIGINT')
+LOCAL_FINGERPRINT_SQL = fingerprint_sql('INTEGER')
+
+# ============================================
+# REPLICA
+# ============================================
+
+class ReadReplica:
+    """SQLite mirror of the primary, kept in sync by a background thread
+
+    The sync thread talks to the primary on its own connection (opened with
+    connect, db.get_connection by default) in SNAPSHOT isolation, so every
+    sync sees one consistent state, and writes the replica file on its own
+    sqlite3 connection. Reads borrow from self.pool, a db.ConnectionPool of
+    sqlite_compat connections; WAL mode keeps them from blocking on a sync.
+    """
+
+    def __init__(self, path, sync_interval=2, max_staleness=10,
+                 reload_interval=900, pool_size=8, connect=get_connection):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.reload_interval = reload_interval
+        self._connect = connect
+        self.pool = ConnectionPool(SQLiteDatabase(path).connect, min_size=0, max_size=pool_size,
+                                   ping_after_idle=float('inf'))
+
+        self._primary = None
+        self._local = None
+        self._watermarks = {}
+        self._version = None  # primary change tracking version last synced
+        self._reloaded_at = 0.0
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.ready = False
+        # monotonic times: start of the last successful sync, last local write
+        self._synced_at = None
+        self._changed_at = 0.0
+
+        # Counters reported by stats()
+        self._syncs = 0
+        self._failures = 0
+        self._repairs = 0
+        self._fallbacks = 0
+        self._last_error = None
+        self._last_sync_seconds = None
+
+    # ------------------------------------------
+    # Serving reads
+    # ------------------------------------------
+
+    def start(self):
+        """Start the snapshot and sync thread (once)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='read-replica', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def mark_changed(self):
+        """Record a committed write: reads go to the primary until a sync has seen it"""
+        self._changed_at = time.monotonic()
+        self._wake.set()
+
+    def is_fresh(self):
+        synced_at = self._synced_at
+        return (self.ready and synced_at is not None and synced_at > self._changed_at
+                and time.monotonic() - synced_at <= self.max_staleness)
+
+    def pool_for_read(self):
+        """The replica's pool if it is fresh enough to read from, else None
+
+        Never syncs on the caller's thread: a stale replica sends the read
+        to the primary while the sync thread catches up.
+        """
+        self.start()
+        if self.is_fresh():
+            return self.pool
+        with self._lock:
+            self._fallbacks += 1
+        return None
+
+    def stats(self):
+        """Snapshot of replica state and counters"""
+        synced_at = self._synced_at
+        return {
+            "ready": self.ready,
+            "fresh": self.is_fresh(),
+            "lastSyncAgeSeconds": None if synced_at is None else round(time.monotonic() - synced_at, 2),
+            "lastSyncSeconds": self._last_sync_seconds,
+            "maxStalenessSeconds": self.max_staleness,
+            "syncs": self._syncs,
+            "failures": self._failures,
+            "repairs": self._repairs,
+            "fallbacks": self._fallbacks,
+            "lastError": self._last_error,
+            "pool": self.pool.stats(),
+        }
+
+    # ------------------------------------------
+    # Sync thread
+    # ------------------------------------------
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with self._sync_lock:
+                    if self.ready:
+                        if not self.is_fresh() or time.monotonic() - self._synced_at >= self.sync_interval:
+                            self._sync_locked()
+                    else:
+                        self._snapshot_locked()
+            except Exception as e:
+                self._record_failure(e)
+            # mark_changed() cuts the wait short
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+
+    def _record_failure(self, error):
+        print(f"[REPLICA] Sync failed: {error}")
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error)
+        # Start over on a new connection (and a new snapshot transaction)
+        self._close_primary()
+
+    def _primary_cursor(self):
+        if self._primary is None:
+            self._primary = self._connect()
+            cursor = self._primary.cursor()
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+            cursor.close()
+        return self._primary.cursor()
+
+    def _close_primary(self):
+        primary, self._primary = self._primary, None
+        if primary is not None:
+            try:
+                primary.close()
+            except pyodbc.Error:
+                pass
+
+    def _snapshot_locked(self):
+        """Build the replica file from a full copy of every mirrored table"""
+        started = time.monotonic()
+        print(f"[REPLICA] Loading snapshot into {self.path}")
+        self.pool.close_all()
+        if self._local is not None:
+            self._local.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+        local = sqlite3.connect(self.path, check_same_thread=False,
+                                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        local.execute("PRAGMA journal_mode = WAL")
+        # A lost replica is rebuilt from the primary, so skip fsyncs
+        local.execute("PRAGMA synchronous = OFF")
+        self._local = local
+        cursor = self._primary_cursor()
+        try:
+            version = self._current_version(cursor)
+            with local:
+                for table in MIRRORED_TABLES:
+                    cursor.execute(f"SELECT * FROM {table}")
+                    self._copy_rows(table, cursor, create=True)
+                local.executescript(REPLICA_SCHEMA)
+                local.execute(REBUILD_ROUND_TOTALS_SQL.format(where=''))
+                local.executescript(REPLICA_INDEXES)
+                create_views(local)
+            self._primary.rollback()
+        finally:
+            cursor.close()
+        local.execute("ANALYZE")
+        self._update_watermarks()
+        self._version = version
+        self._reloaded_at = started
+        self._finish_sync(started)
+        self.ready = True
+        print(f"[REPLICA] Snapshot loaded in {time.monotonic() - started:.1f}s")
+
+    def _sync_locked(self):
+        """Apply changes made on the primary since the last sync"""
+        started = time.monotonic()
+        local = self._local
+        verify = started - self._reloaded_at >= self.reload_interval
+
+        cursor = self._primary_cursor()
+        try:
+            version = self._current_version(cursor)
+            if version == self._version and not verify:
+                # Nothing committed on the primary since the last sync
+                self._primary.rollback()
+                self._finish_sync(started)
+                return
+            with local:
+                touched = []
+                full_rebuild = False
+                for table in ID_TABLES:
+                    changed = self._apply_changes(cursor, table)
+                    if changed is None:
+                        full_rebuild = True
+                    elif table == 'Score':
+                        touched.extend(changed)
+                self._update_watermarks()
+                recent_scorecard = max(self._watermarks['Scorecard'] - RECENT_SCORECARDS, 0)
+                cursor.execute("SELECT * FROM ScorecardMember WHERE ScorecardID > ?", recent_scorecard)
+                local.execute("DELETE FROM ScorecardMember WHERE ScorecardID > ?", (recent_scorecard,))
+                self._copy_rows('ScorecardMember', cursor)
+
+                if verify:
+                    for table in LAYOUT_TABLES:
+                        self._reload(cursor, table)
+                    full_rebuild = self._repair(cursor) or full_rebuild
+
+                if full_rebuild:
+                    local.execute("DELETE FROM RoundTotals")
+                    local.execute(REBUILD_ROUND_TOTALS_SQL.format(where=''))
+                elif touched:
+                    self._rebuild_round_totals(touched)
+            self._primary.rollback()
+        finally:
+            cursor.close()
+        self._version = version
+        if verify:
+            self._reloaded_at = started
+        self._finish_sync(started)
+
+    def _current_version(self, cursor):
+        cursor.execute("SELECT CHANGE_TRACKING_CURRENT_VERSION()")
+        version = cursor.fetchone()[0]
+        if version is None:
+            raise RuntimeError(CHANGE_TRACKING_MISSING)
+        return version
+
+    def _apply_changes(self, cursor, table):
+        """Copy an ID table's rows changed since the last sync
+
+        Returns the ScorecardIDs of changed Score rows (old and new), or None
+        when the changes are no longer tracked and the table was reloaded.
+        """
+        key = MIRRORED_TABLES[table][0]
+        local = self._local
+        cursor.execute("SELECT CHANGE_TRACKING_MIN_VALID_VERSION(OBJECT_ID(?))", f"dbo.{table}")
+        min_valid = cursor.fetchone()[0]
+        if min_valid is None:
+            raise RuntimeError(CHANGE_TRACKING_MISSING)
+        if min_valid > self._version:
+            print(f"[REPLICA] {table} changes older than version {min_valid} were cleaned up; reloading")
+            self._reload(cursor, table)
+            return None
+
+        cursor.execute(f"SELECT ct.{key} FROM CHANGETABLE(CHANGES {table}, ?) AS ct", self._version)
+        keys = cursor.fetchall()
+        if not keys:
+            return []
+        local.execute("DELETE FROM temp.PrimaryIDs")
+        local.executemany("INSERT INTO temp.PrimaryIDs VALUES (?)", (tuple(row) for row in keys))
+        touched = []
+        if table == 'Score':
+            touched = [row[0] for row in local.execute(
+                "SELECT ScorecardID FROM Score WHERE ScoreID IN (SELECT ID FROM temp.PrimaryIDs)"
+            )]
+        # Deleted rows stay gone; inserted and updated rows are copied again
+        local.execute(f"DELETE FROM {table} WHERE {key} IN (SELECT ID FROM temp.PrimaryIDs)")
+        cursor.execute(
+            f"SELECT t.* FROM CHANGETABLE(CHANGES {table}, ?) AS ct JOIN {table} AS t ON t.{key} = ct.{key}",
+            self._version
+        )
+        touched.extend(self._copy_rows(table, cursor, touched_column='ScorecardID' if table == 'Score' else None))
+        return touched
+
+    def _repair(self, cursor):
+        """Compare every table's fingerprint with the primary's and repair differences
+
+        Returns True if anything was repaired.
+        """
+        cursor.execute(PRIMARY_FINGERPRINT_SQL)
+        primary_fingerprints = {row[0]: (row[1], row[2] or 0) for row in cursor.fetchall()}
+        local_fingerprints = self._local_fingerprints()
+        repaired = False
+        for table, fingerprint in primary_fingerprints.items():
+            if local_fingerprints.get(table) == fingerprint:
+                continue
+            print(f"[REPLICA] {table} differs from the primary "
+                  f"({local_fingerprints.get(table)} != {fingerprint}); repairing")
+            self._repairs += 1
+            repaired = True
+            if table in ID_TABLES:
+                self._repair_ids(cursor, table)
+            if table not in ID_TABLES or self._local_fingerprints()[table] != fingerprint:
+                self._reload(cursor, table)
+        return repaired
+
+    def _finish_sync(self, started):
+        with self._lock:
+            self._synced_at = started
+            self._syncs += 1
+            self._last_sync_seconds = round(time.monotonic() - started, 3)
+            self._last_error = None
+
+    # ------------------------------------------
+    # Local writes
+    # ------------------------------------------
+
+    def _create_table(self, table, description, rows):
+        """CREATE TABLE matching the primary's columns
+
+        Types come from the cursor description, or from the first non-NULL
+        value when the driver reports none.
+        """
+        first = MIRRORED_TABLES[table][0]
+        columns = []
+        for index, (name, type_code, *_) in enumerate(description):
+            if not isinstance(type_code, type):
+                type_code = next((type(row[index]) for row in rows if row[index] is not None), type(None))
+            sqlite_type = next((sqlite for python_type, sqlite in SQLITE_TYPES
+                                if issubclass(type_code, python_type)), '')
+            primary_key = ' PRIMARY KEY' if table in ID_TABLES and name == first else ''
+            columns.append(f'"{name}" {sqlite_type}{primary_key}'.rstrip())
+        self._local.execute(f"CREATE TABLE {table} ({', '.join(columns)})")
+
+    def _copy_rows(self, table, cursor, replace=False, create=False, touched_column=None):
+        """Insert every row left on the cursor; returns touched_column's values
+
+        create=True first creates the table from the cursor's columns.
+        """
+        description = cursor.description
+        verb = 'INSERT OR REPLACE' if replace else 'INSERT'
+        sql = f"{verb} INTO {table} VALUES ({', '.join('?' * len(description))})"
+        touched_index = ([column[0] for column in description].index(touched_column)
+                         if touched_column else None)
+        touched = []
+        rows = cursor.fetchmany(COPY_BATCH_ROWS)
+        if create:
+            self._create_table(table, description, rows)
+        while rows:
+            self._local.executemany(sql, rows)
+            if touched_index is not None:
+                touched.extend(row[touched_index] for row in rows)
+            rows = cursor.fetchmany(COPY_BATCH_ROWS)
+        return touched
+
+    def _reload(self, cursor, table):
+        cursor.execute(f"SELECT * FROM {table}")
+        self._local.execute(f"DELETE FROM {table}")
+        self._copy_rows(table, cursor)
+
+    def _repair_ids(self, cursor, table):
+        """Delete rows gone from the primary and fetch rows the replica missed"""
+        key = MIRRORED_TABLES[table][0]
+        local = self._local
+        local.execute("DELETE FROM temp.PrimaryIDs")
+        cursor.execute(f"SELECT {key} FROM {table}")
+        while True:
+            rows = cursor.fetchmany(COPY_BATCH_ROWS * 10)
+            if not rows:
+                break
+            local.executemany("INSERT INTO temp.PrimaryIDs VALUES (?)", rows)
+        local.execute(f"DELETE FROM {table} WHERE {key} NOT IN (SELECT ID FROM temp.PrimaryIDs)")
+        missing = [row[0] for row in local.execute(
+            f"SELECT ID FROM temp.PrimaryIDs WHERE ID NOT IN (SELECT {key} FROM {table})"
+        )]
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            cursor.execute(f"SELECT * FROM {table} WHERE {key} IN ({', '.join('?' * len(chunk))})", chunk)
+            self._copy_rows(table, cursor, replace=True)
+
+    def _rebuild_round_totals(self, scorecard_ids):
+        local = self._local
+        local.execute("DELETE FROM temp.TouchedScorecards")
+        local.executemany("INSERT OR IGNORE INTO temp.TouchedScorecards VALUES (?)",
+                          ((scorecard_id,) for scorecard_id in scorecard_ids))
+        where = "WHERE s.ScorecardID IN (SELECT ScorecardID FROM temp.TouchedScorecards)"
+        local.execute("DELETE FROM RoundTotals WHERE ScorecardID IN "
+                      "(SELECT ScorecardID FROM temp.TouchedScorecards)")
+        local.execute(REBUILD_ROUND_TOTALS_SQL.format(where=where))
+
+    def _local_fingerprints(self):
+        return {row[0]: (row[1], row[2] or 0) for row in self._local.execute(LOCAL_FINGERPRINT_SQL)}
+
+    def _update_watermarks(self):
+        local = self._local
+        for table in ID_TABLES:
+            key = MIRRORED_TABLES[table][0]
+            self._watermarks[table] = local.execute(f"SELECT COALESCE(MAX({key}), 0) FROM {table}").fetchone()[0]
+
+read_replica = ReadReplica(**REPLICA_CONFIG) if REPLICA_CONFIG['path'] else None
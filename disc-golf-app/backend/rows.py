@@ -0,0 +1,170 @@
+"""
+Lightweight query result rows
+
+The db helpers return Rows: the pyodbc row tuples plus one shared column
+list, instead of building a dict for every row. Indexing or iterating gives
+Record objects that read like dicts (row['PlayerID'], row.get(...),
+dict(row)) but only point at the underlying tuple.
+
+encode_rows() serializes Rows straight from the tuples, column by column,
+producing the same JSON text as json.dumps() on the equivalent dicts.
+"""
+import json
+import math
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+
+class Rows(Sequence):
+    """Result set: column names once, rows as the raw tuples"""
+    __slots__ = ('columns', 'raw', '_index')
+
+    def __init__(self, columns, raw, index=None):
+        self.columns = tuple(columns)
+        self.raw = raw
+        self._index = index if index is not None else {name: i for i, name in enumerate(self.columns)}
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Rows(self.columns, self.raw[i], self._index)
+        return Record(self._index, self.raw[i])
+
+    def __iter__(self):
+        index = self._index
+        for row in self.raw:
+            yield Record(index, row)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"Rows({self.to_dicts()!r})"
+
+    def to_dicts(self):
+        return [dict(zip(self.columns, row)) for row in self.raw]
+
+    def columnar(self):
+        """{columns, rows} with each row as a list of values"""
+        return {"columns": list(self.columns), "rows": [list(row) for row in self.raw]}
+
+class Record(Mapping):
+    """One row of a Rows, readable like a dict
+
+    Setting a key stores it on this Record only (a later rows[i] returns a
+    fresh Record without it); use dict(record) for an independent copy.
+    """
+    __slots__ = ('_index', '_row', '_extra')
+
+    def __init__(self, index, row):
+        self._index = index
+        self._row = row
+        self._extra = None
+
+    def __getitem__(self, key):
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        return self._row[self._index[key]]
+
+    def __setitem__(self, key, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __iter__(self):
+        yield from self._index
+        if self._extra:
+            for key in self._extra:
+                if key not in self._index:
+                    yield key
+
+    def __len__(self):
+        if not self._extra:
+            return len(self._index)
+        return len(self._index) + sum(1 for key in self._extra if key not in self._index)
+
+    def __contains__(self, key):
+        return key in self._index or (self._extra is not None and key in self._extra)
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+# ============================================
+# JSON ENCODING
+# ============================================
+
+ENCODE_CHUNK_ROWS = 1000
+
+def _encode_float(value):
+    # json.dumps spells non-finite floats NaN / Infinity
+    return float.__repr__(value) if math.isfinite(value) else json.dumps(value)
+
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null',
+}
+
+def _encode_column(values, fallback):
+    """JSON text for each value of one column"""
+    types = set(map(type, values))
+    if len(types) == 1:
+        encoder = _ENCODERS.get(next(iter(types)))
+        if encoder is not None:
+            return list(map(encoder, values))
+    # Dates, Decimals and mixed columns: per-value dispatch. Dates repeat
+    # heavily within a result (every round of an event) so their text is
+    # memoized; Decimals are not, since equal values can print differently.
+    memo = {}
+    encoded = []
+    for value in values:
+        kind = type(value)
+        encoder = _ENCODERS.get(kind)
+        if encoder is not None:
+            encoded.append(encoder(value))
+        elif kind is date or kind is datetime:
+            key = (kind, value)
+            text = memo.get(key)
+            if text is None:
+                text = memo[key] = fallback(value)
+            encoded.append(text)
+        else:
+            encoded.append(fallback(value))
+    return encoded
+
+def encode_rows(rows, default, sort_keys=True):
+    """JSON array of objects for a Rows, matching json.dumps on the dicts
+
+    default converts values JSON has no type for (dates, Decimals), as in
+    json.dumps(default=...).
+    """
+    if not rows.raw:
+        return '[]'
+    # The index holds each name once (last occurrence wins, as with dict(zip()))
+    keys = sorted(rows._index.items()) if sort_keys else list(rows._index.items())
+    template = '{' + ', '.join(
+        encode_basestring_ascii(name).replace('%', '%%') + ': %s' for name, _ in keys
+    ) + '}'
+    fallback = lambda value: json.dumps(value, default=default)
+    # Encode a slice of rows at a time so the per-value strings never exist
+    # for the whole result at once
+    parts = []
+    raw = rows.raw
+    for start in range(0, len(raw), ENCODE_CHUNK_ROWS):
+        by_column = list(zip(*raw[start:start + ENCODE_CHUNK_ROWS]))
+        encoded = [_encode_column(by_column[i], fallback) for _, i in keys]
+        parts.append(', '.join([template % values for values in zip(*encoded)]))
+    return '[' + ', '.join(parts) + ']'
+
+def encode_record(record, default, sort_keys=True):
+    """JSON object for a single Record"""
+    return json.dumps(dict(record), default=default, sort_keys=sort_keys)
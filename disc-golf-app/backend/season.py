@@ -0,0 +1,435 @@
+"""
+Synthetic season generator for load and scale testing
+
+Builds whole seasons of players, events, scorecards and hole scores with
+NumPy (one array per column, no per-row Python loops) and bulk-loads them
+into the configured SQL Server database or a local SQLite file.
+
+    python season.py --players 10000 --events 500
+    python season.py --players 10000 --events 500 --sqlite season.db
+
+Scores follow each player's skill division (see DIVISION_STROKE_WEIGHTS),
+so the leaderboard and stats views have realistic spreads. Restart a
+running API after loading into its database: the all-time leaderboard and
+the stats cache are built in memory and do not see rows written here.
+"""
+import argparse
+import os
+import sqlite3
+import time
+from datetime import date
+
+import numpy as np
+
+DIVISIONS = ('Beginner', 'Intermediate', 'Advanced')
+DIVISION_WEIGHTS = (0.35, 0.45, 0.20)
+
+# Probability of a hole score of 0, 1, 2 or 3 made putts for each division
+DIVISION_STROKE_WEIGHTS = {
+    'Beginner': (0.45, 0.40, 0.12, 0.03),
+    'Intermediate': (0.20, 0.40, 0.30, 0.10),
+    'Advanced': (0.05, 0.25, 0.40, 0.30),
+}
+
+FIRST_NAMES = (
+    'Alex', 'Avery', 'Blake', 'Casey', 'Charlie', 'Dakota', 'Drew', 'Eli',
+    'Emerson', 'Finley', 'Harper', 'Hayden', 'Jamie', 'Jesse', 'Jordan', 'Kai',
+    'Kendall', 'Logan', 'Morgan', 'Parker', 'Peyton', 'Quinn', 'Reese', 'Riley',
+    'Rowan', 'Sage', 'Sam', 'Skyler', 'Taylor', 'Tatum',
+)
+LAST_NAMES = (
+    'Anderson', 'Brooks', 'Carter', 'Diaz', 'Ellis', 'Foster', 'Garcia', 'Hayes',
+    'Iverson', 'Jensen', 'Kim', 'Lopez', 'Miller', 'Nguyen', 'Owens', 'Patel',
+    'Quinn', 'Reed', 'Shaw', 'Turner', 'Usher', 'Vance', 'Walsh', 'Young',
+)
+
+MAX_CARD_SIZE = 4
+
+# Rows per executemany() call; keeps the parameter arrays pyodbc builds small
+LOAD_BATCH_ROWS = int(os.environ.get('SEASON_LOAD_BATCH_ROWS', 50000))
+
+TABLE_COLUMNS = {
+    'Player': ('PlayerID', 'FirstName', 'LastName', 'Email', 'SkillDivision', 'DateInserted'),
+    'Event': ('EventID', 'EventDate', 'HoleCount', 'Name'),
+    'Scorecard': ('ScorecardID', 'EventID', 'CreatedByPlayerID', 'CreatedAt'),
+    'ScorecardMember': ('ScorecardID', 'PlayerID', 'MemberPosition'),
+    'Score': ('ScoreID', 'ScorecardID', 'PlayerID', 'HoleNumber', 'Strokes', 'RecordedAt'),
+    'RoundTotals': ('ScorecardID', 'PlayerID', 'EventID', 'RoundTotal', 'HolesPlayed'),
+}
+
+# IDs are reserved from the same sequences the stored procedures draw from
+SEQUENCES = {
+    'Player': 'PlayerID_Seq',
+    'Event': 'Event_Seq',
+    'Scorecard': 'Scorecard_Seq',
+    'Score': 'ScoreID_Seq',
+}
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Player (
+    PlayerID INTEGER PRIMARY KEY,
+    FirstName TEXT NOT NULL,
+    LastName TEXT NOT NULL,
+    Email TEXT NOT NULL UNIQUE,
+    SkillDivision TEXT NOT NULL,
+    DateInserted TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS Event (
+    EventID INTEGER PRIMARY KEY,
+    EventDate TIMESTAMP NOT NULL,
+    HoleCount INTEGER NOT NULL,
+    Name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Scorecard (
+    ScorecardID INTEGER PRIMARY KEY,
+    EventID INTEGER NOT NULL REFERENCES Event (EventID),
+    CreatedByPlayerID INTEGER NOT NULL REFERENCES Player (PlayerID),
+    CreatedAt TIMESTAMP NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ScorecardMember (
+    ScorecardID INTEGER NOT NULL REFERENCES Scorecard (ScorecardID),
+    PlayerID INTEGER NOT NULL REFERENCES Player (PlayerID),
+    MemberPosition INTEGER NOT NULL,
+    PRIMARY KEY (ScorecardID, PlayerID)
+);
+CREATE TABLE IF NOT EXISTS Score (
+    ScoreID INTEGER PRIMARY KEY,
+    ScorecardID INTEGER NOT NULL REFERENCES Scorecard (ScorecardID),
+    PlayerID INTEGER NOT NULL REFERENCES Player (PlayerID),
+    HoleNumber INTEGER NOT NULL,
+    Strokes INTEGER NOT NULL,
+    RecordedAt TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS RoundTotals (
+    ScorecardID INTEGER NOT NULL,
+    PlayerID INTEGER NOT NULL,
+    EventID INTEGER NOT NULL,
+    RoundTotal INTEGER NOT NULL,
+    HolesPlayed INTEGER NOT NULL,
+    UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (ScorecardID, PlayerID)
+);
+"""
+
+# Created after the rows are in; maintaining them row by row doubles load time
+SQLITE_INDEXES = """
+CREATE INDEX IF NOT EXISTS IX_Score_Scorecard ON Score (ScorecardID, HoleNumber);
+CREATE INDEX IF NOT EXISTS IX_Score_Player ON Score (PlayerID);
+CREATE INDEX IF NOT EXISTS IX_Scorecard_Event ON Scorecard (EventID);
+CREATE INDEX IF NOT EXISTS IX_RoundTotals_Event ON RoundTotals (EventID);
+CREATE INDEX IF NOT EXISTS IX_RoundTotals_Player ON RoundTotals (PlayerID, RoundTotal DESC, ScorecardID DESC);
+CREATE INDEX IF NOT EXISTS IX_Scorecard_CreatedAt ON Scorecard (CreatedAt DESC, ScorecardID DESC);
+CREATE INDEX IF NOT EXISTS IX_Event_EventDate ON Event (EventDate DESC, EventID DESC);
+CREATE INDEX IF NOT EXISTS IX_Player_Name ON Player (LastName, FirstName, PlayerID);
+CREATE INDEX IF NOT EXISTS IX_ScorecardMember_Player ON ScorecardMember (PlayerID, ScorecardID);
+"""
+
+# ============================================
+# GENERATION
+# ============================================
+
+def generate_season(players=10000, events=500, players_per_event=120, holes=9,
+                    start_date=None, season_days=365, seed=None):
+    """Generate one season as {table: {column: numpy array}}
+
+    IDs start at 1 in every table (see shift_ids). Event attendance is
+    Poisson around players_per_event; each event's field is split into
+    cards of 2-4 players in random order.
+    """
+    if players < 2:
+        raise ValueError("players must be at least 2")
+    if not 1 <= holes <= 9:
+        raise ValueError("holes must be between 1 and 9")
+    rng = np.random.default_rng(seed)
+    start = np.datetime64(start_date or date(date.today().year, 1, 1), 'D')
+
+    # Players
+    player_ids = np.arange(1, players + 1, dtype=np.int64)
+    division_index = rng.choice(len(DIVISIONS), size=players, p=DIVISION_WEIGHTS)
+    first_names = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), players)]
+    last_names = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), players)]
+    emails = _emails(player_ids)
+    joined = start - rng.integers(1, 365, players).astype('timedelta64[D]')
+
+    # Events: evening rounds spread over the season
+    event_ids = np.arange(1, events + 1, dtype=np.int64)
+    event_days = np.sort(rng.integers(0, season_days, events)).astype('timedelta64[D]')
+    event_dates = (start + event_days).astype('datetime64[m]') + np.timedelta64(18 * 60, 'm')
+    event_names = np.array([f"Season Week {i + 1}" for i in range(events)], dtype=object)
+
+    # Attendance and card assignment: per event, a shuffled sample of the
+    # player pool split round-robin into ceil(n / 4) cards
+    field_sizes = np.clip(rng.poisson(players_per_event, events), 2, players)
+    member_event, member_player, member_card, member_position = [], [], [], []
+    cards_so_far = 0
+    for event_index, size in enumerate(field_sizes.tolist()):
+        field = rng.choice(players, size=size, replace=False)
+        card_count = -(-size // MAX_CARD_SIZE)
+        slot = np.arange(size)
+        member_event.append(np.full(size, event_index))
+        member_player.append(field)
+        member_card.append(cards_so_far + slot % card_count)
+        member_position.append(slot // card_count + 1)
+        cards_so_far += card_count
+    member_event = np.concatenate(member_event)
+    member_player = np.concatenate(member_player)
+    member_card = np.concatenate(member_card)
+    member_position = np.concatenate(member_position)
+
+    # Scorecards: created by the player in position 1, shortly before the round
+    card_ids = np.arange(1, cards_so_far + 1, dtype=np.int64)
+    creator_rows = member_position == 1
+    card_event = np.empty(cards_so_far, dtype=np.int64)
+    card_creator = np.empty(cards_so_far, dtype=np.int64)
+    card_event[member_card[creator_rows]] = member_event[creator_rows]
+    card_creator[member_card[creator_rows]] = member_player[creator_rows]
+    card_created = event_dates[card_event] + rng.integers(0, 30, cards_so_far).astype('timedelta64[m]')
+
+    # Hole scores: one per member per hole, drawn from the division's weights
+    member_count = len(member_player)
+    score_member = np.repeat(np.arange(member_count), holes)
+    hole_numbers = np.tile(np.arange(1, holes + 1), member_count)
+    cumulative = np.cumsum([DIVISION_STROKE_WEIGHTS[d] for d in DIVISIONS], axis=1)
+    score_division = division_index[member_player[score_member]]
+    draws = rng.random(len(score_member))
+    strokes = (draws[:, None] > cumulative[score_division, :-1]).sum(axis=1)
+    recorded_at = card_created[member_card[score_member]] + (hole_numbers * 4).astype('timedelta64[m]')
+    score_ids = np.arange(1, len(score_member) + 1, dtype=np.int64)
+    round_totals = np.bincount(score_member, weights=strokes, minlength=member_count).astype(np.int64)
+
+    return {
+        'Player': {
+            'PlayerID': player_ids,
+            'FirstName': first_names,
+            'LastName': last_names,
+            'Email': emails,
+            'SkillDivision': np.array(DIVISIONS, dtype=object)[division_index],
+            'DateInserted': joined.astype('datetime64[m]'),
+        },
+        'Event': {
+            'EventID': event_ids,
+            'EventDate': event_dates,
+            'HoleCount': np.full(events, holes),
+            'Name': event_names,
+        },
+        'Scorecard': {
+            'ScorecardID': card_ids,
+            'EventID': event_ids[card_event],
+            'CreatedByPlayerID': player_ids[card_creator],
+            'CreatedAt': card_created,
+        },
+        'ScorecardMember': {
+            'ScorecardID': card_ids[member_card],
+            'PlayerID': player_ids[member_player],
+            'MemberPosition': member_position,
+        },
+        'Score': {
+            'ScoreID': score_ids,
+            'ScorecardID': card_ids[member_card[score_member]],
+            'PlayerID': player_ids[member_player[score_member]],
+            'HoleNumber': hole_numbers,
+            'Strokes': strokes,
+            'RecordedAt': recorded_at,
+        },
+        'RoundTotals': {
+            'ScorecardID': card_ids[member_card],
+            'PlayerID': player_ids[member_player],
+            'EventID': event_ids[member_event],
+            'RoundTotal': round_totals,
+            'HolesPlayed': np.full(member_count, holes),
+        },
+    }
+
+# Which table's ID sequence each ID column draws from
+ID_COLUMNS = {
+    'PlayerID': 'Player',
+    'CreatedByPlayerID': 'Player',
+    'EventID': 'Event',
+    'ScorecardID': 'Scorecard',
+    'ScoreID': 'Score',
+}
+
+def _emails(player_ids):
+    return np.array([f"player{pid}@season.example" for pid in player_ids.tolist()], dtype=object)
+
+def shift_ids(season, first_ids):
+    """Move every ID column so each table's IDs start at first_ids[table]"""
+    for columns in season.values():
+        for name, owner in ID_COLUMNS.items():
+            if name in columns:
+                columns[name] = columns[name] + (first_ids.get(owner, 1) - 1)
+    # Emails are unique, so they follow the player IDs
+    season['Player']['Email'] = _emails(season['Player']['PlayerID'])
+    return season
+
+def table_rows(season, table, start=0, stop=None, datetimes_as_text=False):
+    """Parameter tuples for rows [start, stop) of one generated table
+
+    Integer columns become plain ints and datetime columns datetime.datetime,
+    which is what pyodbc binds. With datetimes_as_text they are
+    'YYYY-MM-DD HH:MM:SS' strings instead (what sqlite3 stores for a
+    datetime, without converting each value in Python).
+    """
+    columns = []
+    for name in TABLE_COLUMNS[table]:
+        values = season[table][name][start:stop]
+        if np.issubdtype(values.dtype, np.datetime64):
+            if datetimes_as_text:
+                columns.append([text.replace('T', ' ') for text in np.datetime_as_string(values, unit='s').tolist()])
+                continue
+            values = values.astype('datetime64[us]')
+        columns.append(values.tolist())
+    return list(zip(*columns))
+
+def row_count(season, table):
+    return len(season[table][TABLE_COLUMNS[table][0]])
+
+def _load_table(season, table, insert_many, datetimes_as_text=False):
+    """Insert one table in LOAD_BATCH_ROWS slices through insert_many(sql, rows)"""
+    columns = TABLE_COLUMNS[table]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    total = row_count(season, table)
+    for start in range(0, total, LOAD_BATCH_ROWS):
+        insert_many(sql, table_rows(season, table, start, start + LOAD_BATCH_ROWS, datetimes_as_text))
+    return total
+
+# ============================================
+# LOADING
+# ============================================
+
+LOAD_ORDER = ('Player', 'Event', 'Scorecard', 'ScorecardMember', 'Score', 'RoundTotals')
+
+def reserve_ids(counts):
+    """First ID of a reserved block in each table's sequence (SQL Server)
+
+    sp_sequence_get_range hands out the block atomically, so rows created
+    through the API while a load is running never collide with it.
+    """
+    from db import execute_query
+
+    first_ids = {}
+    for table, count in counts.items():
+        if count == 0:
+            continue
+        rows = execute_query("""
+            SET NOCOUNT ON;
+            DECLARE @first SQL_VARIANT;
+            EXEC sys.sp_sequence_get_range @sequence_name = ?, @range_size = ?, @range_first_value = @first OUTPUT;
+            SELECT CAST(@first AS BIGINT) AS FirstValue;
+        """, [SEQUENCES[table], count])
+        first_ids[table] = rows[0]['FirstValue']
+    return first_ids
+
+def load_sqlserver(season):
+    """Bulk-load a generated season into the configured database in one transaction
+
+    Uses fast_executemany through execute_many. RoundTotals is skipped when
+    the create_round_totals.sql migration has not been run.
+    """
+    from db import begin_unit_of_work, end_unit_of_work, execute_many, execute_query
+
+    unit = begin_unit_of_work()
+    counts = {}
+    try:
+        has_round_totals = execute_query(
+            "SELECT OBJECT_ID('dbo.RoundTotals', 'U') AS ObjectID"
+        )[0]['ObjectID'] is not None
+        for table in LOAD_ORDER:
+            if table == 'RoundTotals' and not has_round_totals:
+                print("[DEV] RoundTotals table not found; run migrations/create_round_totals.sql")
+                continue
+            counts[table] = _load_table(season, table, execute_many)
+        unit.commit()
+    finally:
+        end_unit_of_work()
+    return counts
+
+def load_sqlite(season, path):
+    """Bulk-load a generated season into a SQLite file (created if missing)"""
+    conn = sqlite3.connect(path)
+    counts = {}
+    try:
+        conn.executescript(SQLITE_SCHEMA)
+        # Journaling buys nothing for a throwaway load target
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            for table in LOAD_ORDER:
+                counts[table] = _load_table(season, table, conn.executemany, datetimes_as_text=True)
+            conn.executescript(SQLITE_INDEXES)
+    finally:
+        conn.close()
+    return counts
+
+def sqlite_first_ids(path):
+    """Next free ID per table in an existing SQLite file (1 for a new file)"""
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        first_ids = {}
+        for table in SEQUENCES:
+            column = TABLE_COLUMNS[table][0]
+            try:
+                first_ids[table] = conn.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}").fetchone()[0]
+            except sqlite3.OperationalError:
+                first_ids[table] = 1
+        return first_ids
+    finally:
+        conn.close()
+
+# ============================================
+# CLI
+# ============================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and bulk-load a synthetic putting league season")
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--players-per-event', type=int, default=120,
+                        help="average field size per event")
+    parser.add_argument('--holes', type=int, default=9)
+    parser.add_argument('--start-date', type=date.fromisoformat, default=None,
+                        help="season start (YYYY-MM-DD, default January 1 this year)")
+    parser.add_argument('--season-days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help="load into this SQLite file instead of the configured SQL Server database")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = dict(
+        players=args.players, events=args.events, players_per_event=args.players_per_event,
+        holes=args.holes, start_date=args.start_date, season_days=args.season_days, seed=args.seed,
+    )
+
+    started = time.perf_counter()
+    season = generate_season(**options)
+    generated = time.perf_counter()
+    counts = {table: row_count(season, table) for table in SEQUENCES}
+    # Row counts are only known after generating, so IDs are moved into the
+    # free (or reserved) ranges afterwards
+    if args.sqlite:
+        first_ids = sqlite_first_ids(args.sqlite)
+    else:
+        first_ids = reserve_ids(counts)
+    shift_ids(season, first_ids)
+    print(f"Generated {counts['Score']:,} scores on {counts['Scorecard']:,} scorecards "
+          f"in {generated - started:.2f}s")
+
+    loaded_at = time.perf_counter()
+    if args.sqlite:
+        loaded = load_sqlite(season, args.sqlite)
+        target = args.sqlite
+    else:
+        loaded = load_sqlserver(season)
+        target = "SQL Server"
+    elapsed = time.perf_counter() - loaded_at
+    for table, count in loaded.items():
+        print(f"  {table:<16} {count:>12,}")
+    print(f"Loaded into {target} in {elapsed:.2f}s "
+          f"({sum(loaded.values()) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+if __name__ == '__main__':
+    main()
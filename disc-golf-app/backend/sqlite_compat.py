@@ -0,0 +1,456 @@
+"""
+Run the backend's T-SQL against SQLite
+
+A local stand-in for the PuttingLeague database. SQLiteDatabase hands out
+connections shaped like pyodbc's (cursor / execute / fetchmany / nextset /
+commit), so they can be given to db.ConnectionPool unchanged, and rewrites
+the T-SQL this app sends into SQLite's dialect on the way through:
+
+    TOP (n)                      -> LIMIT n at the end of the same SELECT
+    WITH (UPDLOCK, ...) hints    -> dropped
+    ISNULL / STRING_AGG          -> IFNULL / GROUP_CONCAT
+    a + 'text'                   -> a || 'text'
+    CAST(x AS DECIMAL(p, s))     -> ROUND(x, s)
+    NEXT VALUE FOR Seq           -> a per-database counter seeded from MAX(id)
+    GETDATE() / SYSUTCDATETIME() -> datetime('now', ...)
+    MERGE (refresh of a scope)   -> DELETE of the target scope + INSERT of the source
+    SET NOCOUNT / TRANSACTION    -> dropped
+    EXEC Proc ?, ...             -> a Python implementation from `procedures`
+
+Anything else is passed through unchanged, so unsupported syntax fails with
+SQLite's own error rather than silently doing something different.
+"""
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pyodbc
+
+# Sequence name -> (table, ID column) it hands out values for
+SEQUENCES = {
+    'Event_Seq': ('Event', 'EventID'),
+    'PlayerID_Seq': ('Player', 'PlayerID'),
+    'Scorecard_Seq': ('Scorecard', 'ScorecardID'),
+    'ScoreID_Seq': ('Score', 'ScoreID'),
+}
+
+# SQL Server returns DATETIME columns as datetime; declare them TIMESTAMP in
+# SQLite and they round-trip the same way
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter('TIMESTAMP', lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter('DATE', lambda raw: date.fromisoformat(raw.decode()))
+
+class ProcedureError(Exception):
+    """Raised by a Python stored procedure (the RAISERROR equivalent)"""
+
+# ============================================
+# TRANSLATION
+# ============================================
+
+_TOKENS = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+_MARKER = re.compile(r"\x00(\d+)\x00")
+_HINT_NAMES = r"NOLOCK|UPDLOCK|HOLDLOCK|ROWLOCK|READPAST|TABLOCKX?|XLOCK|SERIALIZABLE"
+_HINTS = re.compile(rf"\bWITH\s*\(\s*(?:{_HINT_NAMES})(?:\s*,\s*(?:{_HINT_NAMES}))*\s*\)", re.IGNORECASE)
+_TOP = re.compile(r"\bSELECT\s+(DISTINCT\s+)?TOP\s*(\(\s*[^()]+?\s*\)|\?\d+|\d+)\s*", re.IGNORECASE)
+_MERGE = re.compile(
+    r"^\s*(?:WITH\s+\w+\s+AS\s*\(\s*SELECT\s+.*?\s+FROM\s+(?P<table>\w+)\s+WHERE\s+(?P<cte_scope>.*?)\)\s*)?"
+    r"MERGE\s+(?:INTO\s+)?(?P<target>\w+)\s+(?:AS\s+)?(?P<talias>\w+)\s+"
+    r"USING\s*\((?P<source>.*?)\)\s*AS\s+(?P<salias>\w+)\s+ON\s+.*?"
+    r"WHEN\s+NOT\s+MATCHED\s+BY\s+TARGET\s+THEN\s+INSERT\s*\((?P<columns>[^)]*)\)\s*VALUES\s*\((?P<values>.*?)\)\s*"
+    r"WHEN\s+NOT\s+MATCHED\s+BY\s+SOURCE\s+(?:AND\s+(?P<scope>.*?)\s+)?THEN\s+DELETE\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_EXEC = re.compile(r"^\s*EXEC(?:UTE)?\s+(?:\w+\.)?(\w+)\b(.*)$", re.IGNORECASE | re.DOTALL)
+_PARAM_INDEX = re.compile(r"\?(\d+)")
+
+def _mask(sql):
+    """(sql with literals replaced by markers and comments removed, literals)"""
+    literals = []
+
+    def stash(match):
+        token = match.group(0)
+        if token.startswith("'"):
+            literals.append(token)
+            return f"\x00{len(literals) - 1}\x00"
+        return ' '
+    return _TOKENS.sub(stash, sql), literals
+
+def _unmask(sql, literals):
+    return _MARKER.sub(lambda match: literals[int(match.group(1))], sql)
+
+def _closing_paren(text, open_index):
+    """Index of the parenthesis closing the one at open_index"""
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError("unbalanced parentheses")
+
+def _scope_end(text, start):
+    """Index where the SELECT starting at `start` ends (its enclosing ')' or the end)"""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            if depth == 0:
+                return i
+            depth -= 1
+    return len(text)
+
+def _rewrite_top(sql):
+    while True:
+        match = _TOP.search(sql)
+        if match is None:
+            return sql
+        count = match.group(2).strip('() \t\n')
+        select = 'SELECT DISTINCT ' if match.group(1) else 'SELECT '
+        sql = sql[:match.start()] + select + sql[match.end():]
+        end = _scope_end(sql, match.start() + len(select))
+        sql = sql[:end].rstrip() + f" LIMIT {count}" + (' ' if end < len(sql) else '') + sql[end:]
+
+def _cast_target(sql_type):
+    """SQLite expression template for CAST(x AS sql_type)"""
+    base = sql_type.split('(')[0].strip().upper()
+    if base in ('DECIMAL', 'NUMERIC'):
+        scale = sql_type.split(',')[1].rstrip(') ') if ',' in sql_type else '0'
+        return f"ROUND(CAST({{}} AS REAL), {scale})"
+    if base in ('FLOAT', 'REAL'):
+        return "CAST({} AS REAL)"
+    if base in ('VARCHAR', 'NVARCHAR', 'CHAR', 'NCHAR', 'TEXT'):
+        return "CAST({} AS TEXT)"
+    if base in ('INT', 'BIGINT', 'SMALLINT', 'TINYINT', 'BIT'):
+        return "CAST({} AS INTEGER)"
+    if base in ('DATE', 'DATETIME', 'DATETIME2', 'SMALLDATETIME', 'SQL_VARIANT'):
+        return "{}"
+    return f"CAST({{}} AS {sql_type})"
+
+def _rewrite_casts(sql):
+    out, i = [], 0
+    for match in re.finditer(r"\bCAST\s*\(", sql, re.IGNORECASE):
+        if match.start() < i:
+            continue  # inside a CAST already rewritten
+        open_index = match.end() - 1
+        close_index = _closing_paren(sql, open_index)
+        inner = sql[open_index + 1:close_index]
+        # The type follows the last AS at the top level of the CAST
+        depth, split = 0, None
+        for j, char in enumerate(inner):
+            depth += char == '('
+            depth -= char == ')'
+            if depth == 0 and re.match(r"\s+AS\s", inner[j:], re.IGNORECASE):
+                split = j
+        expression = _rewrite_casts(inner[:split])
+        sql_type = re.sub(r"^\s+AS\s+", '', inner[split:], flags=re.IGNORECASE).strip()
+        out.append(sql[i:match.start()])
+        out.append(_cast_target(sql_type).format(expression.strip()))
+        i = close_index + 1
+    out.append(sql[i:])
+    return ''.join(out)
+
+def _rewrite(sql):
+    """SQLite text for one masked T-SQL statement"""
+    sql = re.sub(r"\[dbo\]\.|\bdbo\.", '', sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\[([^\]]+)\]", r'"\1"', sql)
+    sql = _HINTS.sub('', sql)
+    sql = re.sub(r"\bISNULL\s*\(", 'IFNULL(', sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bSTRING_AGG\s*\(", 'GROUP_CONCAT(', sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bGETDATE\s*\(\s*\)", "datetime('now', 'localtime')", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bSYS(?:UTC)?DATETIME\s*\(\s*\)", "datetime('now')", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bNEXT\s+VALUE\s+FOR\s+(\w+)", r"NEXTVAL('\1')", sql, flags=re.IGNORECASE)
+    # String concatenation: a + next to a string literal
+    sql = re.sub(r"\s*\+\s*(?=\x00\d+\x00)", ' || ', sql)
+    sql = re.sub(r"(\x00\d+\x00)\s*\+\s*", r"\1 || ", sql)
+    sql = _rewrite_casts(sql)
+    return _rewrite_top(sql)
+
+def _split(masked):
+    return [part for part in masked.split(';') if part.strip()]
+
+def _number_params(statement):
+    """Replace each ? with ?N (N counted from 1 within the statement)"""
+    counter = iter(range(1, statement.count('?') + 1))
+    return re.sub(r"\?", lambda _: f"?{next(counter)}", statement)
+
+def translate(sql):
+    """SQLite statements for one T-SQL batch
+
+    Returns a list of (kind, text, param_offset, param_count): kind is 'sql'
+    or 'exec' (text is then the procedure name). The statement's parameters
+    are params[param_offset:param_offset + param_count], numbered ?1..?N.
+    """
+    masked, literals = _mask(sql)
+    statements, offset = [], 0
+    for statement in _split(masked):
+        count = statement.count('?')
+        if re.match(r"^\s*SET\s+(NOCOUNT\s+(ON|OFF)|TRANSACTION\s+ISOLATION\s+LEVEL\s+[\w ]+?)\s*$",
+                    statement, re.IGNORECASE):
+            continue
+        exec_match = _EXEC.match(statement)
+        if exec_match:
+            statements.append(('exec', exec_match.group(1), offset, count))
+            offset += count
+            continue
+        numbered = _HINTS.sub('', _number_params(statement))
+        merge = _MERGE.match(numbered)
+        if merge:
+            if merge.group('table'):
+                # MERGE into a CTE over the target's scope
+                target, scope = merge.group('table'), merge.group('cte_scope')
+            else:
+                target, alias = merge.group('target'), merge.group('talias')
+                scope = re.sub(rf"\b{alias}\.", '', merge.group('scope'))
+            parts = [
+                f"DELETE FROM {target} WHERE {scope}",
+                f"INSERT INTO {target} ({merge.group('columns')}) "
+                f"SELECT {merge.group('values')} FROM ({merge.group('source')}) AS {merge.group('salias')}",
+            ]
+        else:
+            parts = [numbered]
+        for part in parts:
+            text = _unmask(_rewrite(part), literals)
+            used = max((int(n) for n in _PARAM_INDEX.findall(text)), default=0)
+            statements.append(('sql', text, offset, used))
+        offset += count
+    return statements
+
+def translate_view(sql):
+    """SQLite SELECT for the body of a T-SQL view definition"""
+    (_, text, _, _), = translate(sql)
+    return text
+
+# ============================================
+# VIEWS
+# ============================================
+
+BACKEND_DIR = Path(__file__).resolve().parent
+REPO_DIR = BACKEND_DIR.parent.parent
+
+# Later sources replace views defined by earlier ones, in the order the
+# migrations are applied to the real database
+VIEW_SOURCES = (
+    REPO_DIR / 'Scoreboard Views.md',
+    BACKEND_DIR / 'migrations' / 'create_stats_views.sql',
+    BACKEND_DIR / 'migrations' / 'create_round_totals.sql',
+)
+
+def view_definitions(sources=VIEW_SOURCES):
+    """{view name: T-SQL body} from the view scripts, later definitions winning"""
+    views = OrderedDict()
+    for path in sources:
+        text = path.read_text(encoding='utf-8')
+        if path.suffix == '.md':
+            # Markdown export escapes punctuation: \-\- \= \[dbo\] ...
+            text = re.sub(r"\\(.)", r"\1", text)
+        for batch in re.split(r"^\s*GO\s*$", text, flags=re.MULTILINE):
+            match = re.search(r"CREATE\s+OR\s+ALTER\s+VIEW\s+(\S+)\s+AS\b(.*)", batch,
+                              re.IGNORECASE | re.DOTALL)
+            if match:
+                name = re.sub(r"\[dbo\]\.|\[|\]", '', match.group(1))
+                views.pop(name, None)
+                views[name] = match.group(2)
+    return views
+
+def create_views(conn, sources=VIEW_SOURCES):
+    """(Re)create every view on a sqlite3 connection"""
+    for name, body in view_definitions(sources).items():
+        conn.execute(f"DROP VIEW IF EXISTS {name}")
+        conn.execute(f"CREATE VIEW {name} AS {translate_view(body)}")
+
+# ============================================
+# PYODBC-SHAPED CONNECTION
+# ============================================
+
+def _odbc_error(error):
+    """The pyodbc error the db helpers expect for a sqlite3 error"""
+    message = str(error)
+    if isinstance(error, ProcedureError):
+        return pyodbc.ProgrammingError('42000', message)
+    if 'no such table' in message:
+        return pyodbc.ProgrammingError('42S02', f"[42S02] Invalid object name ({message})")
+    if isinstance(error, sqlite3.IntegrityError):
+        return pyodbc.IntegrityError('23000', message)
+    if isinstance(error, sqlite3.OperationalError) and 'locked' in message:
+        return pyodbc.OperationalError('HYT00', message)
+    return pyodbc.ProgrammingError('42000', message)
+
+class _ResultSet:
+    """A result set held in memory (what a Python procedure returns)"""
+
+    def __init__(self, columns, rows):
+        self.description = [(name, None, None, None, None, None, None) for name in columns]
+        self._rows = list(rows)
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._rows = []
+
+class Cursor:
+    """pyodbc.Cursor over a SQLite connection; each statement of a batch is one result set"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._results = []
+        self._current = None
+        self.fast_executemany = False
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._current.description if self._current is not None else None
+
+    def _close_results(self):
+        for result in self._results:
+            result.close()
+        self._results = []
+        self._current = None
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        params = list(params)
+        self._close_results()
+        self.rowcount = 0
+        raw = self._connection.raw
+        try:
+            for kind, text, offset, count in translate(sql):
+                args = params[offset:offset + count]
+                if kind == 'exec':
+                    procedure = self._connection.database.procedures.get(text)
+                    if procedure is None:
+                        raise ProcedureError(f"Could not find stored procedure '{text}'")
+                    result = procedure(self._connection, *args)
+                    if result is not None:
+                        self._results.append(_ResultSet(*result))
+                    continue
+                cursor = raw.cursor()
+                cursor.execute(text, args)
+                if cursor.description is not None:
+                    self._results.append(cursor)
+                else:
+                    self.rowcount += max(cursor.rowcount, 0)
+                    cursor.close()
+        except (sqlite3.Error, ProcedureError) as e:
+            self._close_results()
+            raise _odbc_error(e) from e
+        self._current = self._results[0] if self._results else None
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._close_results()
+        statements = translate(sql)
+        if len(statements) != 1 or statements[0][0] != 'sql':
+            raise pyodbc.ProgrammingError('42000', "executemany needs a single statement")
+        _, text, offset, count = statements[0]
+        cursor = self._connection.raw.cursor()
+        try:
+            cursor.executemany(text, (list(row)[offset:offset + count] for row in seq_of_params))
+            self.rowcount = cursor.rowcount
+        except sqlite3.Error as e:
+            raise _odbc_error(e) from e
+        finally:
+            cursor.close()
+
+    def _require_results(self):
+        if self._current is None:
+            raise pyodbc.ProgrammingError('24000', 'No results.  Previous SQL was not a query.')
+
+    def fetchall(self):
+        self._require_results()
+        return self._current.fetchall()
+
+    def fetchmany(self, size=1):
+        self._require_results()
+        return self._current.fetchmany(size)
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def nextset(self):
+        if self._results:
+            self._results.pop(0).close()
+        self._current = self._results[0] if self._results else None
+        return True if self._current is not None else None
+
+    def close(self):
+        self._close_results()
+
+class Connection:
+    """pyodbc.Connection over one sqlite3 connection (autocommit off)"""
+
+    def __init__(self, database):
+        self.database = database
+        self.raw = sqlite3.connect(
+            database.path, timeout=30, check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        self.raw.create_function('NEXTVAL', 1, database.next_value)
+        self.raw.create_function('CONCAT', -1, lambda *parts: ''.join('' if p is None else str(p) for p in parts))
+        self.raw.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+class SQLiteDatabase:
+    """A SQLite file standing in for the SQL Server database
+
+    connect() is a drop-in for db.get_connection. procedures maps stored
+    procedure names to Python functions called as proc(connection, *args),
+    returning (columns, rows) for a result set or None.
+    """
+
+    def __init__(self, path, procedures=None):
+        self.path = path
+        self.procedures = dict(procedures or {})
+        self._sequence_lock = threading.Lock()
+        self._sequences = {}
+
+    def connect(self):
+        return Connection(self)
+
+    def reset_sequences(self):
+        """Re-seed NEXT VALUE FOR from the tables (after loading rows directly)"""
+        with self._sequence_lock:
+            self._sequences.clear()
+
+    def next_value(self, name):
+        with self._sequence_lock:
+            if name not in self._sequences:
+                table, column = SEQUENCES[name]
+                conn = sqlite3.connect(self.path, timeout=30)
+                try:
+                    self._sequences[name] = conn.execute(
+                        f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}"
+                    ).fetchone()[0]
+                finally:
+                    conn.close()
+            value = self._sequences[name]
+            self._sequences[name] = value + 1
+            return value
@@ -0,0 +1,802 @@
+"""
+Vectorized stats from per-event partial aggregates
+
+Answers /api/stats/hole-difficulty, /api/stats/basket-stats,
+/api/stats/podium and the latest / last-N /api/leaderboard from memory
+instead of the vw_HoleDifficultyRanking, vw_HardestBaskets,
+vw_PodiumPercentage and RoundTotals queries, and /api/stats/head-to-head
+from the same round totals.
+
+Score is loaded as NumPy columns and folded, once per event, into an
+_EventPartial: the event's round totals with their division ranks, its
+hole rows (as vw_HoleDifficultyRanking shows them) and its per-basket
+stroke counts. A stats window (latest, last N, all) is answered by
+merging the partials of the events in it with a few bincount / lexsort
+passes, so its cost follows the window size rather than the history.
+
+Write routes report what they changed through tables_changed (app.py),
+after their transaction commits: only the events whose scores changed are
+reloaded. Everything is reloaded after STATS_ENGINE_MAX_AGE seconds, for
+writes from other processes or to the layout tables, which no route writes;
+that reload runs on a background thread while reads keep using the current
+season, which is swapped out once the new one is ready.
+
+Rows match the views', including the types SQL Server returns: rounding
+half away from zero, RANK() ties, and DECIMALs for the percentages (see
+_rounded and _decimals).
+"""
+import copy
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from decimal import Decimal
+
+import numpy as np
+
+from cache import CACHE_CONFIG
+from db import execute_batch, execute_query
+from rows import Rows
+
+# Stats engine configuration (override with environment variables)
+STATS_ENGINE_CONFIG = {
+    'enabled': os.environ.get('STATS_ENGINE', '1').lower() not in ('0', 'false', 'no'),
+    # Seconds before everything is reloaded (in the background) even without a local write
+    'max_age': float(os.environ.get('STATS_ENGINE_MAX_AGE', CACHE_CONFIG['ttl'])),
+}
+
+# More changed events than this in one refresh reload every event
+MAX_EVENT_RELOAD = 500
+
+SCORES_SQL = """
+    SELECT sc.EventID, s.ScorecardID, s.PlayerID, s.HoleNumber, s.Strokes
+    FROM Score s
+    INNER JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+    {where}
+    ORDER BY sc.EventID, s.ScorecardID, s.PlayerID
+"""
+
+PLAYERS_QUERIES = [
+    ('players', """
+        SELECT PlayerID, FirstName, LastName, SkillDivision FROM Player ORDER BY PlayerID
+    """, None),
+]
+
+# Events and the layout tables they join (EventLayout.LayoutID = EventID)
+EVENTS_QUERIES = [
+    ('events', """
+        SELECT EventID, Name, EventDate FROM Event
+    """, None),
+    ('holes', """
+        SELECT LayoutID, HoleNumber, DistanceFeet FROM EventLayout
+    """, None),
+    ('obstacles', """
+        SELECT lo.LayoutID, lo.HoleNumber, o.Description, o.Elevation, o.IsMandatory, o.Obstruction
+        FROM LayoutObstacle lo
+        INNER JOIN Obstacle o ON lo.ObstacleID = o.ObstacleID
+    """, None),
+    ('layout_baskets', """
+        SELECT LayoutID, HoleNumber, BasketID FROM LayoutBasket
+    """, None),
+    ('baskets', """
+        SELECT BasketID, Brand, Model, ChainCount, HasUpperBand FROM Basket
+    """, None),
+]
+
+HOLE_DIFFICULTY_COLUMNS = (
+    'EventID', 'EventName', 'HoleNumber', 'DistanceFeet', 'ObstacleDescription', 'Elevation',
+    'IsMandatory', 'HasObstruction', 'TimesPlayed', 'AvgScore', 'DifficultyRating', 'SuccessRatePercent',
+)
+BASKET_COLUMNS = (
+    'Brand', 'Model', 'ChainCount', 'HasUpperBand', 'TimesUsed', 'TotalAttempts', 'AvgScore',
+    'ZeroScores', 'OneScores', 'TwoScores', 'PerfectScores', 'DifficultyRating', 'DifficultyRank',
+)
+PODIUM_COLUMNS = ('PlayerName', 'SkillDivision', 'PodiumFinishes', 'TotalRounds', 'PodiumPercentage')
+LATEST_LEADERBOARD_COLUMNS = (
+    'SkillDivision', 'FirstName', 'LastName', 'RoundsPlayed', 'HighTotal', 'BestScorecardTotal', 'DivisionRank',
+)
+WINDOWED_LEADERBOARD_COLUMNS = (
+    'FirstName', 'LastName', 'SkillDivision', 'RoundsPlayed', 'HighTotal', 'BestScorecardTotal', 'DivisionRank',
+)
+HEAD_TO_HEAD_COLUMNS = ('PlayerID', 'OpponentID', 'SharedEvents', 'Wins', 'Losses', 'Ties', 'AvgMargin')
+
+# SuccessRatePercent is SUM(int) * 100.0 / COUNT(...): DECIMAL(26, 12) in
+# SQL Server, which ROUND(..., 1) and ISNULL keep
+SUCCESS_RATE_SCALE = Decimal('1E-12')
+
+# Columns of _EventPartial.basket_stats
+BASKET_COUNTS, BASKET_SUMS, BASKET_ZEROS, BASKET_ONES, BASKET_TWOS, BASKET_THREES, BASKET_ATTEMPTS = range(7)
+
+# ============================================
+# HELPERS
+# ============================================
+
+def _rounded(numerators, denominators, digits):
+    """numerators / denominators rounded half away from zero, as integer units of 10**-digits
+
+    Exact integer arithmetic on the true quotient, as SQL Server rounds
+    the DECIMAL division and as ROUND(AVG(FLOAT)) comes out for these
+    averages of whole strokes; numerators must be >= 0 and denominators > 0.
+    """
+    scale = 10 ** digits
+    return (2 * scale * numerators + denominators) // (2 * denominators)
+
+def _decimals(tenths, scale=None):
+    """DECIMAL values for a column of _rounded(..., 1) results"""
+    values = [Decimal(value).scaleb(-1) for value in tenths.tolist()]
+    if scale is not None:
+        values = [value.quantize(scale) for value in values]
+    return values
+
+def _yes_no(flag):
+    return 'Yes' if flag == 1 else 'No'
+
+def _rank_ascending(values):
+    """RANK() OVER (ORDER BY values) for one partition"""
+    ordered = np.sort(values, kind='stable')
+    return np.searchsorted(ordered, values, side='left') + 1
+
+def _partition_starts(*keys):
+    """For rows sorted by keys, the index of the first row with the same keys as each row"""
+    positions = np.arange(len(keys[0]))
+    new = np.zeros(len(positions), dtype=bool)
+    if len(positions):
+        new[0] = True
+        for key in keys:
+            new[1:] |= key[1:] != key[:-1]
+    return np.maximum.accumulate(np.where(new, positions, 0))
+
+def _concat(arrays, dtype=np.int64):
+    return np.concatenate(arrays) if arrays else np.array([], dtype=dtype)
+
+def head_to_head(event_ids, player_ids, totals, selected=None):
+    """Pairwise records between players over the events they both played
+
+    event_ids, player_ids, totals: one entry per round (RoundTotals rows).
+    selected: the PlayerIDs to compare (default: everyone). A player's best
+    round stands for them at each event and the higher total wins. One row
+    per pair that shared an event, PlayerID < OpponentID, with Wins, Losses
+    and AvgMargin (RoundTotal difference, rounded to 2 places) from
+    PlayerID's side; ordered by PlayerID, OpponentID.
+    """
+    event_ids, player_ids, totals = (np.asarray(column, dtype=np.int64) for column in (event_ids, player_ids, totals))
+    if selected is not None:
+        keep = np.isin(player_ids, np.asarray(selected, dtype=np.int64))
+        event_ids, player_ids, totals = event_ids[keep], player_ids[keep], totals[keep]
+
+    # Best round per (event, player): the last one once sorted by total
+    order = np.lexsort((totals, player_ids, event_ids))
+    event_ids, player_ids, totals = event_ids[order], player_ids[order], totals[order]
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = (event_ids[1:] != event_ids[:-1]) | (player_ids[1:] != player_ids[:-1])
+    event_ids, player_ids, totals = event_ids[last], player_ids[last], totals[last]
+
+    # Every pair of players within each event; players are sorted, so first < second
+    bounds = np.flatnonzero(np.diff(event_ids)) + 1
+    firsts, seconds = [], []
+    for start, end in zip(np.concatenate(([0], bounds)).tolist(), np.concatenate((bounds, [len(event_ids)])).tolist()):
+        if end - start > 1:
+            first, second = np.triu_indices(end - start, 1)
+            firsts.append(first + start)
+            seconds.append(second + start)
+    first, second = _concat(firsts), _concat(seconds)
+    if not len(first):
+        return Rows(HEAD_TO_HEAD_COLUMNS, [])
+
+    span = int(player_ids.max()) + 1
+    pairs, pair = np.unique(player_ids[first] * span + player_ids[second], return_inverse=True)
+    margins = totals[first] - totals[second]
+    shared = np.bincount(pair)
+    margin_sums = np.bincount(pair, weights=margins).astype(np.int64)
+    averages = np.sign(margin_sums) * _rounded(np.abs(margin_sums), shared, 2) / 100
+    rows = list(zip(
+        (pairs // span).tolist(),
+        (pairs % span).tolist(),
+        shared.tolist(),
+        np.bincount(pair[margins > 0], minlength=len(pairs)).tolist(),
+        np.bincount(pair[margins < 0], minlength=len(pairs)).tolist(),
+        np.bincount(pair[margins == 0], minlength=len(pairs)).tolist(),
+        averages.tolist(),
+    ))
+    return Rows(HEAD_TO_HEAD_COLUMNS, rows)
+
+def parse_window(event_limit):
+    """'latest', 'all' or a number of events; anything else means all"""
+    if event_limit == 'latest':
+        return 'latest'
+    if event_limit.isdigit():
+        return int(event_limit)
+    return 'all'
+
+# ============================================
+# SNAPSHOT
+# ============================================
+
+class _Players:
+    """Player lookup: sorted PlayerIDs with names and division codes"""
+
+    def __init__(self, rows):
+        self.ids = np.array([row['PlayerID'] for row in rows], dtype=np.int64)
+        self.first_names = [row['FirstName'] for row in rows]
+        self.last_names = [row['LastName'] for row in rows]
+        self.divisions = [row['SkillDivision'] for row in rows]
+        codes = {}
+        self.division_codes = np.array(
+            [codes.setdefault(division, len(codes)) for division in self.divisions], dtype=np.int64
+        )
+
+    def index(self, player_ids):
+        """(positions, known): each PlayerID's index, and whether it exists"""
+        if not len(self.ids):
+            return np.zeros(len(player_ids), dtype=np.int64), np.zeros(len(player_ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.ids, player_ids), len(self.ids) - 1)
+        return positions, self.ids[positions] == player_ids
+
+    def name(self, i):
+        first, last = self.first_names[i], self.last_names[i]
+        return None if first is None or last is None else f"{first} {last}"
+
+class _Events:
+    """Events, newest first, with the layout tables joined to them"""
+
+    def __init__(self, batch):
+        self.by_id = {row['EventID']: (row['Name'], row['EventDate']) for row in batch['events']}
+        # TOP ... ORDER BY EventDate DESC, EventID DESC
+        self.recent = sorted(self.by_id, key=lambda event_id: (self.by_id[event_id][1], event_id), reverse=True)
+
+        self.holes = {}
+        for row in batch['holes']:
+            self.holes.setdefault(row['LayoutID'], []).append((row['HoleNumber'], row['DistanceFeet']))
+        self.obstacles = {}
+        for row in batch['obstacles']:
+            self.obstacles.setdefault((row['LayoutID'], row['HoleNumber']), []).append(
+                (row['Description'], row['Elevation'], row['IsMandatory'], row['Obstruction'])
+            )
+        self.baskets = {row['BasketID']: row for row in batch['baskets']}
+        self.layout_baskets = {}
+        for row in batch['layout_baskets']:
+            if row['BasketID'] in self.baskets:
+                self.layout_baskets.setdefault(row['LayoutID'], []).append((row['HoleNumber'], row['BasketID']))
+
+        # Events in vw_HoleDifficultyRanking (those with a layout), newest first
+        self.recent_with_layout = [event_id for event_id in self.recent if event_id in self.holes]
+        self.date_ranks = self._date_ranks(self.recent)
+        self.date_ranks_with_layout = self._date_ranks(self.recent_with_layout)
+
+    def _date_ranks(self, recent):
+        """For events newest first: 0 for the newest date, 1 for the next distinct date, ..."""
+        ranks, previous = [], None
+        for event_id in recent:
+            date = self.by_id[event_id][1]
+            if ranks and date == previous:
+                ranks.append(ranks[-1])
+            else:
+                ranks.append(ranks[-1] + 1 if ranks else 0)
+            previous = date
+        return ranks
+
+class _EventPartial:
+    """One event's aggregates, built from its scores
+
+    rounds: PlayerID, ScorecardID and RoundTotal per RoundTotals row; for
+        the rounds of players that exist (round_known), the player's index
+        and the round's RANK() in its skill division (see ranked)
+    hole_rows: the event's vw_HoleDifficultyRanking rows, hole_averages the
+        AvgScore of each
+    basket_ids / basket_stats: per basket on the layout that was scored
+        on, the BASKET_* sums (weighted by the view's join, attempts counted
+        once per score)
+    """
+    __slots__ = ('event_id', 'date', 'round_player', 'round_scorecard', 'round_total',
+                 'round_known', 'round_index', 'round_rank',
+                 'hole_rows', 'hole_averages', 'basket_ids', 'basket_stats')
+
+    def __init__(self, event_id, events, players, scorecards, player_ids, holes, strokes):
+        name, self.date = events.by_id[event_id]
+        self.event_id = event_id
+        self._rounds(scorecards, player_ids, strokes)
+        self._rank(players)
+
+        span = max([hole for hole, _ in events.holes.get(event_id, ())]
+                   + ([int(holes.max())] if len(holes) else []), default=0) + 1
+        counts = np.bincount(holes, minlength=span)
+        sums = np.bincount(holes, weights=strokes, minlength=span).astype(np.int64)
+        by_strokes = [np.bincount(holes[strokes == value], minlength=span) for value in (0, 1, 2, 3)]
+        successes = np.bincount(holes[strokes >= 2], minlength=span)
+        self._holes(event_id, name, events, counts, sums, successes)
+        self._baskets(event_id, events, counts, sums, by_strokes)
+
+    def ranked(self, players):
+        """This partial with its rounds ranked for another set of players"""
+        partial = copy.copy(self)
+        partial._rank(players)
+        return partial
+
+    def _rounds(self, scorecards, player_ids, strokes):
+        # Scores arrive sorted by scorecard and player: each round is a run
+        if len(scorecards):
+            new = np.concatenate(([True], (scorecards[1:] != scorecards[:-1]) | (player_ids[1:] != player_ids[:-1])))
+            starts = np.flatnonzero(new)
+            self.round_total = np.add.reduceat(strokes, starts)
+        else:
+            starts = self.round_total = np.array([], dtype=np.int64)
+        self.round_player = player_ids[starts]
+        self.round_scorecard = scorecards[starts]
+
+    def _rank(self, players):
+        # RANK() OVER (PARTITION BY EventID, SkillDivision ORDER BY RoundTotal DESC)
+        positions, self.round_known = players.index(self.round_player)
+        self.round_index = positions[self.round_known]
+        totals = self.round_total[self.round_known]
+        division = players.division_codes[self.round_index]
+        order = np.lexsort((-totals, division))
+        ranks = np.empty(len(order), dtype=np.int64)
+        division_s, totals_s = division[order], totals[order]
+        ranks[order] = _partition_starts(division_s, totals_s) - _partition_starts(division_s) + 1
+        self.round_rank = ranks
+
+    def _holes(self, event_id, name, events, counts, sums, successes):
+        """vw_HoleDifficultyRanking: Event x EventLayout x LayoutObstacle x Obstacle x scores
+
+        One row per (hole, distance, obstacle columns); joined rows that land
+        in the same group repeat that hole's scores.
+        """
+        groups = Counter()
+        for hole, distance in events.holes.get(event_id, ()):
+            for obstacle in events.obstacles.get((event_id, hole), [(None, None, None, None)]):
+                groups[(hole, distance) + obstacle] += 1
+        keys = list(groups)
+        hole_numbers = np.array([key[0] for key in keys], dtype=np.int64)
+        repeats = np.array(list(groups.values()), dtype=np.int64)
+        played_counts = counts[hole_numbers]
+        played = played_counts > 0
+        safe_counts = np.maximum(played_counts, 1)
+        averages = sums[hole_numbers] / safe_counts
+        ratings = np.select(
+            [~played, averages >= 2.5, averages >= 2.0, averages >= 1.5],
+            ['None', 'Easy', 'Moderate', 'Difficult'],
+            'Very Difficult',
+        )
+        self.hole_averages = np.where(played, _rounded(sums[hole_numbers], safe_counts, 2) / 100, 0.0)
+        success = np.where(played, _rounded(100 * successes[hole_numbers], safe_counts, 1), 0)
+        self.hole_rows = list(zip(
+            [event_id] * len(keys),
+            [name] * len(keys),
+            [key[0] for key in keys],
+            [key[1] for key in keys],
+            ['None' if key[2] is None else key[2] for key in keys],
+            [0 if key[3] is None else key[3] for key in keys],
+            [_yes_no(key[4]) for key in keys],
+            [_yes_no(key[5]) for key in keys],
+            (played_counts * repeats).tolist(),
+            self.hole_averages.tolist(),
+            ratings.tolist(),
+            _decimals(success, SUCCESS_RATE_SCALE),
+        ))
+
+    def _baskets(self, event_id, events, counts, sums, by_strokes):
+        """vw_HardestBaskets' sums for this event: LayoutBasket x EventLayout x scores"""
+        layout_holes = Counter(hole for hole, _ in events.holes.get(event_id, ()))
+        joined = [(basket_id, hole, layout_holes[hole])
+                  for hole, basket_id in events.layout_baskets.get(event_id, ())
+                  if layout_holes[hole] and hole < len(counts) and counts[hole]]
+        if not joined:
+            self.basket_ids = np.array([], dtype=np.int64)
+            self.basket_stats = np.zeros((0, 7), dtype=np.int64)
+            return
+        basket_ids, holes, repeats = (np.array(column, dtype=np.int64) for column in zip(*joined))
+        self.basket_ids, basket = np.unique(basket_ids, return_inverse=True)
+
+        def weighted(per_hole):
+            return np.bincount(basket, weights=per_hole[holes] * repeats, minlength=len(self.basket_ids))
+
+        # COUNT(DISTINCT ScoreID): each hole's scores once per basket
+        distinct = np.unique(basket * len(counts) + holes)
+        attempts = np.bincount(distinct // len(counts), weights=counts[distinct % len(counts)],
+                               minlength=len(self.basket_ids))
+        self.basket_stats = np.stack(
+            [weighted(counts), weighted(sums)] + [weighted(column) for column in by_strokes] + [attempts],
+            axis=1,
+        ).astype(np.int64)
+
+class _Season:
+    """Players, events and one partial per event; replaced, never modified"""
+
+    def __init__(self, players, events, partials):
+        self.players = players
+        self.events = events
+        self.partials = partials
+
+    def window(self, event_limit, by_dates, with_layout=False):
+        """EventIDs in a window, newest first
+
+        by_dates: last N means the events on the N most recent EventDates
+            (DISTINCT TOP (N) EventDate), otherwise the N most recent events
+        with_layout: only events with EventLayout rows count
+        """
+        window = parse_window(event_limit)
+        recent = self.events.recent_with_layout if with_layout else self.events.recent
+        if window == 'all':
+            return recent
+        if window == 'latest':
+            window = 1
+        elif not by_dates:
+            return recent[:window]
+        date_ranks = self.events.date_ranks_with_layout if with_layout else self.events.date_ranks
+        return recent[:bisect_left(date_ranks, window)]
+
+# ============================================
+# ENGINE
+# ============================================
+
+class StatsEngine:
+    """Course, podium and windowed leaderboard stats from per-event partials"""
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.Lock()       # guards the pending changes
+        self._load_lock = threading.Lock()  # one refresh at a time
+        self._season = None
+        self._loaded_at = None
+        self._pending_all = True
+        self._pending_players = False
+        self._pending_events = False
+        self._pending_scores = set()
+        # While a background reload runs: changes applied to the current
+        # season since it started, as [all, players, events, score events]
+        self._refreshing = None
+
+    # ----- changes (call after the write has committed) -----
+
+    def tables_changed(self, tables, events=None):
+        """Note a committed write; the next read reloads what it affects
+
+        events: EventIDs whose scores the write changed, if known; without
+        them a Score or Scorecard write reloads every event.
+        """
+        with self._lock:
+            if 'Player' in tables:
+                self._pending_players = True
+            if 'Event' in tables:
+                self._pending_events = True
+            if 'Score' in tables or 'Scorecard' in tables:
+                if events is None:
+                    self._pending_all = True
+                else:
+                    self._pending_scores.update(events)
+
+    def reset(self):
+        """Forget everything; the next read reloads it all"""
+        with self._lock:
+            self._pending_all = True
+
+    # ----- loading -----
+
+    def season(self):
+        """The current season, after applying the pending changes
+
+        With nothing pending this returns at once, without waiting for a
+        reload in progress. A season older than max_age is still returned
+        while a background thread reloads everything (see _refresh).
+        """
+        with self._lock:
+            if self._season is not None and not (self._pending_all or self._pending_players
+                                                 or self._pending_events or self._pending_scores):
+                if (self._refreshing is None and self._loaded_at is not None
+                        and time.monotonic() - self._loaded_at > self.max_age):
+                    self._refreshing = [False, False, False, set()]
+                    threading.Thread(target=self._refresh, name='stats-refresh', daemon=True).start()
+                return self._season
+        with self._load_lock:
+            with self._lock:
+                full = self._pending_all or self._season is None
+                players, events = self._pending_players, self._pending_events
+                scores = set(self._pending_scores)
+                self._pending_all = self._pending_players = self._pending_events = False
+                self._pending_scores = set()
+            if not (full or players or events or scores):
+                return self._season
+            try:
+                started = time.perf_counter()
+                if full or len(scores) > MAX_EVENT_RELOAD:
+                    self._season, loaded = self._load_all(), 'everything'
+                else:
+                    self._season, loaded = self._load_changes(players, events, scores)
+                print(f"[STATS] Reloaded {loaded} in {(time.perf_counter() - started) * 1000:.1f} ms")
+            except Exception:
+                # Try again on the next read
+                with self._lock:
+                    self._pending_all = self._pending_all or full
+                    self._pending_players = self._pending_players or players
+                    self._pending_events = self._pending_events or events
+                    self._pending_scores.update(scores)
+                raise
+            with self._lock:
+                if self._refreshing is not None:
+                    applied = self._refreshing
+                    applied[0] = applied[0] or full
+                    applied[1] = applied[1] or players
+                    applied[2] = applied[2] or events
+                    applied[3].update(scores)
+            return self._season
+
+    def _refresh(self):
+        """Reload everything off the request path, then swap the new season in
+
+        Changes applied to the current season while this one loaded are
+        marked pending again, so the next read applies them on top of it.
+        """
+        started = time.perf_counter()
+        try:
+            season = self._load_all()
+        except Exception as e:
+            print(f"[STATS] Background reload failed: {e}")
+            with self._lock:
+                self._refreshing = None
+            return
+        with self._load_lock:
+            with self._lock:
+                full, players, events, scores = self._refreshing
+                self._refreshing = None
+                if full:
+                    # A read reloaded everything meanwhile; that season is newer
+                    return
+                self._season = season
+                self._pending_players = self._pending_players or players
+                self._pending_events = self._pending_events or events
+                self._pending_scores.update(scores)
+        print(f"[STATS] Reloaded everything in the background in "
+              f"{(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def _load_all(self):
+        batch = execute_batch(
+            PLAYERS_QUERIES + EVENTS_QUERIES + [('scores', SCORES_SQL.format(where=''), None)]
+        )
+        players, events = _Players(batch['players']), _Events(batch)
+        season = _Season(players, events, self._partials(events, players, batch['scores']))
+        self._loaded_at = time.monotonic()
+        return season
+
+    def _load_changes(self, players_changed, events_changed, changed):
+        previous = self._season
+        queries = []
+        if players_changed:
+            queries += PLAYERS_QUERIES
+        if events_changed:
+            queries += EVENTS_QUERIES
+        batch = execute_batch(queries) if queries else {}
+        players = _Players(batch['players']) if players_changed else previous.players
+        events = _Events(batch) if events_changed else previous.events
+
+        if events_changed:
+            # New events, and events whose name or date changed, are rebuilt
+            changed |= {
+                event_id for event_id, details in events.by_id.items()
+                if previous.events.by_id.get(event_id) != details
+            }
+        changed = {event_id for event_id in changed if event_id in events.by_id}
+        partials = {
+            event_id: partial.ranked(players) if players_changed else partial
+            for event_id, partial in previous.partials.items()
+            if event_id in events.by_id and event_id not in changed
+        }
+        if changed:
+            changed = sorted(changed)
+            marks = ", ".join("?" * len(changed))
+            scores = execute_query(SCORES_SQL.format(where=f"WHERE sc.EventID IN ({marks})"), changed)
+            partials.update(self._partials(events, players, scores, changed))
+        loaded = [name for name, flag in (('players', players_changed), ('events', events_changed)) if flag]
+        if changed:
+            loaded.append(f"{len(changed)} event(s)")
+        return _Season(players, events, partials), ', '.join(loaded)
+
+    def _partials(self, events, players, scores, event_ids=None):
+        """{EventID: _EventPartial} for event_ids (default: every event) from SCORES_SQL rows"""
+        columns = list(zip(*scores.raw)) if scores.raw else [()] * 5
+        score_events, scorecards, player_ids, holes, strokes = (
+            np.array(column, dtype=np.int64) for column in columns
+        )
+        partials = {}
+        for event_id in (events.by_id if event_ids is None else event_ids):
+            start, end = np.searchsorted(score_events, [event_id, event_id + 1])
+            partials[event_id] = _EventPartial(
+                event_id, events, players,
+                scorecards[start:end], player_ids[start:end], holes[start:end], strokes[start:end],
+            )
+        return partials
+
+    # ----- stats -----
+
+    def hole_difficulty(self, event_limit='all'):
+        """vw_HoleDifficultyRanking rows for the events in a window
+
+        ORDER BY AvgScore, or EventDate DESC, AvgScore for last-N windows.
+        """
+        season = self.season()
+        event_ids = season.window(event_limit, by_dates=parse_window(event_limit) == 'latest', with_layout=True)
+        partials = [season.partials[event_id] for event_id in event_ids]
+        rows = [row for partial in partials for row in partial.hole_rows]
+        averages = _concat([partial.hole_averages for partial in partials], dtype=np.float64)
+        if isinstance(parse_window(event_limit), int):
+            date_ranks = dict(zip(season.events.recent_with_layout, season.events.date_ranks_with_layout))
+            dates = _concat([np.full(len(partial.hole_rows), date_ranks[partial.event_id]) for partial in partials])
+            order = np.lexsort((averages, dates))
+        else:
+            order = np.argsort(averages, kind='stable')
+        return Rows(HOLE_DIFFICULTY_COLUMNS, [rows[i] for i in order.tolist()])
+
+    def basket_stats(self, event_limit='all'):
+        """vw_HardestBaskets rows over the events in a window, ORDER BY DifficultyRank"""
+        season = self.season()
+        event_ids = season.window(event_limit, by_dates=parse_window(event_limit) == 'latest', with_layout=True)
+        partials = [season.partials[event_id] for event_id in event_ids]
+        basket_ids = _concat([partial.basket_ids for partial in partials])
+        if not len(basket_ids):
+            return Rows(BASKET_COLUMNS, [])
+        stats = np.concatenate([partial.basket_stats for partial in partials])
+        ids, basket = np.unique(basket_ids, return_inverse=True)
+        totals = np.stack(
+            [np.bincount(basket, weights=stats[:, column], minlength=len(ids)) for column in range(stats.shape[1])],
+            axis=1,
+        ).astype(np.int64)
+        # Each event is its own layout, so COUNT(DISTINCT LayoutID) is the events that scored on it
+        times_used = np.bincount(basket, minlength=len(ids))
+
+        counts, sums = totals[:, BASKET_COUNTS], totals[:, BASKET_SUMS]
+        averages = sums / counts
+        ratings = np.select(
+            [averages < 1.0, averages < 1.5, averages < 2.0, averages < 2.5],
+            ['Extremely Difficult', 'Very Difficult', 'Difficult', 'Moderate'],
+            'Easy',
+        )
+        ranks = _rank_ascending(averages)
+
+        details = [season.events.baskets[basket_id] for basket_id in ids.tolist()]
+        rows = list(zip(
+            [row['Brand'] for row in details],
+            [row['Model'] for row in details],
+            [row['ChainCount'] for row in details],
+            [_yes_no(row['HasUpperBand']) for row in details],
+            times_used.tolist(),
+            totals[:, BASKET_ATTEMPTS].tolist(),
+            (_rounded(sums, counts, 2) / 100).tolist(),
+            totals[:, BASKET_ZEROS].tolist(),
+            totals[:, BASKET_ONES].tolist(),
+            totals[:, BASKET_TWOS].tolist(),
+            totals[:, BASKET_THREES].tolist(),
+            ratings.tolist(),
+            ranks.tolist(),
+        ))
+        order = np.argsort(ranks, kind='stable')
+        return Rows(BASKET_COLUMNS, [rows[i] for i in order.tolist()])
+
+    def _rounds(self, season, event_ids):
+        """(player index, round total, division rank) over the events' rounds by existing players"""
+        partials = [season.partials[event_id] for event_id in event_ids]
+        return (
+            _concat([partial.round_index for partial in partials]),
+            _concat([partial.round_total[partial.round_known] for partial in partials]),
+            _concat([partial.round_rank for partial in partials]),
+        )
+
+    def podium(self, event_limit='all'):
+        """vw_PodiumPercentage over the events in a window, ORDER BY PodiumPercentage DESC
+
+        A podium finish is a round ranked in the top 3 of its skill division
+        at its event. Last-N windows cover the N most recent event dates.
+        """
+        season = self.season()
+        player, _, ranks = self._rounds(season, season.window(event_limit, by_dates=True))
+        rounds = np.bincount(player, minlength=len(season.players.ids))
+        finishes = np.bincount(player[ranks <= 3], minlength=len(season.players.ids))
+        ranked = np.flatnonzero(rounds)
+        percentages = _rounded(100 * finishes[ranked], rounds[ranked], 1)
+        rows = list(zip(
+            [season.players.name(i) for i in ranked.tolist()],
+            [season.players.divisions[i] for i in ranked.tolist()],
+            finishes[ranked].tolist(),
+            rounds[ranked].tolist(),
+            _decimals(percentages),
+        ))
+        order = np.argsort(-percentages, kind='stable')
+        return Rows(PODIUM_COLUMNS, [rows[i] for i in order.tolist()])
+
+    def leaderboard(self, division, event_limit):
+        """Leaderboard over the latest event or the last N event dates
+
+        latest: one row per round of the most recent event; last N: per
+        player, rounds played, total and best round. DivisionRank numbers
+        the rows within each division by total, highest first. Sorted by
+        division, then total (just total when filtered to one division).
+        """
+        season = self.season()
+        players = season.players
+        latest = parse_window(event_limit) == 'latest'
+        event_ids = season.events.recent[:1] if latest else season.window(event_limit, by_dates=True)
+        player, totals, _ = self._rounds(season, event_ids)
+        if division:
+            keep = np.array([players.divisions[i] == division for i in player.tolist()], dtype=bool)
+            player, totals = player[keep], totals[keep]
+        if latest:
+            rounds, high, best = np.ones(len(player), dtype=np.int64), totals, totals
+        else:
+            player, inverse = np.unique(player, return_inverse=True)
+            rounds = np.bincount(inverse, minlength=len(player))
+            high = np.bincount(inverse, weights=totals, minlength=len(player)).astype(np.int64)
+            best = np.full(len(player), np.iinfo(np.int64).min)
+            np.maximum.at(best, inverse, totals)
+
+        # ROW_NUMBER() OVER (PARTITION BY SkillDivision ORDER BY total DESC)
+        division_codes = players.division_codes[player]
+        order = np.lexsort((players.ids[player], -high, division_codes))
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(len(order)) - _partition_starts(division_codes[order]) + 1
+
+        names = player.tolist()
+        columns = {
+            'SkillDivision': [players.divisions[i] for i in names],
+            'FirstName': [players.first_names[i] for i in names],
+            'LastName': [players.last_names[i] for i in names],
+            'RoundsPlayed': rounds.tolist(),
+            'HighTotal': high.tolist(),
+            'BestScorecardTotal': best.tolist(),
+            'DivisionRank': ranks.tolist(),
+        }
+        order_columns = LATEST_LEADERBOARD_COLUMNS if latest else WINDOWED_LEADERBOARD_COLUMNS
+        rows = list(zip(*[columns[column] for column in order_columns]))
+        if division:
+            keys = [-total for total in columns['HighTotal']]
+        else:
+            # SQL Server sorts NULL first
+            keys = [(value is not None, value or '', -total)
+                    for value, total in zip(columns['SkillDivision'], columns['HighTotal'])]
+        order = sorted(range(len(rows)), key=keys.__getitem__)
+        return Rows(order_columns, [rows[i] for i in order])
+
+    def head_to_head(self, player_ids=None, event_limit='all'):
+        """head_to_head() over the rounds of the last N event dates (or latest / all)"""
+        season = self.season()
+        partials = [season.partials[event_id] for event_id in season.window(event_limit, by_dates=True)]
+        return head_to_head(
+            _concat([np.full(len(partial.round_total), partial.event_id) for partial in partials]),
+            _concat([partial.round_player for partial in partials]),
+            _concat([partial.round_total for partial in partials]),
+            player_ids,
+        )
+
+    # ----- verification -----
+
+    def verify(self):
+        """Compare the engine's all-events rows with the views'
+
+        Returns, per view, whether the rows match (as multisets, DECIMALs
+        compared by value) and the rows found only in one of them.
+        """
+        def key(row, columns):
+            return tuple(
+                float(row[column]) if isinstance(row[column], Decimal) else row[column]
+                for column in columns
+            )
+
+        report = {"consistent": True}
+        for view, columns, rows in (
+            ('vw_HoleDifficultyRanking', HOLE_DIFFICULTY_COLUMNS, self.hole_difficulty()),
+            ('vw_HardestBaskets', BASKET_COLUMNS, self.basket_stats()),
+            ('vw_PodiumPercentage', PODIUM_COLUMNS, self.podium()),
+        ):
+            expected = Counter(key(row, columns) for row in execute_query(f"SELECT * FROM {view}"))
+            actual = Counter(key(row, columns) for row in rows)
+            only_view = list((expected - actual).elements())
+            only_engine = list((actual - expected).elements())
+            report[view] = {
+                "consistent": not only_view and not only_engine,
+                "viewRows": sum(expected.values()),
+                "engineRows": sum(actual.values()),
+                "onlyInView": [dict(zip(columns, k)) for k in sorted(only_view, key=repr)],
+                "onlyInEngine": [dict(zip(columns, k)) for k in sorted(only_engine, key=repr)],
+            }
+            report["consistent"] = report["consistent"] and report[view]["consistent"]
+        return report
+
+stats_engine = StatsEngine(max_age=STATS_ENGINE_CONFIG['max_age'])
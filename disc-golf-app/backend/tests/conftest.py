@@ -0,0 +1,35 @@
+"""
+Shared fixtures: a small generated season in the SQLite stand-in database
+(see benchmarks/standin.py), served through the app's connection pool
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+from benchmarks import standin
+
+@pytest.fixture(scope='module')
+def database(tmp_path_factory):
+    """A fresh stand-in database per test module, with the pool pointed at it"""
+    path = tmp_path_factory.mktemp('standin') / 'league.db'
+    database, _ = standin.build_database(path, players=120, events=12, players_per_event=24, seed=11)
+    original = db.pool._connect
+    db.pool.close_all()
+    db.pool._connect = database.connect
+    yield database
+    db.pool.close_all()
+    db.pool._connect = original
+
+@pytest.fixture
+def client(database):
+    """Flask test client, with nothing cached from another module's database"""
+    from app import app, leaderboard_engine, stats_cache
+    from stats import stats_engine
+    stats_cache.clear()
+    stats_engine.reset()
+    leaderboard_engine.reset()
+    return app.test_client()
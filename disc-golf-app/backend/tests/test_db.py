@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+import db
+
+def run_concurrently(sql, runs, unit_factory=lambda: None):
+    """Call _single_flight(sql) from two threads whose queries overlap; returns (results, sources, calls)"""
+    calls = []
+    started, release = threading.Event(), threading.Event()
+    results, sources = [None, None], [None, None]
+
+    def run():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ['row']
+
+    def caller(i):
+        unit = unit_factory()
+        if unit is not None:
+            db._current_unit.set(unit)
+        timer = db._QueryTimer('query', sql)
+        results[i] = db._single_flight(sql, [1], timer, run)
+        sources[i] = timer.source
+
+    first = threading.Thread(target=caller, args=(0,))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=caller, args=(1,))
+    second.start()
+    # Give the second caller time to join (or start its own query)
+    second.join(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+    return results, sources, len(calls)
+
+def test_identical_reads_share_one_query():
+    results, sources, calls = run_concurrently("SELECT * FROM Player WHERE PlayerID = ?", 2)
+    assert calls == 1
+    assert results == [['row'], ['row']]
+    assert sorted(sources) == ['coalesced', 'primary']
+
+def test_locking_reads_are_never_shared():
+    _, _, calls = run_concurrently("SELECT * FROM Score WITH (UPDLOCK, ROWLOCK) WHERE ScoreID = ?", 2)
+    assert calls == 2
+
+def test_reads_in_a_write_request_are_not_shared():
+    _, _, calls = run_concurrently("SELECT * FROM Player WHERE PlayerID = ?", 2,
+                                   unit_factory=lambda: db.UnitOfWork(db.pool))
+    assert calls == 2
+
+def test_reads_in_a_read_only_request_are_shared():
+    _, _, calls = run_concurrently("SELECT * FROM Player WHERE PlayerID = ?", 2,
+                                   unit_factory=lambda: db.UnitOfWork(db.pool, read_only=True))
+    assert calls == 1
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT  a ,\n b FROM t WHERE x = 'a  b'", "SELECT a , b FROM t WHERE x = 'a  b'"),
+    ("SELECT 'it''s   here'   FROM t", "SELECT 'it''s   here' FROM t"),
+])
+def test_normalize_sql_keeps_literals(sql, expected):
+    assert db.normalize_sql(sql) == expected
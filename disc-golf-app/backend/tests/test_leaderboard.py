@@ -0,0 +1,30 @@
+import db
+from leaderboard import leaderboard_engine
+
+def test_engine_matches_the_view(client):
+    report = leaderboard_engine.verify()
+    assert report['consistent'], report
+
+def test_load_waits_for_writes_in_flight(client):
+    view = client.get('/api/leaderboard?eventLimit=all').get_json()
+    leaderboard_engine.reset()
+    leaderboard_engine.write_started()
+    try:
+        # The snapshot might already hold the write; read the view instead
+        assert leaderboard_engine.rows() is None
+        assert client.get('/api/leaderboard?eventLimit=all').get_json() == view
+    finally:
+        leaderboard_engine.write_finished()
+    assert leaderboard_engine.rows() is not None
+
+def test_rolled_back_write_is_no_longer_in_flight(client):
+    from app import leaderboard_delta
+    applied = []
+    db.begin_unit_of_work()
+    try:
+        leaderboard_delta(lambda: applied.append(True))
+        assert leaderboard_engine._in_flight == 1
+    finally:
+        db.end_unit_of_work()
+    assert leaderboard_engine._in_flight == 0
+    assert applied == []
@@ -0,0 +1,86 @@
+from live import LiveHub, LiveStream, _ranks
+
+def test_ranks_share_ties_and_skip_after_them():
+    standings = {
+        (1, 1): (30, 'Advanced'),
+        (1, 2): (30, 'Recreational'),
+        (2, 3): (28, 'Advanced'),
+        (2, 4): (31, 'Advanced'),
+        (3, 5): (28, 'Recreational'),
+    }
+    assert _ranks(standings) == {
+        (2, 4): (1, 1),
+        (1, 1): (2, 2),
+        (1, 2): (2, 1),
+        (2, 3): (4, 3),
+        (3, 5): (4, 2),
+    }
+
+def test_ranks_of_nothing():
+    assert _ranks({}) == {}
+
+def total(scorecard_id, player_id, round_total, division='Advanced'):
+    return {'ScorecardID': scorecard_id, 'PlayerID': player_id, 'SkillDivision': division,
+            'RoundTotal': round_total, 'HolesPlayed': 9}
+
+def test_delta_carries_rank_changes_once_standings_are_loaded():
+    hub = LiveHub(history=10)
+    hub.subscribe(1, lambda event_id: [total(10, 1, 20), total(10, 2, 18)])
+    seq = hub.current_seq()
+    hub.publish(1, totals=[total(10, 2, 21)])
+    messages, reset = hub.messages_after(1, seq)
+    assert not reset
+    (_, kind, data), = messages
+    assert kind == 'delta'
+    assert {(rank['playerId'], rank['previousRank'], rank['rank']) for rank in data['ranks']} == {(2, 2, 1), (1, 1, 2)}
+
+def test_resume_replays_missed_messages_and_resets_when_they_are_gone():
+    hub = LiveHub(history=2)
+    start = hub.subscribe(1, lambda event_id: [])
+    for strokes in (1, 2, 3):
+        hub.publish(1, scores=[{'strokes': strokes}])
+    messages, reset = hub.messages_after(1, hub.current_seq() - 1)
+    assert not reset and [data['scores'][0]['strokes'] for _, _, data in messages] == [3]
+    # The first message fell out of the history
+    assert hub.messages_after(1, start) == ([], True)
+    # Ids from an earlier process are past this one's sequence
+    assert hub.messages_after(1, hub.current_seq() + 1000) == ([], True)
+
+def test_stream_sends_reset_for_an_unresumable_id():
+    hub = LiveHub(history=1)
+    start = hub.subscribe(1, lambda event_id: [])
+    hub.publish(1, scores=[{'strokes': 1}])
+    hub.publish(1, scores=[{'strokes': 2}])
+    first = next(iter(LiveStream(hub, 1, start, resumed=True)))
+    assert 'event: reset' in first
+
+def test_deleted_event_ends_the_stream():
+    hub = LiveHub(history=10)
+    seq = hub.subscribe(1, lambda event_id: [])
+    hub.publish_deleted(1)
+    chunks = list(LiveStream(hub, 1, seq, resumed=False, heartbeat=0.01))
+    assert 'event: ready' in chunks[0] and 'event: deleted' in ''.join(chunks)
+
+def test_writes_to_another_event_do_not_hold_up_the_standings():
+    hub = LiveHub(history=10)
+    hub.subscribe(2, lambda event_id: [])
+
+    def load(event_id):
+        hub.publish(2, totals=[total(20, 1, 10)])
+        return [total(10, 1, 20)]
+
+    hub.subscribe(1, load)
+    seq = hub.current_seq()
+    hub.publish(1, totals=[total(10, 2, 25)])
+    (_, _, data), = hub.messages_after(1, seq)[0]
+    assert [rank['playerId'] for rank in data['ranks'] if rank['rank'] == 1] == [2]
+
+def test_feeds_are_kept_only_while_watched():
+    hub = LiveHub(history=10, idle_ttl=0)
+    hub.publish(1, scores=[{'strokes': 1}])
+    assert hub.stats()['events'] == 0
+    hub.subscribe(1, lambda event_id: [])
+    hub.unsubscribe(1)
+    # Another event's first subscriber sweeps the idle feed
+    hub.subscribe(2, lambda event_id: [])
+    assert hub.stats()['events'] == 1
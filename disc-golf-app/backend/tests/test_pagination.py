@@ -0,0 +1,64 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import db
+from pagination import InvalidPageRequest, decode_cursor, encode_cursor
+
+def test_cursor_round_trip_keeps_types():
+    values = [datetime(2026, 5, 1, 18, 30), date(2026, 5, 1), Decimal('1.50'), "O'Brien", 7, None]
+    decoded = decode_cursor(encode_cursor(values), len(values))
+    assert decoded == values
+    assert [type(value) for value in decoded] == [type(value) for value in values]
+    assert str(decoded[2]) == '1.50'
+
+@pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor([1, 2, 3]), encode_cursor([{'x': 1}, 2])])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidPageRequest):
+        decode_cursor(cursor, 2)
+
+def walk(client, path, limit):
+    """Every item of a paged list, following the next cursors"""
+    items, after = [], None
+    while True:
+        query = f"?limit={limit}" + (f"&after={after}" if after else '')
+        body = client.get(path + query).get_json()
+        assert len(body['items']) <= limit
+        items.extend(body['items'])
+        after = body['next']
+        if after is None:
+            return items
+
+@pytest.mark.parametrize('path, key', [
+    ('/api/players', 'PlayerID'),
+    ('/api/events', 'EventID'),
+    ('/api/scorecards', 'ScorecardID'),
+])
+def test_pages_cover_the_whole_list_in_order(client, path, key):
+    everything = client.get(path).get_json()
+    assert len(everything) > 7
+    paged = walk(client, path, 7)
+    assert [item[key] for item in paged] == [item[key] for item in everything]
+
+def test_player_history_pages_number_the_whole_history(client):
+    player_id, = db.execute_query(
+        "SELECT TOP 1 PlayerID FROM RoundTotals GROUP BY PlayerID ORDER BY COUNT(*) DESC, PlayerID"
+    ).raw[0]
+    path = f"/api/players/{player_id}/history"
+    everything = client.get(path).get_json()
+    assert len(everything) > 2
+    paged = walk(client, path, 2)
+    assert paged == everything
+    assert [item['ScoreRank'] for item in paged] == list(range(1, len(paged) + 1))
+    assert [item['CountsTowardTotal'] for item in paged[:4]] == ['Yes', 'Yes', 'Yes', 'No'][:len(paged)]
+    # Same rounds as the view, whose ROW_NUMBER() may order tied totals differently
+    view = db.execute_query("SELECT * FROM vw_PlayerScoreHistory WHERE PlayerID = ?", [player_id])
+    columns = ('ScorecardID', 'EventID', 'EventName', 'ScorecardTotal', 'LastName')
+    assert sorted(tuple(row[c] for c in columns) for row in paged) == \
+        sorted(tuple(row[c] for c in columns) for row in view)
+
+def test_invalid_page_arguments_are_a_400(client):
+    assert client.get('/api/players?limit=0').status_code == 400
+    assert client.get('/api/players?limit=x').status_code == 400
+    assert client.get('/api/players?after=garbage').status_code == 400
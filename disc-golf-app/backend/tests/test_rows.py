@@ -0,0 +1,27 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from rows import Rows, encode_rows
+
+def default(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+def test_encode_rows_matches_json_dumps():
+    rows = Rows(('b', 'a', 'c'), [
+        (1, 'x', 1.5),
+        (None, 'ünï "q"', float('nan')),
+        (True, date(2026, 5, 1), Decimal('2.50')),
+        (2, datetime(2026, 5, 1, 18, 0), None),
+    ])
+    assert encode_rows(rows, default) == json.dumps(rows.to_dicts(), default=default, sort_keys=True)
+    assert encode_rows(rows, default, sort_keys=False) == json.dumps(rows.to_dicts(), default=default)
+
+def test_encode_empty_rows():
+    assert encode_rows(Rows(('a',), []), default) == '[]'
+
+def test_columnar_and_records():
+    rows = Rows(('PlayerID', 'Name'), [(1, 'Ann'), (2, 'Bo')])
+    assert rows.columnar() == {"columns": ['PlayerID', 'Name'], "rows": [[1, 'Ann'], [2, 'Bo']]}
+    assert rows[1]['Name'] == 'Bo' and dict(rows[0]) == {'PlayerID': 1, 'Name': 'Ann'}
+    assert rows[:1].to_dicts() == [{'PlayerID': 1, 'Name': 'Ann'}]
@@ -0,0 +1,33 @@
+from sqlite_compat import translate
+
+def statements(sql):
+    return [text for kind, text, _, _ in translate(sql)]
+
+def test_top_becomes_limit_and_hints_are_dropped():
+    text, = statements("SELECT DISTINCT TOP (?) EventDate FROM Event WITH (NOLOCK) ORDER BY EventDate DESC")
+    assert 'TOP' not in text and 'NOLOCK' not in text
+    assert text.rstrip().endswith('LIMIT ?1')
+
+def test_string_concatenation_and_isnull():
+    text, = statements("SELECT FirstName + ' ' + LastName, ISNULL(Elevation, 0) FROM Player")
+    assert "FirstName || ' ' || LastName" in text and 'IFNULL(Elevation, 0)' in text
+
+def test_merge_into_a_scope_cte_becomes_delete_and_insert():
+    delete, insert = statements("""
+        WITH ScopeTotals AS (
+            SELECT ScorecardID, PlayerID, RoundTotal FROM RoundTotals WITH (HOLDLOCK)
+            WHERE ScorecardID = ? AND PlayerID IN (?, ?)
+        )
+        MERGE ScopeTotals AS t
+        USING (SELECT ScorecardID, PlayerID, SUM(Strokes) AS RoundTotal FROM Score
+               WHERE ScorecardID = ? AND PlayerID IN (?, ?) GROUP BY ScorecardID, PlayerID) AS src
+        ON t.ScorecardID = src.ScorecardID AND t.PlayerID = src.PlayerID
+        WHEN MATCHED THEN UPDATE SET RoundTotal = src.RoundTotal
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT (ScorecardID, PlayerID, RoundTotal) VALUES (src.ScorecardID, src.PlayerID, src.RoundTotal)
+        WHEN NOT MATCHED BY SOURCE THEN
+            DELETE
+    """)
+    assert delete.split() == 'DELETE FROM RoundTotals WHERE ScorecardID = ?1 AND PlayerID IN (?2, ?3)'.split()
+    assert insert.startswith('INSERT INTO RoundTotals (ScorecardID, PlayerID, RoundTotal) SELECT')
+    assert '?4' in insert and '?6' in insert
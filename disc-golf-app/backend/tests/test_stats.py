@@ -0,0 +1,87 @@
+import time
+from collections import Counter
+from decimal import Decimal
+
+import pytest
+
+import db
+from stats import STATS_ENGINE_CONFIG, head_to_head, stats_engine
+
+def as_counter(rows, skip=()):
+    """Rows as a multiset of tuples, DECIMALs compared by value"""
+    return Counter(
+        tuple(float(value) if isinstance(value, Decimal) else value
+              for column, value in zip(rows.columns, row) if column not in skip)
+        for row in rows.raw
+    )
+
+@pytest.fixture
+def app_module(client):
+    import app
+    return app
+
+def without_engine(monkeypatch, fetch, *args):
+    monkeypatch.setitem(STATS_ENGINE_CONFIG, 'enabled', False)
+    try:
+        return fetch.uncached(*args)
+    finally:
+        monkeypatch.setitem(STATS_ENGINE_CONFIG, 'enabled', True)
+
+def test_engine_matches_the_views(client):
+    report = stats_engine.verify()
+    assert report['consistent'], report
+
+@pytest.mark.parametrize('event_limit', ['latest', '3', 'all'])
+def test_windows_match_the_sql_fallback(app_module, monkeypatch, event_limit):
+    for fetch in (app_module.fetch_podium_stats, app_module.fetch_basket_stats):
+        assert as_counter(fetch.uncached(event_limit)) == as_counter(without_engine(monkeypatch, fetch, event_limit))
+    if event_limit != 'all':
+        # Row numbers within equal totals are arbitrary in SQL
+        fetch = app_module.fetch_windowed_leaderboard
+        assert as_counter(fetch.uncached(None, event_limit), skip=('DivisionRank',)) == \
+            as_counter(without_engine(monkeypatch, fetch, None, event_limit), skip=('DivisionRank',))
+
+def test_score_edit_reloads_its_event(client):
+    stats_engine.verify()
+    score = db.execute_query("""
+        SELECT TOP 1 s.ScoreID, s.Strokes, sc.CreatedByPlayerID, sc.EventID
+        FROM Score s JOIN Scorecard sc ON s.ScorecardID = sc.ScorecardID
+        ORDER BY s.ScoreID
+    """)[0]
+    before = stats_engine.season().partials
+    response = client.put(f"/api/scores/{score['ScoreID']}",
+                          json={'playerId': score['CreatedByPlayerID'], 'strokes': (score['Strokes'] + 1) % 4})
+    assert response.status_code == 200
+    after = stats_engine.season().partials
+    changed = {event_id for event_id in after if after[event_id] is not before[event_id]}
+    assert changed == {score['EventID']}
+    assert stats_engine.verify()['consistent']
+
+def test_head_to_head_uses_each_players_best_round():
+    # Event 1: player 1 plays twice (best 30), player 2 scores 25; event 2: a tie
+    rows = head_to_head(
+        event_ids=[1, 1, 1, 2, 2, 3],
+        player_ids=[1, 1, 2, 1, 2, 3],
+        totals=[20, 30, 25, 22, 22, 40],
+    )
+    assert [tuple(row) for row in rows.raw] == [(1, 2, 2, 1, 0, 1, 2.5)]
+    assert len(head_to_head([1, 1], [1, 2], [10, 12], selected=[1])) == 0
+
+def test_head_to_head_route_matches_without_engine(app_module, monkeypatch):
+    fetch = app_module.fetch_head_to_head
+    assert as_counter(fetch.uncached(None, '3')) == as_counter(without_engine(monkeypatch, fetch, None, '3'))
+    assert app_module.app.test_client().get('/api/stats/head-to-head?players=1,x').status_code == 400
+
+def test_old_season_is_reloaded_in_the_background(client, monkeypatch):
+    current = stats_engine.season()
+    monkeypatch.setattr(stats_engine, 'max_age', 0)
+    # Served at once, and not blocked by a reload holding the load lock
+    with stats_engine._load_lock:
+        assert stats_engine.season() is current
+    for _ in range(200):
+        if stats_engine.season() is not current:
+            break
+        time.sleep(0.01)
+    monkeypatch.setattr(stats_engine, 'max_age', 300)
+    assert stats_engine.season() is not current
+    assert stats_engine.verify()['consistent']
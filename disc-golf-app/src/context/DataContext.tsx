@@ -108,43 +108,30 @@ export const DataProvider = ({ children }: DataProviderProps) => {
       // Default to 'latest' for stats on initial load
       const defaultFilter: EventLimitFilter = 'latest';
       
-      const [
-        playerData,
-        eventsData,
-        playersData,
-        leaderboardData,
-        historyData,
-        scorecardsData,
-        hotRoundsData,
-        podiumStatsData,
-        topCardsData,
-        holeDifficultyData,
-        basketStatsData,
-      ] = await Promise.all([
-        api.getPlayer(CURRENT_PLAYER_ID),
-        api.getEvents(),
-        api.getPlayers(),
-        api.getLeaderboard(undefined, defaultFilter),
-        api.getPlayerHistory(CURRENT_PLAYER_ID),
-        api.getPlayerScorecards(CURRENT_PLAYER_ID),
-        api.getHotRounds(defaultFilter),
-        api.getPodiumStats(defaultFilter),
-        api.getTopCards(defaultFilter),
-        api.getHoleDifficulty(defaultFilter),
-        api.getBasketStats(defaultFilter),
-      ]);
+      // One request for everything first paint needs; the server runs the queries concurrently
+      const bootstrap = await api.getBootstrap(CURRENT_PLAYER_ID, defaultFilter);
       
-      setPlayer(playerData);
-      setEvents(eventsData);
-      setPlayers(playersData);
-      setLeaderboard(leaderboardData);
-      setPlayerHistory(historyData);
-      setPlayerScorecards(scorecardsData);
-      setHotRounds(hotRoundsData);
-      setPodiumStats(podiumStatsData);
-      setTopCards(topCardsData);
-      setHoleDifficulty(holeDifficultyData);
-      setBasketStats(basketStatsData);
+      for (const [section, { error: sectionError }] of Object.entries(bootstrap)) {
+        if (sectionError) {
+          console.warn(`[DEV] Bootstrap section '${section}' failed:`, sectionError);
+        }
+      }
+      
+      setPlayer(bootstrap.player.data);
+      setEvents(bootstrap.events.data);
+      setPlayers(bootstrap.players.data);
+      setLeaderboard(bootstrap.leaderboard.data);
+      setPlayerHistory(bootstrap.history.data);
+      setPlayerScorecards(bootstrap.scorecards.data);
+      setHotRounds(bootstrap.hotRounds.data);
+      setPodiumStats(bootstrap.podium.data);
+      setTopCards(bootstrap.topCards.data);
+      setHoleDifficulty(bootstrap.holeDifficulty.data);
+      setBasketStats(bootstrap.basketStats.data);
+      
+      if (bootstrap.player.error) {
+        setError(bootstrap.player.error);
+      }
     } catch (err) {
       console.error('Failed to load initial data:', err);
       setError(err instanceof Error ? err.message : 'Failed to connect to server');
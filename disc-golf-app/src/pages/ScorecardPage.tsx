@@ -711,12 +711,14 @@ const ScorecardPage = () => {
     
     setUpdating(true);
     try {
-      // Update each score
-      const updatePromises = Object.entries(editedScores).map(([_, scoreData]) =>
-        api.updateScore(scoreData.scoreId, scoreData.strokes, player.PlayerID)
-      );
-      
-      await Promise.all(updatePromises);
+      // Update all edited scores in one request
+      const updates = Object.values(editedScores).map(scoreData => ({
+        scoreId: scoreData.scoreId,
+        strokes: scoreData.strokes,
+      }));
+      if (updates.length > 0) {
+        await api.updateScores(updates, player.PlayerID);
+      }
       
       // Reload scorecard data without auto-navigating (stay on current hole after editing)
       await loadScorecardDetails(activeScorecard.ScorecardID, false);
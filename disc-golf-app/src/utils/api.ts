@@ -21,6 +21,55 @@ async function fetchApi<T>(endpoint: string, options?: RequestInit): Promise<T>
   return response.json();
 }
 
+// ============================================
+// PAGINATION
+// ============================================
+
+// One page of a list endpoint; pass `next` back as `after` to get the following page
+export interface Page<T> {
+  items: T[];
+  next: string | null;
+}
+
+function pageQuery(limit: number, after?: string | null): string {
+  const params = new URLSearchParams();
+  params.set('limit', String(limit));
+  if (after) params.set('after', after);
+  return `?${params.toString()}`;
+}
+
+// ============================================
+// COLUMNAR FORMAT
+// ============================================
+
+// ?format=columnar bodies: column names once, then one value array per row
+export interface ColumnarRows {
+  columns: string[];
+  rows: unknown[][];
+}
+
+export function decodeColumnar<T>(body: ColumnarRows): T[] {
+  const { columns, rows } = body;
+  return rows.map((row) => {
+    const record: Record<string, unknown> = {};
+    for (let i = 0; i < columns.length; i++) {
+      record[columns[i]] = row[i];
+    }
+    return record as T;
+  });
+}
+
+// Fetch a list/stats endpoint in columnar format and decode it back to row objects
+async function fetchRows<T>(endpoint: string): Promise<T[]> {
+  const separator = endpoint.includes('?') ? '&' : '?';
+  const result = await fetchApi<ColumnarRows | { _dev_warning: string; data: T[] }>(`${endpoint}${separator}format=columnar`);
+  if ('_dev_warning' in result) {
+    console.warn('[DEV]', result._dev_warning);
+    return result.data;
+  }
+  return decodeColumnar<T>(result);
+}
+
 // ============================================
 // PLAYERS
 // ============================================
@@ -38,6 +87,10 @@ export async function getPlayers(): Promise<Player[]> {
   return fetchApi<Player[]>('/players');
 }
 
+export async function getPlayersPage(limit: number = 50, after?: string | null): Promise<Page<Player>> {
+  return fetchApi<Page<Player>>(`/players${pageQuery(limit, after)}`);
+}
+
 export async function getPlayer(playerId: number): Promise<Player> {
   return fetchApi<Player>(`/players/${playerId}`);
 }
@@ -75,7 +128,7 @@ export async function getLeaderboard(division?: string, eventLimit: EventLimitFi
   if (division) params.set('division', division);
   params.set('eventLimit', String(eventLimit));
   const queryString = params.toString();
-  return fetchApi<LeaderboardEntry[]>(`/leaderboard${queryString ? '?' + queryString : ''}`);
+  return fetchRows<LeaderboardEntry>(`/leaderboard${queryString ? '?' + queryString : ''}`);
 }
 
 export interface PlayerHistory {
@@ -93,7 +146,11 @@ export interface PlayerHistory {
 }
 
 export async function getPlayerHistory(playerId: number): Promise<PlayerHistory[]> {
-  return fetchApi<PlayerHistory[]>(`/players/${playerId}/history`);
+  return fetchRows<PlayerHistory>(`/players/${playerId}/history`);
+}
+
+export async function getPlayerHistoryPage(playerId: number, limit: number = 50, after?: string | null): Promise<Page<PlayerHistory>> {
+  return fetchApi<Page<PlayerHistory>>(`/players/${playerId}/history${pageQuery(limit, after)}`);
 }
 
 // Hot Rounds - Best player rounds per event by division
@@ -110,12 +167,7 @@ export interface HotRound {
 }
 
 export async function getHotRounds(eventLimit: EventLimitFilter = 'latest'): Promise<HotRound[]> {
-  const result = await fetchApi<HotRound[] | { _dev_warning: string; data: HotRound[] }>(`/stats/hot-rounds?eventLimit=${eventLimit}`);
-  if ('_dev_warning' in result) {
-    console.warn('[DEV]', result._dev_warning);
-    return result.data;
-  }
-  return result;
+  return fetchRows<HotRound>(`/stats/hot-rounds?eventLimit=${eventLimit}`);
 }
 
 // Podium Stats - Player podium finish percentages
@@ -128,12 +180,7 @@ export interface PodiumStats {
 }
 
 export async function getPodiumStats(eventLimit: EventLimitFilter = 'latest'): Promise<PodiumStats[]> {
-  const result = await fetchApi<PodiumStats[] | { _dev_warning: string; data: PodiumStats[] }>(`/stats/podium?eventLimit=${eventLimit}`);
-  if ('_dev_warning' in result) {
-    console.warn('[DEV]', result._dev_warning);
-    return result.data;
-  }
-  return result;
+  return fetchRows<PodiumStats>(`/stats/podium?eventLimit=${eventLimit}`);
 }
 
 // Top Cards - Best group scores per event
@@ -150,12 +197,7 @@ export interface TopCard {
 }
 
 export async function getTopCards(eventLimit: EventLimitFilter = 'latest'): Promise<TopCard[]> {
-  const result = await fetchApi<TopCard[] | { _dev_warning: string; data: TopCard[] }>(`/stats/top-cards?eventLimit=${eventLimit}`);
-  if ('_dev_warning' in result) {
-    console.warn('[DEV]', result._dev_warning);
-    return result.data;
-  }
-  return result;
+  return fetchRows<TopCard>(`/stats/top-cards?eventLimit=${eventLimit}`);
 }
 
 // Hole Difficulty - Hardest holes ranking
@@ -175,12 +217,7 @@ export interface HoleDifficulty {
 }
 
 export async function getHoleDifficulty(eventLimit: EventLimitFilter = 'latest'): Promise<HoleDifficulty[]> {
-  const result = await fetchApi<HoleDifficulty[] | { _dev_warning: string; data: HoleDifficulty[] }>(`/stats/hole-difficulty?eventLimit=${eventLimit}`);
-  if ('_dev_warning' in result) {
-    console.warn('[DEV]', result._dev_warning);
-    return result.data;
-  }
-  return result;
+  return fetchRows<HoleDifficulty>(`/stats/hole-difficulty?eventLimit=${eventLimit}`);
 }
 
 // Basket Stats - Basket difficulty analysis
@@ -201,12 +238,25 @@ export interface BasketStats {
 }
 
 export async function getBasketStats(eventLimit: EventLimitFilter = 'latest'): Promise<BasketStats[]> {
-  const result = await fetchApi<BasketStats[] | { _dev_warning: string; data: BasketStats[] }>(`/stats/basket-stats?eventLimit=${eventLimit}`);
-  if ('_dev_warning' in result) {
-    console.warn('[DEV]', result._dev_warning);
-    return result.data;
-  }
-  return result;
+  return fetchRows<BasketStats>(`/stats/basket-stats?eventLimit=${eventLimit}`);
+}
+
+// Head to Head - Pairwise records over shared events, from PlayerID's side
+export interface HeadToHead {
+  PlayerID: number;
+  OpponentID: number;
+  SharedEvents: number;
+  Wins: number;
+  Losses: number;
+  Ties: number;
+  AvgMargin: number;
+}
+
+export async function getHeadToHead(playerIds?: number[], eventLimit: EventLimitFilter = 'all'): Promise<HeadToHead[]> {
+  const params = new URLSearchParams();
+  if (playerIds) params.set('players', playerIds.join(','));
+  params.set('eventLimit', String(eventLimit));
+  return fetchRows<HeadToHead>(`/stats/head-to-head?${params.toString()}`);
 }
 
 // Card Details - Detailed card breakdown for drill-down
@@ -283,6 +333,10 @@ export async function getEvents(): Promise<Event[]> {
   return fetchApi<Event[]>('/events');
 }
 
+export async function getEventsPage(limit: number = 50, after?: string | null): Promise<Page<Event>> {
+  return fetchApi<Page<Event>>(`/events${pageQuery(limit, after)}`);
+}
+
 export async function getEvent(eventId: number): Promise<Event> {
   return fetchApi<Event>(`/events/${eventId}`);
 }
@@ -395,7 +449,11 @@ export interface ScorecardDetail extends Scorecard {
 }
 
 export async function getScorecards(): Promise<Scorecard[]> {
-  return fetchApi<Scorecard[]>('/scorecards');
+  return fetchRows<Scorecard>('/scorecards');
+}
+
+export async function getScorecardsPage(limit: number = 50, after?: string | null): Promise<Page<Scorecard>> {
+  return fetchApi<Page<Scorecard>>(`/scorecards${pageQuery(limit, after)}`);
 }
 
 export async function getScorecard(scorecardId: number): Promise<ScorecardDetail> {
@@ -460,6 +518,40 @@ export async function insertHoleScores(
   });
 }
 
+export interface BulkScore {
+  holeNumber: number;
+  playerId: number;
+  strokes: number;
+}
+
+export interface BulkScoreError extends Partial<BulkScore> {
+  index: number;
+  error: string;
+}
+
+export interface BulkScoresResult {
+  success: boolean;
+  scorecardId: number;
+  inserted: number;
+  holes: number[];
+}
+
+// Submit a whole card (every hole and player) in one request; all or nothing
+export async function insertScoresBulk(scorecardId: number, scores: BulkScore[]): Promise<BulkScoresResult> {
+  const response = await fetch(`${API_BASE}/scorecards/${scorecardId}/scores/bulk`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ scores }),
+  });
+  const body = await response.json().catch(() => ({ error: 'Unknown error' }));
+  if (!response.ok) {
+    const error = new Error(body.error || `HTTP ${response.status}`) as Error & { errors?: BulkScoreError[] };
+    error.errors = body.errors;
+    throw error;
+  }
+  return body;
+}
+
 export async function getHoleScores(scorecardId: number, holeNumber: number): Promise<Score[]> {
   return fetchApi<Score[]>(`/scorecards/${scorecardId}/scores/${holeNumber}`);
 }
@@ -471,6 +563,18 @@ export async function updateScore(scoreId: number, strokes: number, playerId: nu
   });
 }
 
+export interface ScoreUpdate {
+  scoreId: number;
+  strokes: number;
+}
+
+export async function updateScores(scores: ScoreUpdate[], playerId: number): Promise<{ success: boolean; updated: number }> {
+  return fetchApi<{ success: boolean; updated: number }>('/scores', {
+    method: 'PUT',
+    body: JSON.stringify({ scores, playerId }),
+  });
+}
+
 export async function deleteScorecard(scorecardId: number, playerId: number): Promise<{ success: boolean }> {
   return fetchApi<{ success: boolean }>(`/scorecards/${scorecardId}`, {
     method: 'DELETE',
@@ -490,6 +594,97 @@ export async function getPlayerScorecards(playerId: number): Promise<PlayerScore
   return fetchApi<PlayerScorecard[]>(`/players/${playerId}/scorecards`);
 }
 
+export async function getPlayerScorecardsPage(playerId: number, limit: number = 50, after?: string | null): Promise<Page<PlayerScorecard>> {
+  return fetchApi<Page<PlayerScorecard>>(`/players/${playerId}/scorecards${pageQuery(limit, after)}`);
+}
+
+// ============================================
+// BOOTSTRAP
+// ============================================
+
+// Each section carries its own error so one failing query doesn't fail the whole payload
+export interface BootstrapSection<T> {
+  data: T;
+  error: string | null;
+}
+
+export interface Bootstrap {
+  player: BootstrapSection<Player | null>;
+  events: BootstrapSection<Event[]>;
+  players: BootstrapSection<Player[]>;
+  leaderboard: BootstrapSection<LeaderboardEntry[]>;
+  history: BootstrapSection<PlayerHistory[]>;
+  scorecards: BootstrapSection<PlayerScorecard[]>;
+  hotRounds: BootstrapSection<HotRound[]>;
+  podium: BootstrapSection<PodiumStats[]>;
+  topCards: BootstrapSection<TopCard[]>;
+  holeDifficulty: BootstrapSection<HoleDifficulty[]>;
+  basketStats: BootstrapSection<BasketStats[]>;
+}
+
+export async function getBootstrap(playerId: number, eventLimit: EventLimitFilter = 'latest'): Promise<Bootstrap> {
+  return fetchApi<Bootstrap>(`/bootstrap?playerId=${playerId}&eventLimit=${eventLimit}`);
+}
+
+// ============================================
+// LIVE SCOREBOARD
+// ============================================
+
+export interface LiveScore {
+  scorecardId: number;
+  holeNumber: number;
+  playerId: number;
+  strokes: number;
+  scoreId?: number;
+  previousStrokes?: number;
+}
+
+export interface LiveTotal {
+  scorecardId: number;
+  playerId: number;
+  roundTotal: number;
+  holesPlayed: number;
+}
+
+export interface LiveRankChange {
+  scorecardId: number;
+  playerId: number;
+  rank: number;
+  previousRank: number | null;
+  divisionRank: number;
+  previousDivisionRank: number | null;
+}
+
+export interface LiveDelta {
+  eventId: number;
+  scores?: LiveScore[];
+  totals?: LiveTotal[];
+  removed?: { scorecardId: number; playerId: number | null }[];
+  ranks?: LiveRankChange[];
+}
+
+export interface LiveHandlers {
+  onDelta: (delta: LiveDelta) => void;
+  // The stream cannot replay what was missed: reload the scoreboard
+  onReset?: () => void;
+  onDeleted?: () => void;
+}
+
+// Subscribes to an event's score deltas; the browser reconnects and resumes
+// on its own. Returns a function that closes the stream.
+export function subscribeToEvent(eventId: number, handlers: LiveHandlers): () => void {
+  const source = new EventSource(`${API_BASE}/events/${eventId}/live`);
+  source.addEventListener('delta', (message) => {
+    handlers.onDelta(JSON.parse((message as MessageEvent).data));
+  });
+  source.addEventListener('reset', () => handlers.onReset?.());
+  source.addEventListener('deleted', () => {
+    source.close();
+    handlers.onDeleted?.();
+  });
+  return () => source.close();
+}
+
 // ============================================
 // HEALTH CHECK
 // ============================================